@@ -11,4 +11,8 @@ class ApiConfig(AppConfig):
     name = "apps.api"
     verbose_name = "API"
 
+    def ready(self) -> None:
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
+
 
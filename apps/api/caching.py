@@ -0,0 +1,114 @@
+"""Response cache for the public read-only API endpoints."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.decorators import method_decorator
+
+from rest_framework.response import Response
+
+KEY_PREFIX = "api"
+
+
+def generation_key(model) -> str:
+    """Cache key of a model's generation counter."""
+    return f"{KEY_PREFIX}:generation:{model._meta.label_lower}"
+
+
+def generations(models) -> list[int]:
+    """
+    Current generation of each model's cached responses.
+
+    A missing counter, never set or evicted, starts from the current time
+    in milliseconds rather than 0, so it cannot land back on a generation
+    that responses were cached under before.
+    """
+    keys = [generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns() // 1_000_000, None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_generation(model) -> None:
+    """
+    Invalidate every cached response built from a model's rows.
+
+    Runs once the surrounding transaction commits, so a concurrent request
+    cannot cache the old rows under the new generation.
+    """
+    transaction.on_commit(functools.partial(_bump, generation_key(model)))
+
+
+def _bump(key: str) -> None:
+    """Increment a generation counter, starting it if it is missing."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns() // 1_000_000, None)
+
+
+def response_key(request, models) -> str:
+    """
+    Cache key of a response.
+
+    Made of the models' generations, the scheme, host and path, the sorted
+    query parameters and the requested format, so bumping a generation
+    orphans every older key without scanning for them. The responses hold
+    absolute URLs, so each host gets its own copy.
+    """
+    params = sorted(request.query_params.lists())
+    parts = [
+        request.scheme,
+        request.get_host(),
+        request.path,
+        repr(params),
+        request.META.get("HTTP_ACCEPT", ""),
+    ]
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+    stamp = ".".join(str(generation) for generation in generations(models))
+    return f"{KEY_PREFIX}:response:{stamp}:{digest}"
+
+
+def cache_responses(*models):
+    """
+    Cache the serialized data of a viewset's list and retrieve responses.
+
+    Only successful GETs are cached, for ``API_CACHE_TIMEOUT`` seconds; a
+    hit skips the queryset and serializer entirely. Responses must not
+    depend on the user.
+
+    Args:
+        models: Every model whose rows the responses are built from
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return func(request, *args, **kwargs)
+            key = response_key(request, models)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = func(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+            return response
+
+        return wrapper
+
+    def decorate(view_class):
+        for name in ("list", "retrieve"):
+            view_class = method_decorator(decorator, name=name)(view_class)
+        return view_class
+
+    return decorate
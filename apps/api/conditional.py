@@ -0,0 +1,78 @@
+"""Conditional GET support for the mostly static catalog endpoints."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from apps.booking.models import Service, Staff
+
+VERSION_KEY = "catalog:version"
+# Bounds how stale the version can get after bulk updates that send no signals
+VERSION_TIMEOUT = 60 * 5
+
+
+def catalog_version() -> tuple[str, datetime | None]:
+    """
+    Version of the service and staff catalog.
+
+    Built from each table's latest ``updated_at`` and row count, so edits,
+    additions and deletions all change it. Cached until the next change.
+
+    Returns:
+        Tuple of (version string, time of the latest change or None)
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        parts = []
+        changed = []
+        for model in (Service, Staff):
+            stats = model.objects.aggregate(latest=Max("updated_at"), count=Count("pk"))
+            parts.append(f"{model._meta.label}:{stats['latest']}:{stats['count']}")
+            if stats["latest"] is not None:
+                changed.append(stats["latest"])
+        version = ("|".join(parts), max(changed, default=None))
+        cache.set(VERSION_KEY, version, VERSION_TIMEOUT)
+    return version
+
+
+def invalidate_catalog_version() -> None:
+    """Forget the cached catalog version once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(VERSION_KEY))
+
+
+def catalog_etag(request, *args, **kwargs) -> str:
+    """
+    ETag of a catalog response.
+
+    Differs per URL and per negotiated format, since the browsable API and
+    JSON renderings of one version are different representations.
+    """
+    version, _ = catalog_version()
+    key = "\n".join([version, request.get_full_path(), request.META.get("HTTP_ACCEPT", "")])
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def catalog_last_modified(request, *args, **kwargs) -> datetime | None:
+    """Time of the latest catalog change."""
+    return catalog_version()[1]
+
+
+def conditional_catalog(view_class):
+    """
+    Answer conditional GETs to a catalog viewset's list and retrieve with 304.
+
+    ``If-None-Match`` and ``If-Modified-Since`` are checked against the
+    cached catalog version after authentication and throttling, but before
+    the queryset is evaluated or anything is serialized.
+    """
+    decorator = condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+    for name in ("list", "retrieve"):
+        view_class = method_decorator(decorator, name=name)(view_class)
+    return view_class
@@ -0,0 +1,195 @@
+"""Sparse fieldsets (``?fields=``) and expansion (``?expand=``) for API serializers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_fields(value: str | None) -> dict[str, list[str]] | None:
+    """
+    Parse a ``fields``/``expand`` query parameter.
+
+    ``"id,name,services.name"`` becomes ``{"id": [], "name": [],
+    "services": ["name"]}``; dotted paths select fields of a nested object.
+    None or an empty value means no restriction.
+    """
+    if not value:
+        return None
+    parsed: dict[str, list[str]] = {}
+    for path in value.split(","):
+        name, _, rest = path.strip().partition(".")
+        if name:
+            parsed.setdefault(name, [])
+            if rest:
+                parsed[name].append(rest)
+    return parsed
+
+
+class DynamicFieldsMixin:
+    """
+    Let clients pick a serializer's fields and expand its relations.
+
+    The fields come from the ``fields`` and ``expand`` keyword arguments or,
+    for the serializer a view builds, from the request's ``?fields=`` and
+    ``?expand=``:
+
+    - ``?fields=id,full_name`` returns only those fields; dotted paths like
+      ``services.name`` narrow nested objects
+    - ``?expand=service`` replaces the ``service`` id with the object, for
+      the relations listed in ``Meta.expandable_fields``;
+      ``Meta.default_expand`` relations are always expanded
+
+    ``Meta.field_sources`` lists the model columns a method or property
+    field reads, so ``optimize_queryset`` can load just those.
+    """
+
+    def __init__(self, *args, fields: str | None = None, expand: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if (
+            fields is None
+            and expand is None
+            and request is not None
+            and request.method in SAFE_METHODS
+        ):
+            fields = request.query_params.get("fields")
+            expand = request.query_params.get("expand")
+        self._apply(parse_fields(fields), parse_fields(expand))
+
+    def _apply(self, fields: dict[str, list[str]] | None, expand: dict[str, list[str]] | None):
+        """Expand the requested relations, then drop the fields not asked for."""
+        meta = getattr(self, "Meta", None)
+        expandable = getattr(meta, "expandable_fields", {})
+        wanted = dict.fromkeys(getattr(meta, "default_expand", ()), [])
+        wanted.update(
+            (name, nested) for name, nested in (expand or {}).items() if name in expandable
+        )
+
+        for name in wanted:
+            if fields is not None and name not in fields:
+                continue
+            serializer_class, options = expandable[name]
+            nested_fields = ",".join(fields[name]) if fields else ""
+            self.fields[name] = serializer_class(
+                fields=nested_fields or None, expand=",".join(wanted[name]) or None, **options
+            )
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def optimize_queryset(queryset: QuerySet, serializer) -> QuerySet:
+    """
+    Load only what a serializer's remaining fields read.
+
+    Concrete fields go into ``only()``; relations read through, like
+    ``staff.get_full_name``, are joined with ``select_related``; nested
+    many-valued serializers are prefetched with their own narrowed
+    queryset. Method fields not described by ``Meta.field_sources`` load
+    the whole row.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    only, related, prefetches = _plan(queryset.model, serializer)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if only is not None:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+def _plan(model, serializer) -> tuple[set[str] | None, set[str], list[Prefetch]]:
+    """Columns to load, relations to join and relations to prefetch for a serializer."""
+    meta = model._meta
+    field_sources = getattr(getattr(serializer, "Meta", None), "field_sources", {})
+    only: set[str] | None = {meta.pk.name}
+    related: set[str] = set()
+    prefetches: list[Prefetch] = []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in field_sources:
+            columns = field_sources[name]
+        elif field.source == "*":
+            # A method field reading who knows what
+            only = None
+            continue
+        else:
+            columns = [".".join(field.source_attrs)]
+
+        for column in columns:
+            head, _, rest = column.partition(".")
+            try:
+                model_field = meta.get_field(head)
+            except FieldDoesNotExist:
+                # A method or property reading who knows what
+                only = None
+                continue
+
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if model_field.many_to_many or model_field.one_to_many:
+                if isinstance(nested, serializers.BaseSerializer):
+                    inner = optimize_queryset(model_field.related_model.objects.all(), nested)
+                    prefetches.append(Prefetch(head, queryset=inner))
+                else:
+                    prefetches.append(Prefetch(head))
+            elif model_field.is_relation and (
+                rest or isinstance(nested, serializers.BaseSerializer)
+            ):
+                related.add(head)
+                if only is not None:
+                    only.add(head)
+                    only.update(_related_columns(model_field.related_model, head, nested, rest))
+            elif only is not None:
+                only.add(head)
+
+    return only, related, prefetches
+
+
+def _related_columns(model, prefix: str, field: Any, rest: str) -> list[str]:
+    """Columns of a joined model to load for one field."""
+    if isinstance(field, serializers.BaseSerializer):
+        only, _, _ = _plan(model, field)
+    else:
+        try:
+            only = {model._meta.get_field(rest.split(".")[0]).name}
+        except FieldDoesNotExist:
+            only = None
+    if only is None:
+        only = {f.name for f in model._meta.concrete_fields}
+    return [f"{prefix}__{column}" for column in only]
+
+
+def select_fields(rows: list[dict[str, Any]], request) -> list[dict[str, Any]]:
+    """Apply ``?fields=`` to rows serialized without a serializer."""
+    fields = parse_fields(request.query_params.get("fields"))
+    if fields is None:
+        return rows
+    return [{name: value for name, value in row.items() if name in fields} for row in rows]
+
+
+class OptimizedQuerySetMixin:
+    """
+    Narrow a viewset's list and retrieve queries to the serializer's fields.
+
+    Runs ``optimize_queryset`` with the serializer the request will get, so
+    ``?fields=`` and ``?expand=`` decide the columns, joins and prefetches.
+    Writes and custom actions keep full rows.
+    """
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Filter, then narrow the query for reads."""
+        queryset = super().filter_queryset(queryset)
+        if self.action in ("list", "retrieve") and self.request.method in SAFE_METHODS:
+            queryset = optimize_queryset(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,245 @@
+"""Pagination classes for the API."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on the values of the last row seen.
+
+    Each page is fetched with ``WHERE (key) > (cursor) ORDER BY key LIMIT n``
+    instead of an ``OFFSET``, and without a ``COUNT(*)``, so every page costs
+    the same however deep it is. The ordering must end in a unique column,
+    e.g. ``("start_time", "id")``; fields prefixed with ``-`` run descending.
+
+    Clients that need page numbers and a total can still pass ``?page=``,
+    which falls back to ``PageNumberPagination``.
+
+    Also pages plain lists already sorted by the ordering, such as computed
+    availability.
+    """
+
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+    page_size = api_settings.PAGE_SIZE
+    ordering: tuple[str, ...] = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self) -> None:
+        self.page_number_pagination: PageNumberPagination | None = None
+
+    def paginate_queryset(self, queryset, request, view=None) -> list | None:
+        """
+        Return one page of rows.
+
+        Args:
+            queryset: QuerySet, or list sorted by ``ordering``
+            request: API request
+            view: View being paginated
+
+        Returns:
+            Rows of the requested page, or None when pagination is off
+        """
+        if request.query_params.get(self.page_query_param):
+            self.page_number_pagination = PageNumberPagination()
+            return self.page_number_pagination.paginate_queryset(queryset, request, view)
+
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        if isinstance(queryset, QuerySet):
+            rows = self._page_of_queryset(queryset, position, reverse)
+        else:
+            rows = self._page_of_list(queryset, position, reverse)
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self._key(rows[-1]) if rows and has_next else None
+        self.previous_position = self._key(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data) -> Response:
+        """Wrap a page of serialized rows with links to its neighbours."""
+        if self.page_number_pagination is not None:
+            return self.page_number_pagination.get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """OpenAPI schema of a paginated response."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> str | None:
+        """URL of the following page, if any."""
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        """URL of the preceding page, if any."""
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        """
+        Return the current URL with a cursor pointing past a row.
+
+        Args:
+            position: Ordering values of the row
+            reverse: Whether the cursor pages backwards
+        """
+        payload = {"p": [_jsonable(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> tuple[list | None, bool]:
+        """
+        Read the cursor from the request.
+
+        Returns:
+            Tuple of (ordering values of the last row seen, or None for the
+            first page; whether to page backwards)
+
+        Raises:
+            NotFound: If the cursor is malformed
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            position = payload["p"]
+            reverse = bool(payload.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _page_of_queryset(self, queryset: QuerySet, position: list | None, reverse: bool) -> list:
+        """Fetch one row more than a page from a queryset."""
+        fields = [(name.lstrip("-"), name.startswith("-") != reverse) for name in self.ordering]
+        if position is not None:
+            values = []
+            for (name, _), value in zip(fields, position):
+                try:
+                    values.append(queryset.model._meta.get_field(name).to_python(value))
+                except DjangoValidationError:
+                    raise NotFound(self.invalid_cursor_message) from None
+            queryset = queryset.filter(_after(fields, values))
+        ordering = [f"-{name}" if descending else name for name, descending in fields]
+        return list(queryset.order_by(*ordering)[: self.page_size + 1])
+
+    def _page_of_list(self, rows: list, position: list | None, reverse: bool) -> list:
+        """Take one row more than a page from a sorted list."""
+        if reverse:
+            rows = rows[::-1]
+        if position is not None:
+            position = [_parse(value) for value in position]
+            descending = [name.startswith("-") != reverse for name in self.ordering]
+            try:
+                rows = [row for row in rows if _beyond(self._key(row), position, descending)]
+            except TypeError:
+                raise NotFound(self.invalid_cursor_message) from None
+        return rows[: self.page_size + 1]
+
+    def _key(self, row) -> list:
+        """Ordering values of a row, an object or a ``.values()`` dict."""
+        if isinstance(row, dict):
+            return [row[name.lstrip("-")] for name in self.ordering]
+        return [getattr(row, name.lstrip("-")) for name in self.ordering]
+
+
+def _after(fields: list[tuple[str, bool]], values: list) -> Q:
+    """
+    Filter for rows past a position in a multi-column ordering.
+
+    ``(a, b) > (x, y)`` expands to ``a > x OR (a = x AND b > y)``, with
+    ``<`` for descending columns.
+    """
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        term = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+        for earlier, value in zip(fields[:index], values):
+            term &= Q(**{earlier[0]: value})
+        condition |= term
+    return condition
+
+
+def _beyond(key: list, position: list, descending: list[bool]) -> bool:
+    """Whether a row's ordering values come after a position."""
+    for value, bound, desc in zip(key, position, descending):
+        if value != bound:
+            return value < bound if desc else value > bound
+    return False
+
+
+def _jsonable(value: Any) -> Any:
+    """Cursor representation of an ordering value."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _parse(value: Any) -> Any:
+    """Ordering value from its cursor representation."""
+    if isinstance(value, str):
+        try:
+            return parse_datetime(value) or value
+        except ValueError:
+            return value
+    return value
+
+
+class StartTimeCursorPagination(KeysetCursorPagination):
+    """Pages of time slots, earliest first."""
+
+    ordering = ("start_time", "id")
+
+
+class NewestFirstCursorPagination(KeysetCursorPagination):
+    """Pages of records, newest first."""
+
+    ordering = ("-created_at", "id")
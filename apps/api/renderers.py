@@ -0,0 +1,16 @@
+"""Renderers for the API."""
+
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    JSON selected with ``?format=compact``.
+
+    Views check ``request.accepted_renderer.format`` and return a compact
+    representation of their data.
+    """
+
+    format = "compact"
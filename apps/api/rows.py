@@ -0,0 +1,179 @@
+"""
+Plain-dict serialization for the high-volume time slot listings.
+
+Builds the same JSON as ``TimeSlotSerializer`` without a serializer field
+per value: stored slots come straight from ``.values()`` and availability
+is worked out from the row itself. ``compact_availability`` is the
+columnar calendar format.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import date, datetime
+from typing import Any
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from rest_framework import ISO_8601
+from rest_framework.fields import DateTimeField
+from rest_framework.settings import api_settings
+
+from apps.booking.models import OpeningHour
+
+# Columns read for each stored slot
+TIME_SLOT_VALUES = (
+    "id",
+    "staff_id",
+    "staff__first_name",
+    "staff__last_name",
+    "start_time",
+    "end_time",
+    "capacity",
+    "is_blocked",
+    "booked_count",
+)
+
+
+def time_slot_values(queryset: QuerySet) -> QuerySet:
+    """Narrow a TimeSlot queryset to the columns ``time_slot_rows`` needs."""
+    return queryset.values(*TIME_SLOT_VALUES)
+
+
+def time_slot_rows(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Serialize ``time_slot_values`` rows like ``TimeSlotSerializer``.
+
+    Args:
+        rows: Dicts with the ``TIME_SLOT_VALUES`` keys
+
+    Returns:
+        One dict per slot, equal to the serializer's output
+    """
+    to_json = datetime_formatter()
+    now = timezone.now()
+    return [
+        {
+            "id": row["id"],
+            "staff": row["staff_id"],
+            "staff_name": f"{row['staff__first_name']} {row['staff__last_name']}",
+            "start_time": to_json(row["start_time"]),
+            "end_time": to_json(row["end_time"]),
+            "capacity": row["capacity"],
+            "is_blocked": row["is_blocked"],
+            "is_available": (
+                not row["is_blocked"]
+                and row["start_time"] >= now
+                and row["booked_count"] < row["capacity"]
+            ),
+        }
+        for row in rows
+    ]
+
+
+def time_slot_objects(slots: Iterable) -> list[dict[str, Any]]:
+    """
+    Serialize TimeSlot or VirtualSlot objects like ``TimeSlotSerializer``.
+
+    For the already-computed slots that cached availability returns, with
+    their staff members loaded.
+    """
+    to_json = datetime_formatter()
+    return [
+        {
+            "id": slot.id,
+            "staff": slot.staff_id,
+            "staff_name": slot.staff.get_full_name(),
+            "start_time": to_json(slot.start_time),
+            "end_time": to_json(slot.end_time),
+            "capacity": slot.capacity,
+            "is_blocked": slot.is_blocked,
+            "is_available": slot.is_available(),
+        }
+        for slot in slots
+    ]
+
+
+def datetime_formatter() -> Callable[[datetime], str]:
+    """
+    Return a function rendering datetimes exactly as DRF's ``DateTimeField``.
+
+    ISO 8601 in the current time zone, with ``Z`` for UTC. Other
+    ``DATETIME_FORMAT`` settings go through the DRF field itself.
+    """
+    if api_settings.DATETIME_FORMAT != ISO_8601:
+        return DateTimeField().to_representation
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def to_json(value: datetime) -> str:
+        if tz is not None and timezone.is_aware(value):
+            value = value.astimezone(tz)
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return to_json
+
+
+def compact_availability(
+    slots: Iterable, staff: Iterable, start_date: date, end_date: date
+) -> dict[str, Any]:
+    """
+    Group available slots by day and staff member into parallel arrays.
+
+    Each day gives the local time it ``opens`` (its opening hour, or the
+    hour of its first slot if that is earlier or the salon has none), and
+    per staff member the slots' ``starts`` as minutes after it, their
+    lengths in ``minutes`` (a single number when all are equal) and, for
+    stored slots, their ``ids``. Staff names are sent once.
+
+    Args:
+        slots: Available slots ordered by start time, e.g. from
+            ``cached_available_slots``
+        staff: Staff members the slots may belong to
+        start_date: First local day of the range
+        end_date: Last local day of the range
+
+    Returns:
+        ``{"timezone", "start_date", "end_date", "staff", "days"}``
+    """
+    by_day: dict[date, dict[int, list]] = defaultdict(lambda: defaultdict(list))
+    for slot in slots:
+        start = timezone.localtime(slot.start_time)
+        by_day[start.date()][slot.staff_id].append((slot, start))
+
+    opening = {
+        hour.weekday: hour.start_time for hour in OpeningHour.objects.filter(is_closed=False)
+    }
+    days = []
+    for day in sorted(by_day):
+        groups = by_day[day]
+        first = min(start for group in groups.values() for _, start in group)
+        opens = first.time().replace(minute=0, second=0, microsecond=0)
+        if day.weekday() in opening:
+            opens = min(opens, opening[day.weekday()])
+        opened = timezone.make_aware(datetime.combine(day, opens))
+
+        columns = []
+        for staff_id in sorted(groups):
+            group = groups[staff_id]
+            lengths = [int((s.end_time - s.start_time).total_seconds()) // 60 for s, _ in group]
+            column: dict[str, Any] = {
+                "staff": staff_id,
+                "starts": [int((start - opened).total_seconds()) // 60 for _, start in group],
+                "minutes": lengths[0] if len(set(lengths)) == 1 else lengths,
+            }
+            if isinstance(group[0][0].id, int):
+                column["ids"] = [slot.id for slot, _ in group]
+            columns.append(column)
+        days.append({"date": day.isoformat(), "opens": opens.strftime("%H:%M"), "staff": columns})
+
+    return {
+        "timezone": timezone.get_current_timezone_name(),
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "staff": [{"id": member.pk, "name": member.get_full_name()} for member in staff],
+        "days": days,
+    }
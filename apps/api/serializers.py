@@ -1,13 +1,17 @@
 """Serializers for API endpoints."""
 from __future__ import annotations
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
 from apps.accounts.models import Customer
 from apps.booking.models import Booking, Service, Staff, TimeSlot
+from apps.booking.availability import get_availability_backend
 
+from .fields import DynamicFieldsMixin
 
-class CustomerSerializer(serializers.ModelSerializer):
+
+class CustomerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Customer model."""
 
     class Meta:
@@ -27,7 +31,7 @@ class CustomerSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "email_verified", "phone_verified", "created_at"]
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Service model."""
 
     duration_hours = serializers.ReadOnlyField()
@@ -47,9 +51,10 @@ class ServiceSerializer(serializers.ModelSerializer):
             "is_active",
             "display_order",
         ]
+        field_sources = {"duration_hours": ["duration"]}
 
 
-class StaffSerializer(serializers.ModelSerializer):
+class StaffSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Staff model."""
 
     full_name = serializers.CharField(source="get_full_name", read_only=True)
@@ -68,9 +73,12 @@ class StaffSerializer(serializers.ModelSerializer):
             "services",
             "is_active",
         ]
+        field_sources = {"full_name": ["first_name", "last_name"]}
+        expandable_fields = {"services": (ServiceSerializer, {"many": True, "read_only": True})}
+        default_expand = ["services"]
 
 
-class StaffListSerializer(serializers.ModelSerializer):
+class StaffListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for staff listings."""
 
     full_name = serializers.CharField(source="get_full_name", read_only=True)
@@ -85,11 +93,15 @@ class StaffListSerializer(serializers.ModelSerializer):
             "slug",
             "avatar",
         ]
+        field_sources = {"full_name": ["first_name", "last_name"]}
+        expandable_fields = {"services": (ServiceSerializer, {"many": True, "read_only": True})}
 
 
-class TimeSlotSerializer(serializers.ModelSerializer):
-    """Serializer for TimeSlot model."""
+class TimeSlotSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Serializer for TimeSlot model and computed VirtualSlot instances."""
 
+    # Integer for stored slots, "<staff id>-<unix time>" token for computed slots
+    id = serializers.ReadOnlyField()
     staff_name = serializers.CharField(source="staff.get_full_name", read_only=True)
     is_available = serializers.BooleanField(read_only=True)
 
@@ -105,9 +117,13 @@ class TimeSlotSerializer(serializers.ModelSerializer):
             "is_blocked",
             "is_available",
         ]
+        field_sources = {
+            "staff_name": ["staff.first_name", "staff.last_name"],
+            "is_available": ["is_blocked", "start_time", "booked_count", "capacity"],
+        }
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Booking model."""
 
     customer_email = serializers.EmailField(source="customer.email", read_only=True)
@@ -140,10 +156,22 @@ class BookingSerializer(serializers.ModelSerializer):
             "confirmed_at",
             "created_at",
         ]
+        field_sources = {"staff_name": ["staff.first_name", "staff.last_name"]}
+        expandable_fields = {
+            "customer": (CustomerSerializer, {"read_only": True}),
+            "service": (ServiceSerializer, {"read_only": True}),
+            "staff": (StaffListSerializer, {"read_only": True}),
+            "time_slot": (TimeSlotSerializer, {"read_only": True}),
+        }
 
 
 class BookingCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating bookings."""
+    """
+    Serializer for creating bookings.
+
+    Pass ``time_slot`` to book a stored slot, or ``start_time`` to book by time
+    (required with computed availability, where slots have no rows).
+    """
 
     class Meta:
         model = Booking
@@ -151,14 +179,22 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             "service",
             "staff",
             "time_slot",
+            "start_time",
             "notes",
         ]
+        extra_kwargs = {
+            "time_slot": {"required": False},
+            "start_time": {"required": False},
+        }
 
     def validate(self, data):
         """Validate booking data."""
         service = data["service"]
         staff = data["staff"]
-        time_slot = data["time_slot"]
+        time_slot = data.get("time_slot")
+
+        if time_slot is None and data.get("start_time") is None:
+            raise serializers.ValidationError("Provide either time_slot or start_time")
 
         # Check if service is provided by staff
         if not staff.services.filter(id=service.id).exists():
@@ -166,29 +202,40 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 f"{staff.get_full_name()} does not provide {service.name}"
             )
 
-        # Check if time slot is available
-        if not time_slot.is_available():
-            raise serializers.ValidationError("This time slot is not available")
-
         # Check if time slot belongs to the staff
-        if time_slot.staff != staff:
+        if time_slot is not None and time_slot.staff != staff:
             raise serializers.ValidationError("Time slot does not belong to selected staff")
 
         return data
 
     def create(self, validated_data):
-        """Create booking with customer from request."""
+        """
+        Reserve the slot and create booking with customer from request.
+
+        Capacity is decided by the availability backend at reservation time,
+        so a slot taken between validation and creation is reported as a 400
+        rather than double-booked.
+        """
         customer = self.context["request"].user
-        time_slot = validated_data["time_slot"]
-
-        booking = Booking.objects.create(
-            customer=customer,
-            service=validated_data["service"],
-            staff=validated_data["staff"],
-            time_slot=time_slot,
-            start_time=time_slot.start_time,
-            notes=validated_data.get("notes", ""),
-        )
+        backend = get_availability_backend()
+        staff = validated_data["staff"]
+
+        slot = validated_data.get("time_slot")
+        if slot is None:
+            slot = backend.get_slot_at(staff, validated_data["start_time"])
+            if slot is None:
+                raise serializers.ValidationError("No time slot starts at that time")
+
+        try:
+            booking = backend.reserve(
+                slot,
+                service=validated_data["service"],
+                staff=staff,
+                customer=customer,
+                notes=validated_data.get("notes", ""),
+            )
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages) from e
 
         # Auto-confirm booking
         booking.confirm()
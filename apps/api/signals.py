@@ -0,0 +1,44 @@
+"""Signal handlers for API app."""
+
+from __future__ import annotations
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.booking.models import Service, Staff
+
+from .caching import bump_generation
+from .conditional import invalidate_catalog_version
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Staff)
+@receiver(post_delete, sender=Staff)
+def invalidate_catalog_on_change(sender, **kwargs) -> None:
+    """Drop the cached catalog version and responses when a service or staff member changes."""
+    invalidate_catalog_version()
+    bump_generation(sender)
+
+
+@receiver(m2m_changed, sender=Staff.services.through)
+def touch_staff_on_services_change(sender, instance, action: str, pk_set, **kwargs) -> None:
+    """
+    Record a change to who offers which service as a staff change.
+
+    Adding or removing services saves neither side, so bump ``updated_at``
+    of the affected staff members to move the catalog version on.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, Staff):
+        staff = Staff.objects.filter(pk=instance.pk)
+    elif pk_set:
+        staff = Staff.objects.filter(pk__in=pk_set)
+    else:
+        # Cleared from the service side; the removed staff are no longer known
+        staff = Staff.objects.all()
+    staff.update(updated_at=timezone.now())
+    invalidate_catalog_version()
+    bump_generation(sender)
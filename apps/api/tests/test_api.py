@@ -118,7 +118,7 @@ class TestBookingAPI:
             start_time=time_slot.start_time,
         )
 
-        response = authenticated_client.get("/api/v1/bookings/")
+        response = authenticated_client.get("/api/v1/bookings/?page=1")
         assert response.status_code == status.HTTP_200_OK
         assert response.data["count"] == 1
 
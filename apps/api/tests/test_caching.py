@@ -0,0 +1,137 @@
+"""Tests for the public API response cache."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.core.cache import cache
+
+import pytest
+from rest_framework.settings import api_settings
+
+from apps.api.caching import generation_key, generations
+from apps.booking.models import Service, Staff
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Use a real in-memory cache so responses are kept."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "api-responses",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def catalog(db):
+    """Create a service offered by a staff member."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=45, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(service)
+    return service, staff
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Catalog responses are served from the cache until the catalog changes."""
+
+    @pytest.mark.parametrize(
+        "url", ["/api/v1/services/", "/api/v1/services/haircut/", "/api/v1/staff/john-doe/"]
+    )
+    def test_hit_needs_no_queries(self, api_client, catalog, url, django_assert_num_queries):
+        """Test that a repeated request skips the database."""
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+
+    def test_keyed_on_query_params(self, api_client, catalog):
+        """Test that filtered lists are cached separately."""
+        _, staff = catalog
+        other = Staff.objects.create(first_name="Jane", last_name="Smith")
+
+        assert api_client.get("/api/v1/services/").data["count"] == 1
+        assert api_client.get(f"/api/v1/services/?staff_id={other.pk}").data["count"] == 0
+        assert api_client.get(f"/api/v1/services/?staff_id={staff.pk}").data["count"] == 1
+
+    def test_keyed_on_host(self, settings, api_client, catalog):
+        """Test that each host gets pagination links to itself."""
+        settings.ALLOWED_HOSTS = ["salon.example", "booking.example"]
+        for number in range(api_settings.PAGE_SIZE):
+            Service.objects.create(
+                name=f"Service {number}", description="Test", duration=30, price=Decimal("20.00")
+            )
+
+        for host in ["salon.example", "booking.example", "salon.example"]:
+            response = api_client.get("/api/v1/services/", HTTP_HOST=host)
+            assert response.data["next"].startswith(f"http://{host}/")
+
+    def test_save_invalidates(self, api_client, catalog, django_capture_on_commit_callbacks):
+        """Test that editing a service shows up in nested staff responses."""
+        service, staff = catalog
+        api_client.get(f"/api/v1/staff/{staff.slug}/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.name = "Trim"
+            service.save()
+
+        response = api_client.get(f"/api/v1/staff/{staff.slug}/")
+        assert [s["name"] for s in response.data["services"]] == ["Trim"]
+
+    def test_delete_invalidates(self, api_client, catalog, django_capture_on_commit_callbacks):
+        """Test that a deleted staff member disappears from the list."""
+        _, staff = catalog
+        assert api_client.get("/api/v1/staff/").data["count"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff.delete()
+
+        assert api_client.get("/api/v1/staff/").data["count"] == 0
+
+    def test_services_offered_invalidates(
+        self, api_client, catalog, django_capture_on_commit_callbacks
+    ):
+        """Test that changing who offers a service invalidates filtered lists."""
+        service, staff = catalog
+        url = f"/api/v1/services/?staff_id={staff.pk}"
+        assert api_client.get(url).data["count"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.staff_members.remove(staff)
+
+        assert api_client.get(url).data["count"] == 0
+
+    def test_errors_are_not_cached(self, api_client, catalog):
+        """Test that a 404 is not cached."""
+        assert api_client.get("/api/v1/services/coloring/").status_code == 404
+
+        Service.objects.create(
+            name="Coloring", description="Test", duration=90, price=Decimal("90.00")
+        )
+
+        assert api_client.get("/api/v1/services/coloring/").status_code == 200
+
+
+@pytest.mark.django_db
+class TestGenerations:
+    """Per-model generation counters."""
+
+    def test_evicted_counter_does_not_resurrect_old_entries(self):
+        """Test that a lost counter restarts at a fresh value."""
+        cache.set(generation_key(Service), 3, None)
+        before = generations([Service])
+
+        cache.delete(generation_key(Service))
+
+        assert generations([Service]) != before
+        assert generations([Service])[0] > 3
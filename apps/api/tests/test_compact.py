@@ -0,0 +1,176 @@
+"""Tests for the compact columnar availability format."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.models import OpeningHour, Service, Staff, TimeSlot
+
+# Hours with a slot, 9:00 to 17:00
+OPEN_HOURS = range(9, 17)
+
+
+@pytest.fixture
+def day():
+    """Return tomorrow's local date."""
+    return timezone.localdate() + timedelta(days=1)
+
+
+def local(day, hour, minute=0):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+def create_stylists(count, first_day, days, hours=OPEN_HOURS):
+    """Create stylists with hourly slots on each of a run of days."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+    stylists = []
+    for index in range(count):
+        staff = Staff.objects.create(first_name=f"Stylist{index}", last_name="Doe")
+        staff.services.add(service)
+        TimeSlot.objects.bulk_create(
+            TimeSlot(
+                staff=staff,
+                start_time=local(first_day + timedelta(days=offset), hour),
+                end_time=local(first_day + timedelta(days=offset), hour + 1),
+            )
+            for offset in range(days)
+            for hour in hours
+        )
+        stylists.append(staff)
+    return stylists
+
+
+@pytest.mark.django_db
+class TestCompactFormat:
+    """?format=compact groups free slots by day and stylist."""
+
+    def test_parallel_arrays(self, api_client, day):
+        """Test the shape of a compact response."""
+        staff, other = create_stylists(2, day, 1, hours=range(10, 13))
+        slots = list(TimeSlot.objects.filter(staff=staff).order_by("start_time"))
+        TimeSlot.objects.filter(pk=slots[1].pk).update(is_blocked=True)
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(17))
+
+        response = api_client.get(
+            f"/api/v1/time-slots/?format=compact&start_date={day}&end_date={day}"
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        assert response.json() == {
+            "timezone": timezone.get_current_timezone_name(),
+            "start_date": day.isoformat(),
+            "end_date": day.isoformat(),
+            "staff": [
+                {"id": staff.pk, "name": "Stylist0 Doe"},
+                {"id": other.pk, "name": "Stylist1 Doe"},
+            ],
+            "days": [
+                {
+                    "date": day.isoformat(),
+                    "opens": "09:00",
+                    "staff": [
+                        {
+                            "staff": staff.pk,
+                            "starts": [60, 180],
+                            "minutes": 60,
+                            "ids": [slots[0].pk, slots[2].pk],
+                        },
+                        {
+                            "staff": other.pk,
+                            "starts": [60, 120, 180],
+                            "minutes": 60,
+                            "ids": list(
+                                TimeSlot.objects.filter(staff=other)
+                                .order_by("start_time")
+                                .values_list("pk", flat=True)
+                            ),
+                        },
+                    ],
+                }
+            ],
+        }
+
+    def test_opens_at_first_slot_without_opening_hours(self, api_client, day):
+        """Test that offsets count from the hour of the day's first slot."""
+        (staff,) = create_stylists(1, day, 1, hours=[11])
+        TimeSlot.objects.create(
+            staff=staff, start_time=local(day, 13, 30), end_time=local(day, 14, 15)
+        )
+
+        response = api_client.get(f"/api/v1/time-slots/?format=compact&start_date={day}")
+
+        (entry,) = response.json()["days"]
+        assert entry["opens"] == "11:00"
+        assert entry["staff"][0]["starts"] == [0, 150]
+        assert entry["staff"][0]["minutes"] == [60, 45]
+
+    def test_computed_slots_have_no_ids(self, api_client, day, settings):
+        """Test computed availability, whose ids are derivable from staff and start."""
+        settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+        settings.BOOKING_SLOT_MINUTES = 60
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(12))
+        create_stylists(1, day, 0)
+
+        response = api_client.get(
+            f"/api/v1/time-slots/?format=compact&start_date={day}&end_date={day}"
+        )
+
+        (column,) = response.json()["days"][0]["staff"]
+        assert column == {"staff": column["staff"], "starts": [0, 60, 120], "minutes": 60}
+
+    def test_staff_filter(self, api_client, day):
+        """Test that staff_id narrows the calendar to one stylist."""
+        staff, _ = create_stylists(2, day, 1)
+
+        data = api_client.get(f"/api/v1/time-slots/?format=compact&staff_id={staff.pk}").json()
+
+        assert [member["id"] for member in data["staff"]] == [staff.pk]
+        assert {column["staff"] for d in data["days"] for column in d["staff"]} == {staff.pk}
+
+    @pytest.mark.parametrize(
+        "query", ["start_date=2030-01-10&end_date=2030-01-09", "start_date=2030-01-01"]
+    )
+    def test_range_is_bounded(self, api_client, query, db):
+        """Test that reversed and over-long ranges are rejected."""
+        response = api_client.get(f"/api/v1/time-slots/?format=compact&{query}&end_date=2030-12-31")
+
+        assert response.status_code == 400
+
+    def test_default_format_unchanged(self, api_client, day):
+        """Test that JSON is still the default."""
+        create_stylists(1, day, 1)
+
+        assert "results" in api_client.get("/api/v1/time-slots/").json()
+
+    def test_an_order_of_magnitude_smaller(self, api_client, day, django_assert_max_num_queries):
+        """Test the payload of a 30-stylist, 14-day calendar."""
+        create_stylists(30, day, 14)
+        end = day + timedelta(days=13)
+
+        with django_assert_max_num_queries(4):
+            compact = api_client.get(
+                f"/api/v1/time-slots/?format=compact&start_date={day}&end_date={end}"
+            ).content
+        rows = []
+        url = f"/api/v1/time-slots/?start_date={day}&end_date={end}"
+        while url:
+            page = api_client.get(url).json()
+            rows.extend(page["results"])
+            url = page["next"]
+
+        assert (
+            sum(len(c["starts"]) for d in json.loads(compact)["days"] for c in d["staff"])
+            == len(rows)
+            == 30 * 14 * 8
+        )
+        assert len(json.dumps(rows, separators=(",", ":"))) > 10 * len(compact)
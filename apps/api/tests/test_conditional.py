@@ -0,0 +1,135 @@
+"""Tests for conditional GETs on the catalog endpoints."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.core.cache import cache
+
+import pytest
+
+from apps.api.conditional import catalog_version
+from apps.booking.models import Service, Staff
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Use a real in-memory cache so the catalog version is kept."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "catalog-version",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def catalog(db):
+    """Create a service offered by a staff member."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=45, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(service)
+    return service, staff
+
+
+def etag_of(api_client, url):
+    """Return the ETag of a fresh response."""
+    response = api_client.get(url)
+    assert response.status_code == 200
+    return response["ETag"]
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Catalog endpoints revalidate with 304."""
+
+    @pytest.mark.parametrize(
+        "url", ["/api/v1/services/", "/api/v1/services/haircut/", "/api/v1/staff/"]
+    )
+    def test_if_none_match(self, api_client, catalog, url, django_assert_num_queries):
+        """Test that a matching ETag is answered without touching the catalog."""
+        etag = etag_of(api_client, url)
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_if_modified_since(self, api_client, catalog):
+        """Test that Last-Modified revalidates too."""
+        last_modified = api_client.get("/api/v1/services/")["Last-Modified"]
+
+        response = api_client.get("/api/v1/services/", HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_etag_differs_per_url_and_format(self, api_client, catalog):
+        """Test that different representations get different ETags."""
+        etags = {
+            etag_of(api_client, "/api/v1/services/"),
+            etag_of(api_client, "/api/v1/services/?staff_id=1"),
+            etag_of(api_client, "/api/v1/staff/"),
+        }
+        response = api_client.get("/api/v1/services/", HTTP_ACCEPT="text/html")
+        etags.add(response["ETag"])
+
+        assert len(etags) == 4
+
+    def test_slots_are_not_conditional(self, api_client, catalog):
+        """Test that availability, which changes constantly, carries no ETag."""
+        _, staff = catalog
+
+        response = api_client.get(f"/api/v1/staff/{staff.slug}/available_slots/")
+
+        assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+class TestCatalogVersion:
+    """The version moves on with every catalog change."""
+
+    def test_cached(self, catalog, django_assert_num_queries):
+        """Test that the version is only computed once."""
+        catalog_version()
+
+        with django_assert_num_queries(0):
+            catalog_version()
+
+    def test_edit(self, api_client, catalog, django_capture_on_commit_callbacks):
+        """Test that editing a service changes the ETag."""
+        service, _ = catalog
+        etag = etag_of(api_client, "/api/v1/staff/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.price = Decimal("55.00")
+            service.save()
+
+        response = api_client.get("/api/v1/staff/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_delete(self, api_client, catalog, django_capture_on_commit_callbacks):
+        """Test that removing a staff member changes the version."""
+        _, staff = catalog
+        before = catalog_version()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff.delete()
+
+        assert catalog_version()[0] != before[0]
+
+    def test_services_offered(self, catalog, django_capture_on_commit_callbacks):
+        """Test that changing who offers a service changes the version."""
+        service, staff = catalog
+        before = catalog_version()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff.services.remove(service)
+
+        assert catalog_version()[0] != before[0]
@@ -0,0 +1,191 @@
+"""Tests for sparse fieldsets and expansion."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.api.fields import parse_fields
+from apps.api.serializers import BookingSerializer
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+
+
+@pytest.fixture
+def catalog(db):
+    """Create a stylist offering two services."""
+    staff = Staff.objects.create(first_name="John", last_name="Doe", bio="Long bio")
+    services = [
+        Service.objects.create(
+            name=name, description="Long description", duration=60, price=Decimal("50.00")
+        )
+        for name in ("Haircut", "Coloring")
+    ]
+    staff.services.add(*services)
+    return staff, services
+
+
+@pytest.fixture
+def bookings(catalog, customer):
+    """Create three bookings for the test customer."""
+    staff, services = catalog
+    start = timezone.now() + timedelta(days=1)
+    return [
+        Booking.objects.create(
+            customer=customer,
+            service=services[i % 2],
+            staff=staff,
+            start_time=start + timedelta(hours=i),
+        )
+        for i in range(3)
+    ]
+
+
+def sql_of(api_client, url):
+    """Return the response to a GET and the SQL it ran, minus catalog version checks."""
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url)
+    assert response.status_code == 200
+    return response, [
+        query["sql"] for query in queries.captured_queries if "MAX(" not in query["sql"]
+    ]
+
+
+@pytest.mark.unit
+class TestParseFields:
+    """Parsing of ?fields= and ?expand=."""
+
+    def test_nested_paths(self):
+        """Test that dotted paths select nested fields."""
+        assert parse_fields("id, name,services.name,services.price") == {
+            "id": [],
+            "name": [],
+            "services": ["name", "price"],
+        }
+
+    def test_empty(self):
+        """Test that an empty parameter means no restriction."""
+        assert parse_fields("") is None
+        assert parse_fields(None) is None
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """?fields= trims the response and the SQL."""
+
+    def test_staff_list(self, api_client, catalog):
+        """Test that unused columns are not selected."""
+        response, sql = sql_of(api_client, "/api/v1/staff/?fields=id,full_name")
+
+        assert response.data["results"] == [{"id": catalog[0].pk, "full_name": "John Doe"}]
+        staff_query = sql[-1]
+        assert '"first_name"' in staff_query
+        assert '"avatar"' not in staff_query
+        assert '"bio"' not in staff_query
+
+    def test_nested_fields(self, api_client, catalog):
+        """Test that dotted fields narrow embedded services and their query."""
+        staff, _ = catalog
+
+        response, sql = sql_of(api_client, f"/api/v1/staff/{staff.slug}/?fields=id,services.name")
+
+        assert response.data == {
+            "id": staff.pk,
+            "services": [{"name": "Coloring"}, {"name": "Haircut"}],
+        }
+        assert all('"description"' not in query for query in sql)
+
+    def test_leaving_out_services_skips_the_prefetch(self, api_client, catalog):
+        """Test that a staff detail without services needs no services query."""
+        staff, _ = catalog
+
+        _, sql = sql_of(api_client, f"/api/v1/staff/{staff.slug}/?fields=id,slug")
+
+        assert len(sql) == 1
+
+    def test_time_slots(self, api_client, catalog):
+        """Test that the fast slot listing honours ?fields= too."""
+        staff, _ = catalog
+        start = timezone.now() + timedelta(days=1)
+        slot = TimeSlot.objects.create(
+            staff=staff, start_time=start, end_time=start + timedelta(hours=1)
+        )
+
+        response = api_client.get("/api/v1/time-slots/?fields=id,is_available")
+
+        assert response.json()["results"] == [{"id": slot.pk, "is_available": True}]
+
+    def test_unknown_fields_are_ignored(self, api_client, catalog):
+        """Test that asking for a field that does not exist is harmless."""
+        response = api_client.get("/api/v1/services/?fields=name,nope")
+
+        assert response.data["results"] == [{"name": "Coloring"}, {"name": "Haircut"}]
+
+
+@pytest.mark.django_db
+class TestExpansion:
+    """?expand= embeds related objects."""
+
+    def test_default_output_unchanged(self, authenticated_client, bookings):
+        """Test that bookings render as before and load their relations in one query."""
+        response, sql = sql_of(authenticated_client, "/api/v1/bookings/")
+
+        ordered = sorted(bookings, key=lambda b: (-b.created_at.timestamp(), b.pk))
+        expected = BookingSerializer(ordered, many=True).data
+        assert response.data["results"] == expected
+        assert len([query for query in sql if "booking_booking" in query]) == 1
+
+    def test_expand_booking_relations(self, authenticated_client, bookings):
+        """Test that expanded relations replace ids with objects."""
+        booking = bookings[0]
+
+        response, sql = sql_of(
+            authenticated_client, f"/api/v1/bookings/{booking.pk}/?expand=service,staff"
+        )
+
+        assert response.data["service"]["name"] == booking.service.name
+        assert response.data["staff"] == {
+            "id": booking.staff_id,
+            "first_name": "John",
+            "last_name": "Doe",
+            "full_name": "John Doe",
+            "slug": "john-doe",
+            "avatar": None,
+        }
+        assert response.data["customer"] == booking.customer_id
+        assert len(sql) == 1
+
+    def test_expand_with_fields(self, authenticated_client, bookings):
+        """Test expanding a relation and narrowing it at once."""
+        response = authenticated_client.get(
+            "/api/v1/bookings/?expand=service&fields=id,service.name"
+        )
+
+        assert response.data["results"][0].keys() == {"id", "service"}
+        assert response.data["results"][0]["service"].keys() == {"name"}
+
+    def test_staff_list_services(self, api_client, catalog):
+        """Test that the staff list can embed services, prefetched in one query."""
+        response, sql = sql_of(api_client, "/api/v1/staff/?expand=services&fields=id,services.name")
+
+        assert response.data["results"][0]["services"] == [
+            {"name": "Coloring"},
+            {"name": "Haircut"},
+        ]
+        assert len(sql) == 3
+
+    def test_ignored_on_writes(self, authenticated_client, bookings):
+        """Test that expansion does not change what a write accepts."""
+        booking = bookings[0]
+
+        response = authenticated_client.patch(
+            f"/api/v1/bookings/{booking.pk}/?expand=service", {"notes": "Hi"}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert response.data["service"] == booking.service_id
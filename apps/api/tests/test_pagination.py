@@ -0,0 +1,152 @@
+"""Tests for keyset cursor pagination."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+
+
+@pytest.fixture
+def staff(db):
+    """Create a staff member with a service."""
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(
+        Service.objects.create(
+            name="Haircut", description="Test", duration=30, price=Decimal("50.00")
+        )
+    )
+    return staff
+
+
+@pytest.fixture
+def slots(staff):
+    """Create 45 half-hourly slots, the first five sharing a start with another stylist."""
+    other = Staff.objects.create(first_name="Jane", last_name="Smith")
+    start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    created = [
+        TimeSlot(
+            staff=staff,
+            start_time=start + timedelta(minutes=30 * i),
+            end_time=start + timedelta(minutes=30 * (i + 1)),
+        )
+        for i in range(40)
+    ] + [
+        TimeSlot(
+            staff=other,
+            start_time=start + timedelta(minutes=30 * i),
+            end_time=start + timedelta(minutes=30 * (i + 1)),
+        )
+        for i in range(5)
+    ]
+    TimeSlot.objects.bulk_create(created)
+    return list(TimeSlot.objects.order_by("start_time", "id"))
+
+
+def walk(api_client, url, link="next"):
+    """Follow links from a URL, returning each page's ids."""
+    pages = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.data["results"]])
+        url = response.data[link]
+    return pages
+
+
+@pytest.mark.django_db
+class TestTimeSlotCursor:
+    """Time slots are paged by (start_time, id)."""
+
+    def test_walks_every_slot_once(self, api_client, slots):
+        """Test that following next links visits every slot in order."""
+        pages = walk(api_client, "/api/v1/time-slots/")
+
+        assert [len(page) for page in pages] == [20, 20, 5]
+        assert sum(pages, []) == [slot.id for slot in slots]
+
+    def test_previous_links(self, api_client, slots):
+        """Test that previous links walk back over the same pages."""
+        last = api_client.get("/api/v1/time-slots/").data["next"]
+        last = api_client.get(last).data["next"]
+        response = api_client.get(last)
+
+        pages = walk(api_client, response.data["previous"], link="previous")
+
+        assert pages == [[slot.id for slot in slots[20:40]], [slot.id for slot in slots[:20]]]
+
+    def test_no_count_and_constant_cost(self, api_client, slots):
+        """Test that a deep page runs the same single query as the first."""
+        with CaptureQueriesContext(connection) as first:
+            response = api_client.get("/api/v1/time-slots/")
+        with CaptureQueriesContext(connection) as deep:
+            api_client.get(api_client.get(response.data["next"]).data["next"])
+
+        assert len(first.captured_queries) == 1
+        assert "COUNT" not in first.captured_queries[0]["sql"]
+        assert "OFFSET" not in deep.captured_queries[-1]["sql"]
+
+    def test_page_numbers_still_available(self, api_client, slots):
+        """Test that ?page= keeps numbered pages with a total."""
+        response = api_client.get("/api/v1/time-slots/?page=3")
+
+        assert response.data["count"] == 45
+        assert [row["id"] for row in response.data["results"]] == [slot.id for slot in slots[40:]]
+
+    @pytest.mark.parametrize("cursor", ["garbage", "eyJwIjogWzFdfQ", "eyJwIjogWyJ4IiwgMV19"])
+    def test_invalid_cursor(self, api_client, cursor):
+        """Test that malformed cursors are rejected."""
+        response = api_client.get(f"/api/v1/time-slots/?cursor={cursor}")
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestAvailableSlotsCursor:
+    """Cached availability is paged by (start_time, id) too."""
+
+    def test_walks_every_slot_once(self, api_client, staff, slots):
+        """Test paging through a staff member's available slots and back."""
+        url = f"/api/v1/staff/{staff.slug}/available_slots/?days=3"
+        own = [slot.id for slot in slots if slot.staff_id == staff.id]
+
+        pages = walk(api_client, url)
+        assert sum(pages, []) == own
+
+        second = api_client.get(api_client.get(url).data["next"])
+        assert second.data["next"] is None
+        back = api_client.get(second.data["previous"])
+        assert [row["id"] for row in back.data["results"]] == own[:20]
+        assert back.data["previous"] is None
+
+
+@pytest.mark.django_db
+class TestBookingCursor:
+    """Bookings are paged newest first by (-created_at, id)."""
+
+    def test_ties_are_broken_by_id(self, authenticated_client, customer, staff, slots):
+        """Test that bookings created in the same instant are neither skipped nor repeated."""
+        service = staff.services.get()
+        bookings = [
+            Booking.objects.create(
+                customer=customer, service=service, staff=staff, start_time=slot.start_time
+            )
+            for slot in slots[:25]
+        ]
+        now = timezone.now()
+        Booking.objects.filter(pk__in=[b.pk for b in bookings[:15]]).update(created_at=now)
+        Booking.objects.filter(pk__in=[b.pk for b in bookings[15:]]).update(
+            created_at=now - timedelta(hours=1)
+        )
+
+        pages = walk(authenticated_client, "/api/v1/bookings/")
+
+        assert [len(page) for page in pages] == [20, 5]
+        assert sum(pages, []) == [b.pk for b in bookings]
@@ -0,0 +1,129 @@
+"""Tests for the plain-dict time slot serialization."""
+
+from __future__ import annotations
+
+from datetime import time, timedelta
+from decimal import Decimal
+from time import perf_counter
+
+from django.utils import timezone
+
+import pytest
+
+from apps.api.rows import time_slot_objects, time_slot_rows, time_slot_values
+from apps.api.serializers import TimeSlotSerializer
+from apps.booking.bitmaps import cached_available_slots
+from apps.booking.models import OpeningHour, Service, Staff, TimeSlot
+
+
+@pytest.fixture
+def staff(db):
+    """Create a staff member with a service."""
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(
+        Service.objects.create(
+            name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+        )
+    )
+    return staff
+
+
+def create_slots(staff, count):
+    """Create hourly slots from tomorrow."""
+    start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    TimeSlot.objects.bulk_create(
+        TimeSlot(
+            staff=staff,
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i + 1),
+        )
+        for i in range(count)
+    )
+    return TimeSlot.objects.select_related("staff").order_by("start_time", "id")
+
+
+@pytest.mark.django_db
+class TestIdenticalOutput:
+    """The fast path renders exactly what TimeSlotSerializer does."""
+
+    def test_stored_rows(self, staff):
+        """Test rows from .values(), including a full, a blocked and a past slot."""
+        slots = create_slots(staff, 5)
+        TimeSlot.objects.filter(pk=slots[1].pk).update(booked_count=1)
+        TimeSlot.objects.filter(pk=slots[2].pk).update(is_blocked=True)
+        past = timezone.now() - timedelta(hours=3, microseconds=1)
+        TimeSlot.objects.filter(pk=slots[3].pk).update(
+            start_time=past, end_time=past + timedelta(hours=1)
+        )
+
+        expected = TimeSlotSerializer(slots.all(), many=True).data
+        rows = time_slot_rows(time_slot_values(slots.all()))
+
+        assert rows == expected
+        assert [row["is_available"] for row in rows] == [False, True, False, False, True]
+
+    def test_current_time_zone(self, staff, settings):
+        """Test that times are rendered in the active time zone, like DRF."""
+        settings.TIME_ZONE = "Europe/Paris"
+        slots = create_slots(staff, 1)
+
+        rows = time_slot_rows(time_slot_values(slots))
+
+        assert rows == TimeSlotSerializer(slots, many=True).data
+        assert rows[0]["start_time"].endswith(("+01:00", "+02:00"))
+
+    def test_cached_availability(self, staff):
+        """Test the stored slots cached availability returns."""
+        create_slots(staff, 3)
+        day = timezone.localdate() + timedelta(days=1)
+        slots = cached_available_slots(staff, day, day + timedelta(days=1))
+
+        assert time_slot_objects(slots) == TimeSlotSerializer(slots, many=True).data
+
+    def test_computed_availability(self, staff, settings):
+        """Test computed slots with their string ids."""
+        settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+        settings.BOOKING_SLOT_MINUTES = 60
+        day = timezone.localdate() + timedelta(days=1)
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(12))
+        slots = cached_available_slots(staff, day, day)
+
+        assert len(slots) == 3
+        assert time_slot_objects(slots) == TimeSlotSerializer(slots, many=True).data
+
+    def test_api(self, api_client, staff):
+        """Test that the list endpoint still renders the serializer's JSON."""
+        slots = create_slots(staff, 3)
+
+        response = api_client.get("/api/v1/time-slots/")
+
+        assert response.json()["results"] == TimeSlotSerializer(slots, many=True).data
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestBenchmark:
+    """Objects per second at 10k slots, queries included; run with ``-m slow -s``."""
+
+    COUNT = 10_000
+
+    def test_faster_than_serializer(self, staff):
+        """Test that the fast path is at least twice as fast as the serializer."""
+        slots = create_slots(staff, self.COUNT)
+
+        def rate(serialize):
+            best = 0.0
+            for _ in range(3):
+                started = perf_counter()
+                assert len(serialize()) == self.COUNT
+                best = max(best, self.COUNT / (perf_counter() - started))
+            return best
+
+        before = rate(lambda: TimeSlotSerializer(slots.all(), many=True).data)
+        after = rate(lambda: time_slot_rows(time_slot_values(slots.all())))
+
+        print(
+            f"\nTimeSlotSerializer: {before:,.0f} slots/s\n"
+            f"time_slot_rows:     {after:,.0f} slots/s ({after / before:.1f}x)"
+        )
+        assert after > 2 * before
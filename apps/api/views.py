@@ -1,17 +1,28 @@
 """API views using Django REST Framework."""
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import date, timedelta
 
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from apps.accounts.models import Customer
+from apps.booking.bitmaps import cached_available_slots
 from apps.booking.models import Booking, Service, Staff, TimeSlot
 
+from .caching import cache_responses
+from .conditional import conditional_catalog
+from .fields import OptimizedQuerySetMixin, select_fields
+from .pagination import NewestFirstCursorPagination, StartTimeCursorPagination
+from .renderers import CompactJSONRenderer
+from .rows import compact_availability, time_slot_objects, time_slot_rows, time_slot_values
 from .serializers import (
     BookingCreateSerializer,
     BookingSerializer,
@@ -24,12 +35,17 @@ from .serializers import (
 )
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+@conditional_catalog
+@cache_responses(Service, Staff, Staff.services.through)
+class ServiceViewSet(OptimizedQuerySetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for listing and retrieving services.
 
     list: Get all active services
     retrieve: Get a specific service by ID or slug
+
+    Both carry an ETag and Last-Modified and answer revalidation with 304,
+    and are served from the response cache.
     """
 
     queryset = Service.objects.filter(is_active=True)
@@ -49,16 +65,22 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset.distinct()
 
 
-class StaffViewSet(viewsets.ReadOnlyModelViewSet):
+@conditional_catalog
+@cache_responses(Service, Staff, Staff.services.through)
+class StaffViewSet(OptimizedQuerySetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for listing and retrieving staff members.
 
     list: Get all active staff members
     retrieve: Get a specific staff member by ID or slug
     available_slots: Get available time slots for a staff member
+
+    list and retrieve carry an ETag and Last-Modified, answer revalidation
+    with 304, and are served from the response cache.
     """
 
-    queryset = Staff.objects.filter(is_active=True).prefetch_related("services")
+    # Services are prefetched by OptimizedQuerySetMixin when the response includes them
+    queryset = Staff.objects.filter(is_active=True)
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
 
@@ -79,42 +101,51 @@ class StaffViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset.distinct()
 
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], pagination_class=StartTimeCursorPagination)
     def available_slots(self, request, slug=None):
         """Get available time slots for this staff member."""
         staff = self.get_object()
 
         # Get date range from query params
         days_ahead = int(request.query_params.get("days", 14))
-        today = timezone.now().date()
+        today = timezone.localdate()
         end_date = today + timedelta(days=days_ahead)
 
-        # Get available slots
-        slots = TimeSlot.objects.filter(
-            staff=staff,
-            start_time__date__gte=today,
-            start_time__date__lte=end_date,
-            is_blocked=False,
-            start_time__gte=timezone.now(),
-        ).order_by("start_time")
+        # Only offer starts where the whole service fits, if one is given
+        service = None
+        service_id = request.query_params.get("service_id")
+        if service_id:
+            service = get_object_or_404(staff.services.all(), pk=service_id)
 
-        # Filter only available slots
-        available_slots = [slot for slot in slots if slot.is_available()]
+        # Served from the cached availability bitmaps; the database is only
+        # read for days that are not cached yet
+        slots = cached_available_slots(staff, today, end_date, service)
 
-        serializer = TimeSlotSerializer(available_slots, many=True)
-        return Response(serializer.data)
+        # Plain dicts; identical to TimeSlotSerializer output, several times faster
+        page = self.paginate_queryset(slots)
+        return self.get_paginated_response(select_fields(time_slot_objects(page), request))
 
 
-class TimeSlotViewSet(viewsets.ReadOnlyModelViewSet):
+class TimeSlotViewSet(OptimizedQuerySetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for available time slots.
 
     list: Get all available time slots
     retrieve: Get a specific time slot
+
+    Lists are paged by cursor; pass ``?page=`` for numbered pages, or
+    ``?format=compact`` for the free slots of a date range grouped by day
+    and staff member in parallel arrays.
     """
 
     serializer_class = TimeSlotSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = StartTimeCursorPagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
+
+    # Days shown by the compact format without an end_date, and at most
+    compact_days = 14
+    compact_max_days = 62
 
     def get_queryset(self):
         """Get available time slots."""
@@ -128,19 +159,64 @@ class TimeSlotViewSet(viewsets.ReadOnlyModelViewSet):
         if staff_id:
             queryset = queryset.filter(staff_id=staff_id)
 
-        # Filter by date range
-        start_date = self.request.query_params.get("start_date")
-        end_date = self.request.query_params.get("end_date")
-
-        if start_date:
-            queryset = queryset.filter(start_time__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(start_time__date__lte=end_date)
-
-        return queryset.order_by("start_time")
-
+        # Filter by local date range
+        start_date = self._date_param("start_date")
+        end_date = self._date_param("end_date")
+        if start_date or end_date:
+            queryset = queryset.in_window(start_date, end_date)
+
+        return queryset.order_by("start_time", "id")
+
+    def list(self, request, *args, **kwargs):
+        """
+        List slots from ``.values()`` rows rather than model instances.
+
+        The output is identical to ``TimeSlotSerializer``, built without a
+        model instance or serializer field per value.
+        """
+        if request.accepted_renderer.format == CompactJSONRenderer.format:
+            return Response(self._compact_availability())
+        rows = time_slot_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(select_fields(time_slot_rows(rows), request))
+        return self.get_paginated_response(select_fields(time_slot_rows(page), request))
+
+    def _compact_availability(self) -> dict:
+        """Free slots of the requested days and staff in the compact format."""
+        start_date = self._date_param("start_date") or timezone.localdate()
+        end_date = self._date_param("end_date") or start_date + timedelta(
+            days=self.compact_days - 1
+        )
+        if not 0 <= (end_date - start_date).days < self.compact_max_days:
+            raise ValidationError(
+                {"end_date": f"Enter a date within {self.compact_max_days} days of start_date."}
+            )
 
-class BookingViewSet(viewsets.ModelViewSet):
+        staff = Staff.objects.filter(is_active=True).order_by("pk")
+        staff_id = self.request.query_params.get("staff_id")
+        if staff_id:
+            staff = staff.filter(pk=staff_id)
+        staff = list(staff)
+
+        slots = cached_available_slots(staff, start_date, end_date)
+        return compact_availability(slots, staff, start_date, end_date)
+
+    def _date_param(self, name: str) -> date | None:
+        """Parse an optional YYYY-MM-DD query parameter."""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Enter a valid date in YYYY-MM-DD format."})
+        return parsed
+
+
+class BookingViewSet(OptimizedQuerySetMixin, viewsets.ModelViewSet):
     """
     ViewSet for bookings.
 
@@ -148,14 +224,17 @@ class BookingViewSet(viewsets.ModelViewSet):
     create: Create a new booking
     retrieve: Get a specific booking
     cancel: Cancel a booking
+
+    Lists are paged by cursor, newest first; pass ``?page=`` for numbered pages.
     """
 
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         """Get bookings for current user."""
-        return Booking.objects.filter(customer=self.request.user).order_by("-created_at")
+        return Booking.objects.filter(customer=self.request.user).order_by("-created_at", "id")
 
     def get_serializer_class(self):
         """Use different serializer for create action."""
@@ -1,10 +1,27 @@
 """Admin configuration for booking app."""
 from __future__ import annotations
 
+from datetime import timedelta
+
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
 from django.utils.html import format_html
 
-from .models import Booking, OpeningHour, Service, Staff, TimeSlot
+from . import bitmaps
+from .assignment import forget_booked_counts
+from .models import (
+    Booking,
+    NotificationAttempt,
+    NotificationDeadLetter,
+    NotificationOutbox,
+    OpeningHour,
+    Service,
+    Staff,
+    StaffWorkingHour,
+    TimeSlot,
+)
 
 
 @admin.register(Service)
@@ -50,6 +67,13 @@ class StaffServicesInline(admin.TabularInline):
     extra = 1
 
 
+class StaffWorkingHourInline(admin.TabularInline):
+    """Inline for staff working hours."""
+
+    model = StaffWorkingHour
+    extra = 0
+
+
 @admin.register(Staff)
 class StaffAdmin(admin.ModelAdmin):
     """Admin interface for Staff model."""
@@ -77,6 +101,8 @@ class StaffAdmin(admin.ModelAdmin):
 
     filter_horizontal = ["services"]
 
+    inlines = [StaffWorkingHourInline]
+
     fieldsets = (
         (None, {"fields": ("first_name", "last_name", "slug")}),
         ("Bio & Media", {"fields": ("bio", "avatar")}),
@@ -104,6 +130,34 @@ class OpeningHourAdmin(admin.ModelAdmin):
     ordering = ["weekday"]
 
 
+class SlotWindowFilter(admin.SimpleListFilter):
+    """Filter time slots by upcoming local calendar days."""
+
+    title = "upcoming"
+    parameter_name = "window"
+
+    # Parameter value -> (label, first day offset from today, number of days)
+    WINDOWS = {
+        "today": ("Today", 0, 1),
+        "tomorrow": ("Tomorrow", 1, 1),
+        "7d": ("Next 7 days", 0, 7),
+        "14d": ("Next 14 days", 0, 14),
+    }
+
+    def lookups(self, request, model_admin):
+        """Return filter choices."""
+        return [(value, label) for value, (label, _offset, _days) in self.WINDOWS.items()]
+
+    def queryset(self, request, queryset):
+        """Restrict slots to the selected window."""
+        if self.value() not in self.WINDOWS:
+            return queryset
+
+        _label, offset, days = self.WINDOWS[self.value()]
+        first_day = timezone.localdate() + timedelta(days=offset)
+        return queryset.in_window(first_day, first_day + timedelta(days=days - 1))
+
+
 @admin.register(TimeSlot)
 class TimeSlotAdmin(admin.ModelAdmin):
     """Admin interface for TimeSlot model."""
@@ -113,11 +167,13 @@ class TimeSlotAdmin(admin.ModelAdmin):
         "start_time",
         "end_time",
         "capacity",
+        "booked_count",
         "is_blocked",
         "get_availability",
     ]
 
     list_filter = [
+        SlotWindowFilter,
         "staff",
         "is_blocked",
         "start_time",
@@ -132,6 +188,10 @@ class TimeSlotAdmin(admin.ModelAdmin):
 
     ordering = ["-start_time"]
 
+    def get_queryset(self, request):
+        """Load staff with the changelist query."""
+        return super().get_queryset(request).select_related("staff")
+
     def get_availability(self, obj):
         """Show availability status."""
         if obj.is_available():
@@ -164,6 +224,9 @@ class BookingAdmin(admin.ModelAdmin):
         "staff",
     ]
 
+    # customer is nullable, so the default select_related() would skip it
+    list_select_related = ["customer", "service", "staff"]
+
     search_fields = [
         "customer__email",
         "customer__first_name",
@@ -244,20 +307,143 @@ class BookingAdmin(admin.ModelAdmin):
 
     def confirm_bookings(self, request, queryset):
         """Admin action to confirm selected bookings."""
-        count = 0
-        for booking in queryset:
-            if booking.status == "pending":
-                booking.confirm()
-                count += 1
+        with transaction.atomic():
+            confirmed = []
+            for booking in queryset.filter(status="pending"):
+                booking.confirm(notify=False)
+                confirmed.append(booking)
+
+            # Queued together so one worker sends them over one connection
+            NotificationOutbox.objects.enqueue_many(confirmed, "confirmation")
+
+        count = len(confirmed)
         self.message_user(request, f"{count} booking(s) confirmed.")
 
     confirm_bookings.short_description = "Confirm selected bookings"
 
     def cancel_bookings(self, request, queryset):
         """Admin action to cancel selected bookings."""
-        count = queryset.update(status="canceled")
+        with transaction.atomic():
+            active = queryset.filter(status__in=Booking.ACTIVE_STATUSES)
+            released = list(active.order_by().values("time_slot").annotate(count=Count("id")))
+            spans = list(active.values_list("staff_id", "start_time", "end_time"))
+            canceled = list(active.only("pk"))
+            count = active.update(status="canceled")
+            NotificationOutbox.objects.enqueue_many(canceled, "cancellation")
+
+            # Give the freed capacity back to each affected slot
+            for row in released:
+                TimeSlot.objects.release(row["time_slot"], row["count"])
+
+            # update() sends no signals; rebuild the affected availability and counts
+            transaction.on_commit(lambda: bitmaps.invalidate_spans(spans))
+            transaction.on_commit(lambda: forget_booked_counts(spans))
+
         self.message_user(request, f"{count} booking(s) canceled.")
 
     cancel_bookings.short_description = "Cancel selected bookings"
 
 
+class NotificationAttemptInline(admin.TabularInline):
+    """Read-only inline for notification delivery attempts."""
+
+    model = NotificationAttempt
+    extra = 0
+    can_delete = False
+    fields = ["attempt", "channel", "status", "error_class", "error", "created_at"]
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None) -> bool:
+        """Attempts are only recorded by the outbox."""
+        return False
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    """Admin interface for NotificationOutbox model."""
+
+    list_display = [
+        "kind",
+        "booking",
+        "status",
+        "attempts",
+        "available_at",
+        "sent_at",
+    ]
+
+    list_filter = [
+        "status",
+        "kind",
+        "created_at",
+    ]
+
+    search_fields = [
+        "booking__confirmation_code",
+        "booking__guest_email",
+        "booking__customer__email",
+    ]
+
+    list_select_related = ["booking__service", "booking__customer"]
+
+    raw_id_fields = ["booking"]
+
+    readonly_fields = [
+        "attempts",
+        "last_error",
+        "sent_at",
+        "created_at",
+    ]
+
+    inlines = [NotificationAttemptInline]
+
+    ordering = ["-created_at"]
+
+
+@admin.register(NotificationDeadLetter)
+class NotificationDeadLetterAdmin(admin.ModelAdmin):
+    """Admin interface for NotificationDeadLetter model."""
+
+    list_display = [
+        "notification",
+        "attempts",
+        "error_class",
+        "permanent",
+        "created_at",
+    ]
+
+    list_filter = [
+        "permanent",
+        "error_class",
+        "notification__kind",
+    ]
+
+    search_fields = [
+        "notification__booking__confirmation_code",
+        "notification__booking__guest_email",
+        "notification__booking__customer__email",
+        "error",
+    ]
+
+    list_select_related = ["notification"]
+
+    readonly_fields = [
+        "notification",
+        "attempts",
+        "error_class",
+        "error",
+        "permanent",
+        "created_at",
+    ]
+
+    actions = ["requeue_notifications"]
+
+    def has_add_permission(self, request) -> bool:
+        """Dead letters are only created by the outbox."""
+        return False
+
+    def requeue_notifications(self, request, queryset):
+        """Admin action to send the selected notifications again."""
+        count = queryset.requeue()
+        self.message_user(request, f"{count} notification(s) requeued.")
+
+    requeue_notifications.short_description = "Requeue selected notifications"
@@ -11,4 +11,8 @@ class BookingConfig(AppConfig):
     name = "apps.booking"
     verbose_name = "Booking"
 
+    def ready(self) -> None:
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
+
 
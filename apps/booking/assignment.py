@@ -0,0 +1,242 @@
+"""Load-balanced stylist assignment for "Any available" bookings."""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import cache
+from django.db.models import Count, QuerySet
+from django.utils import timezone
+
+from .availability import VirtualSlot, get_availability_backend
+from .bitmaps import gaps_created, get_bitmaps
+from .exceptions import SlotUnavailableError
+from .managers import day_bounds
+from .models import Booking, Service, Staff, TimeSlot
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TIMEOUT = 60 * 60 * 24 * 2
+
+
+def _counter_key(staff_id: int, day: date) -> str:
+    """Cache key of a staff member's active booking count for a local day."""
+    return f"utilization:{staff_id}:{day.isoformat()}"
+
+
+def booked_counts(staff_ids: Iterable[int], day: date) -> dict[int, int]:
+    """
+    Get the number of active bookings per staff member on a local day.
+
+    Counts come from the cache; missing ones are counted together in one
+    grouped query and cached.
+
+    Args:
+        staff_ids: Staff primary keys
+        day: Local day
+
+    Returns:
+        Mapping of staff id to active booking count
+    """
+    keys = {_counter_key(staff_id, day): staff_id for staff_id in staff_ids}
+    counts = {keys[key]: count for key, count in cache.get_many(list(keys)).items()}
+
+    missing = [staff_id for staff_id in keys.values() if staff_id not in counts]
+    if missing:
+        lower, upper = day_bounds(day, day)
+        fresh = dict.fromkeys(missing, 0)
+        fresh.update(
+            Booking.objects.filter(
+                staff_id__in=missing,
+                status__in=Booking.ACTIVE_STATUSES,
+                start_time__gte=lower,
+                start_time__lt=upper,
+            )
+            .order_by()
+            .values("staff_id")
+            .annotate(count=Count("id"))
+            .values_list("staff_id", "count")
+        )
+        cache.set_many(
+            {_counter_key(staff_id, day): count for staff_id, count in fresh.items()},
+            COUNTER_TIMEOUT,
+        )
+        counts.update(fresh)
+
+    return counts
+
+
+def adjust_booked_count(staff_id: int, start_time: datetime, delta: int) -> None:
+    """
+    Add to a cached booking count, if it is cached.
+
+    Args:
+        staff_id: Staff primary key
+        start_time: Start of the booking, which picks the local day
+        delta: 1 for a new active booking, -1 for a released one
+    """
+    try:
+        cache.incr(_counter_key(staff_id, timezone.localdate(start_time)), delta)
+    except ValueError:
+        # Not cached; the next read counts from the database
+        pass
+
+
+def forget_booked_counts(spans: Iterable[tuple[int, datetime, datetime]]) -> None:
+    """Drop the cached counts for the days of (staff id, start, end) spans."""
+    cache.delete_many(
+        [_counter_key(staff_id, timezone.localdate(start)) for staff_id, start, _end in spans]
+    )
+
+
+class AssignmentPolicy(ABC):
+    """Abstract base class for stylist assignment policies."""
+
+    @abstractmethod
+    def rank(
+        self, slots: list[TimeSlot | VirtualSlot], service: Service
+    ) -> list[TimeSlot | VirtualSlot]:
+        """
+        Order free slots of different stylists at one start time, best first.
+
+        Args:
+            slots: Candidate slots, one per free stylist, ordered by staff id
+            service: Service being booked
+
+        Returns:
+            The same slots in the order they should be tried
+        """
+        pass
+
+
+class LeastBookedPolicy(AssignmentPolicy):
+    """Prefer the stylist with the fewest bookings that day."""
+
+    def rank(self, slots, service):
+        """Sort by the cached booking count, then staff id."""
+        if not slots:
+            return []
+        day = timezone.localdate(slots[0].start_time)
+        counts = booked_counts([slot.staff_id for slot in slots], day)
+        return sorted(slots, key=lambda slot: (counts[slot.staff_id], slot.staff_id))
+
+
+class RoundRobinPolicy(AssignmentPolicy):
+    """Rotate through the free stylists, one assignment at a time."""
+
+    def rank(self, slots, service):
+        """Start after the stylist picked by the previous assignment that day."""
+        if not slots:
+            return []
+        key = f"assignment:round_robin:{timezone.localdate(slots[0].start_time).isoformat()}"
+        cache.add(key, 0, COUNTER_TIMEOUT)
+        try:
+            turn = cache.incr(key) - 1
+        except ValueError:
+            turn = 0
+        offset = turn % len(slots)
+        return slots[offset:] + slots[:offset]
+
+
+class FewestGapsPolicy(AssignmentPolicy):
+    """Prefer the stylist whose day is left least fragmented."""
+
+    def rank(self, slots, service):
+        """
+        Sort by free time left on either side of the booking.
+
+        Reads the cached availability bitmaps; ties go to the stylist with
+        fewer bookings that day.
+        """
+        if not slots:
+            return []
+        day = timezone.localdate(slots[0].start_time)
+        staff_ids = [slot.staff_id for slot in slots]
+        bitmaps = get_bitmaps(staff_ids, day, day)
+        counts = booked_counts(staff_ids, day)
+        length = timedelta(minutes=service.duration)
+
+        def score(slot):
+            bitmap = bitmaps[(slot.staff_id, day)]
+            gaps = gaps_created(bitmap, day, slot.start_time, slot.start_time + length)
+            return gaps, counts[slot.staff_id], slot.staff_id
+
+        return sorted(slots, key=score)
+
+
+def get_assignment_policy() -> AssignmentPolicy:
+    """
+    Factory function to get the configured assignment policy.
+
+    Returns:
+        Policy selected by ``BOOKING_ASSIGNMENT_POLICY`` (``"least_booked"``,
+        ``"round_robin"`` or ``"fewest_gaps"``); LeastBookedPolicy otherwise
+    """
+    policy = getattr(settings, "BOOKING_ASSIGNMENT_POLICY", "least_booked").lower()
+
+    if policy == "round_robin":
+        return RoundRobinPolicy()
+    elif policy == "fewest_gaps":
+        return FewestGapsPolicy()
+    else:
+        return LeastBookedPolicy()
+
+
+def assign(
+    staff: QuerySet[Staff],
+    start_time: datetime,
+    *,
+    service: Service,
+    customer: AbstractBaseUser | None = None,
+    guest_email: str = "",
+    guest_name: str = "",
+    guest_phone: str = "",
+    notes: str = "",
+) -> Booking:
+    """
+    Book whichever qualified stylist the policy prefers at a start time.
+
+    Candidates are the stylists free for the whole service at that time.
+    They are tried in policy order; each attempt is a separate atomic
+    reservation, so a stylist taken concurrently only costs a retry with the
+    next candidate and never a partial booking.
+
+    Args:
+        staff: Staff members who may be assigned
+        start_time: Start time chosen by the guest
+        service: Service being booked
+        customer: Registered customer, or None for guest bookings
+        guest_email: Guest email address
+        guest_name: Guest full name
+        guest_phone: Guest phone number
+        notes: Additional notes or special requests
+
+    Returns:
+        The created booking
+
+    Raises:
+        SlotUnavailableError: If no candidate is free any more
+    """
+    backend = get_availability_backend()
+    candidates = get_assignment_policy().rank(backend.slots_at(staff, start_time, service), service)
+
+    for slot in candidates:
+        try:
+            return backend.reserve(
+                slot,
+                service=service,
+                customer=customer,
+                guest_email=guest_email,
+                guest_name=guest_name,
+                guest_phone=guest_phone,
+                notes=notes,
+            )
+        except SlotUnavailableError:
+            logger.info(f"Staff {slot.staff_id} was taken at {start_time}, trying the next")
+
+    raise SlotUnavailableError()
@@ -0,0 +1,503 @@
+"""Availability engine for time slots with pluggable backends."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Min, QuerySet
+from django.utils import timezone
+
+from .intervals import fitting_starts, grid_starts, subtract
+from .models import Booking, Service, Staff, TimeSlot
+from .reservations import reserve_slot, reserve_time
+from .schedule import busy_intervals, overflow_intervals, working_intervals
+
+
+@dataclass
+class VirtualSlot:
+    """
+    A bookable time computed from working hours and bookings.
+
+    Quacks like a TimeSlot for templates and serializers, but has no row; its
+    ``id`` is a token encoding the staff member and start time.
+    """
+
+    staff: Staff
+    start_time: datetime
+    end_time: datetime
+    capacity: int = 1
+    booked_count: int = 0
+    is_blocked: bool = False
+
+    @property
+    def id(self) -> str:
+        """Token identifying this slot, e.g. ``"12-1767258000"``."""
+        return f"{self.staff.pk}-{int(self.start_time.timestamp())}"
+
+    pk = id
+
+    @property
+    def staff_id(self) -> int:
+        """Primary key of the staff member."""
+        return self.staff.pk
+
+    def is_available(self) -> bool:
+        """Computed slots are only ever listed while free."""
+        return True
+
+
+@dataclass
+class StartTime:
+    """
+    A start time offered for "Any available" staff.
+
+    ``slot_id`` is the slot of the stylist picked for this time: the lowest
+    slot id (stored slots) or the lowest staff id (computed slots), so the
+    same listing always picks the same stylist.
+    """
+
+    start_time: datetime
+    free_staff: int
+    slot_id: int | str
+
+    @property
+    def id(self) -> int | str:
+        """Id of the picked slot, posted back by the booking form."""
+        return self.slot_id
+
+
+class AvailabilityBackend(ABC):
+    """Abstract base class for availability backends."""
+
+    @abstractmethod
+    def available_slots(
+        self,
+        staff: Staff | QuerySet[Staff] | None,
+        start_date: date,
+        end_date: date,
+        service: Service | None = None,
+    ) -> Iterable[TimeSlot | VirtualSlot]:
+        """
+        Get bookable slots for one or more staff members in a date range.
+
+        Args:
+            staff: Staff member, queryset of staff members, or None for no staff
+            start_date: First local day of the range (inclusive)
+            end_date: Last local day of the range (inclusive)
+            service: Service to fit; when given, only starts where its whole
+                duration is free for the stylist are returned
+
+        Returns:
+            Available slots ordered by start time, then staff
+        """
+        pass
+
+    def start_times(
+        self,
+        staff: QuerySet[Staff],
+        start_date: date,
+        end_date: date,
+        service: Service | None = None,
+    ) -> list[StartTime]:
+        """
+        Get distinct bookable start times across staff members.
+
+        The default groups ``available_slots`` in Python; backends that can
+        group in the database override it.
+
+        Args:
+            staff: Staff members to consider
+            start_date: First local day of the range (inclusive)
+            end_date: Last local day of the range (inclusive)
+            service: Service whose whole duration must fit from each start
+
+        Returns:
+            Start times in order, each with its free stylist count and pick
+        """
+        grouped: dict[datetime, StartTime] = {}
+        for slot in self.available_slots(staff, start_date, end_date, service):
+            entry = grouped.get(slot.start_time)
+            if entry is None:
+                grouped[slot.start_time] = StartTime(slot.start_time, 1, slot.id)
+            else:
+                entry.free_staff += 1
+        return list(grouped.values())
+
+    def slots_at(
+        self, staff: QuerySet[Staff], start_time: datetime, service: Service
+    ) -> list[TimeSlot | VirtualSlot]:
+        """
+        Get the free slots of several staff members at one start time.
+
+        Args:
+            staff: Staff members to consider
+            start_time: Start time to book
+            service: Service whose whole duration must fit
+
+        Returns:
+            One slot per free staff member, ordered by staff id
+        """
+        day = timezone.localdate(start_time)
+        return [
+            slot
+            for slot in self.available_slots(staff, day, day, service)
+            if slot.start_time == start_time
+        ]
+
+    @abstractmethod
+    def get_slot(self, slot_id: int | str) -> TimeSlot | VirtualSlot | None:
+        """
+        Look up a slot by the ``id`` it was listed with.
+
+        Args:
+            slot_id: Slot id, as posted back by the booking form
+
+        Returns:
+            The slot, or None if the id does not identify one
+        """
+        pass
+
+    @abstractmethod
+    def get_slot_at(self, staff: Staff, start_time: datetime) -> TimeSlot | VirtualSlot | None:
+        """
+        Look up the slot for a staff member at a start time.
+
+        Args:
+            staff: Staff member
+            start_time: Slot start
+
+        Returns:
+            The slot, or None if there is none at that time
+        """
+        pass
+
+    @abstractmethod
+    def reserve(
+        self,
+        slot: TimeSlot | VirtualSlot,
+        *,
+        service: Service,
+        staff: Staff | None = None,
+        customer: AbstractBaseUser | None = None,
+        guest_email: str = "",
+        guest_name: str = "",
+        guest_phone: str = "",
+        notes: str = "",
+    ) -> Booking:
+        """
+        Reserve a slot and create a pending booking.
+
+        Args:
+            slot: Slot returned by this backend
+            service: Service being booked
+            staff: Expected staff member (checked against the slot when given)
+            customer: Registered customer, or None for guest bookings
+            guest_email: Guest email address
+            guest_name: Guest full name
+            guest_phone: Guest phone number
+            notes: Additional notes or special requests
+
+        Returns:
+            The created booking
+
+        Raises:
+            SlotUnavailableError: If the slot is no longer free
+            ValidationError: If the booking is otherwise invalid
+        """
+        pass
+
+
+class StoredSlotBackend(AvailabilityBackend):
+    """Availability from pre-generated TimeSlot rows."""
+
+    def available_slots(self, staff, start_date, end_date, service=None):
+        """
+        Get bookable TimeSlot rows.
+
+        Blocked, past and fully booked slots are excluded in SQL using the
+        maintained ``booked_count`` column, so the whole range is resolved with
+        a single query and no join to bookings. With a service, the open slots
+        are merged into contiguous free runs per stylist, booking overflow from
+        longer services is subtracted, and a sweep keeps the slots where the
+        service fits; that costs one more query.
+        """
+        if staff is None:
+            return TimeSlot.objects.none()
+
+        queryset = (
+            TimeSlot.objects.available()
+            .in_window(start_date, end_date)
+            .filter(start_time__gte=timezone.now())
+        )
+
+        if isinstance(staff, Staff):
+            queryset = queryset.filter(staff=staff)
+        else:
+            queryset = queryset.filter(staff__in=staff)
+
+        queryset = queryset.order_by("start_time", "staff_id")
+        if service is None:
+            return queryset
+
+        return self._fitting(list(queryset), start_date, end_date, service)
+
+    def _fitting(self, slots, start_date, end_date, service) -> list[TimeSlot]:
+        """Keep the slots from which the whole service duration is free."""
+        by_staff: dict[int, list[TimeSlot]] = defaultdict(list)
+        for slot in slots:
+            by_staff[slot.staff_id].append(slot)
+
+        length = timedelta(minutes=service.duration)
+        overflow = overflow_intervals(by_staff, start_date, end_date)
+        fitting: set[int] = set()
+        for staff_id, staff_slots in by_staff.items():
+            free = subtract(
+                [(slot.start_time, slot.end_time) for slot in staff_slots],
+                overflow.get(staff_id, []),
+            )
+            starts = set(fitting_starts([slot.start_time for slot in staff_slots], free, length))
+            fitting.update(slot.pk for slot in staff_slots if slot.start_time in starts)
+
+        return [slot for slot in slots if slot.pk in fitting]
+
+    def start_times(self, staff, start_date, end_date, service=None) -> list[StartTime]:
+        """
+        Group open slots by start time in one query.
+
+        Rows are counted and the lowest slot id picked per start time in SQL,
+        and service fitting runs as correlated subqueries, so memory and
+        query count do not grow with the number of stylists.
+        """
+        queryset = (
+            TimeSlot.objects.available()
+            .in_window(start_date, end_date)
+            .filter(start_time__gte=timezone.now(), staff__in=staff)
+        )
+        if service is not None:
+            queryset = queryset.fitting(timedelta(minutes=service.duration))
+
+        return [
+            StartTime(start_time, free_staff, slot_id)
+            for start_time, free_staff, slot_id in queryset.order_by()
+            .values("start_time")
+            .annotate(free_staff=Count("id"), slot_id=Min("id"))
+            .order_by("start_time")
+            .values_list("start_time", "free_staff", "slot_id")
+        ]
+
+    def slots_at(self, staff, start_time, service) -> list[TimeSlot]:
+        """Load the open slots at a start time that fit the service in one query."""
+        if start_time < timezone.now():
+            return []
+        return list(
+            TimeSlot.objects.available()
+            .filter(staff__in=staff, start_time=start_time)
+            .fitting(timedelta(minutes=service.duration))
+            .select_related("staff")
+            .order_by("staff_id")
+        )
+
+    def get_slot(self, slot_id):
+        """Load a TimeSlot row by primary key."""
+        try:
+            slot_id = int(slot_id)
+        except (TypeError, ValueError):
+            return None
+        return TimeSlot.objects.select_related("staff").filter(pk=slot_id).first()
+
+    def get_slot_at(self, staff, start_time):
+        """Load the staff member's TimeSlot row starting at a time."""
+        return (
+            TimeSlot.objects.select_related("staff")
+            .filter(staff=staff, start_time=start_time)
+            .first()
+        )
+
+    def reserve(self, slot, *, service, staff=None, **details) -> Booking:
+        """Claim capacity on the slot row."""
+        return reserve_slot(slot.id, service=service, staff=staff, **details)
+
+
+class ComputedSlotBackend(AvailabilityBackend):
+    """
+    Availability computed from working hours, bookings and blocks.
+
+    Needs no TimeSlot rows except for explicit blocks (``is_blocked=True``).
+    Free time is working time minus busy time, and slots are laid out every
+    ``BOOKING_SLOT_MINUTES`` from the start of each working interval.
+    """
+
+    @property
+    def slot_length(self) -> timedelta:
+        """Length of a computed slot."""
+        return timedelta(minutes=settings.BOOKING_SLOT_MINUTES)
+
+    def available_slots(self, staff, start_date, end_date, service=None) -> list[VirtualSlot]:
+        """Compute free slots with interval subtraction and a fitting sweep."""
+        if staff is None:
+            return []
+
+        staff_members = {member.pk: member for member in _as_list(staff)}
+        if not staff_members:
+            return []
+
+        working = working_intervals(staff_members, start_date, end_date)
+        busy = busy_intervals(staff_members, start_date, end_date)
+        length = self.slot_length if service is None else timedelta(minutes=service.duration)
+        now = timezone.now()
+
+        slots = [
+            VirtualSlot(staff=member, start_time=start, end_time=start + length)
+            for staff_id, member in staff_members.items()
+            for start in grid_starts(
+                working[staff_id],
+                subtract(working[staff_id], busy.get(staff_id, [])),
+                self.slot_length,
+                length,
+            )
+            if start >= now
+        ]
+        slots.sort(key=lambda slot: (slot.start_time, slot.staff_id))
+        return slots
+
+    def get_slot(self, slot_id):
+        """Decode a ``<staff id>-<unix time>`` token."""
+        try:
+            staff_id, timestamp = str(slot_id).split("-")
+            start_time = datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            return None
+
+        staff = Staff.objects.filter(pk=staff_id, is_active=True).first()
+        if staff is None:
+            return None
+        return self.get_slot_at(staff, start_time)
+
+    def get_slot_at(self, staff, start_time):
+        """Build the computed slot; whether it is free is checked on reserve."""
+        return VirtualSlot(
+            staff=staff, start_time=start_time, end_time=start_time + self.slot_length
+        )
+
+    def reserve(self, slot, *, service, staff=None, **details) -> Booking:
+        """Book the stylist's free time directly."""
+        if staff is not None and slot.staff_id != staff.pk:
+            raise ValidationError("Time slot does not belong to selected staff")
+        return reserve_time(slot.staff, slot.start_time, service=service, **details)
+
+
+def _as_list(staff: Staff | QuerySet[Staff]) -> list[Staff]:
+    """Normalize a staff member or queryset to a list."""
+    if isinstance(staff, Staff):
+        return [staff]
+    return list(staff)
+
+
+def get_availability_backend() -> AvailabilityBackend:
+    """
+    Factory function to get the configured availability backend.
+
+    Returns:
+        ComputedSlotBackend when ``BOOKING_AVAILABILITY_BACKEND`` is
+        ``"computed"``, otherwise StoredSlotBackend
+    """
+    if settings.BOOKING_AVAILABILITY_BACKEND == "computed":
+        return ComputedSlotBackend()
+    return StoredSlotBackend()
+
+
+def available_slots(
+    staff: Staff | QuerySet[Staff] | None,
+    start_date: date,
+    end_date: date,
+    service: Service | None = None,
+) -> Iterable[TimeSlot | VirtualSlot]:
+    """
+    Get bookable slots for one or more staff members in a date range.
+
+    Args:
+        staff: Staff member, queryset of staff members, or None for no staff
+        start_date: First local day of the range (inclusive)
+        end_date: Last local day of the range (inclusive)
+        service: Service whose whole duration must fit from each start
+
+    Returns:
+        Available slots ordered by start time, then staff
+    """
+    return get_availability_backend().available_slots(staff, start_date, end_date, service)
+
+
+def available_start_times(
+    staff: QuerySet[Staff],
+    start_date: date,
+    end_date: date,
+    service: Service | None = None,
+) -> list[StartTime]:
+    """
+    Get distinct bookable start times across staff members.
+
+    Used for "Any available" staff, where the guest only picks a time.
+
+    Args:
+        staff: Staff members to consider
+        start_date: First local day of the range (inclusive)
+        end_date: Last local day of the range (inclusive)
+        service: Service whose whole duration must fit from each start
+
+    Returns:
+        Start times in order, each with its free stylist count and pick
+    """
+    return get_availability_backend().start_times(staff, start_date, end_date, service)
+
+
+def get_slot(slot_id: int | str) -> TimeSlot | VirtualSlot | None:
+    """
+    Look up a slot by the ``id`` it was listed with.
+
+    Args:
+        slot_id: Slot id, as posted back by the booking form
+
+    Returns:
+        The slot, or None if the id does not identify one
+    """
+    return get_availability_backend().get_slot(slot_id)
+
+
+def reserve(slot: TimeSlot | VirtualSlot, **kwargs) -> Booking:
+    """
+    Reserve a slot with the configured backend.
+
+    Args:
+        slot: Slot returned by available_slots or get_slot
+        **kwargs: Booking details, see AvailabilityBackend.reserve
+
+    Returns:
+        The created booking
+    """
+    return get_availability_backend().reserve(slot, **kwargs)
+
+
+def group_slots_by_date(
+    slots: Iterable[TimeSlot | VirtualSlot | StartTime],
+) -> dict[str, list[TimeSlot | VirtualSlot | StartTime]]:
+    """
+    Group slots by their local ISO calendar date.
+
+    Args:
+        slots: Slots ordered by start time
+
+    Returns:
+        Mapping of ISO date string to the slots starting on that date
+    """
+    slots_by_date: dict[str, list[TimeSlot | VirtualSlot | StartTime]] = {}
+    for slot in slots:
+        slots_by_date.setdefault(timezone.localdate(slot.start_time).isoformat(), []).append(slot)
+    return slots_by_date
@@ -0,0 +1,505 @@
+"""Per-staff, per-day availability bitmaps kept in the Django cache."""
+
+from __future__ import annotations
+
+import logging
+import time as clock
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Q, QuerySet
+from django.utils import timezone
+
+from .availability import VirtualSlot, _as_list
+from .intervals import Interval, subtract
+from .models import Booking, Service, Staff, TimeSlot
+from .schedule import busy_intervals, working_intervals
+
+logger = logging.getLogger(__name__)
+
+QUANTUM_MINUTES = 15
+QUANTA_PER_DAY = 24 * 60 // QUANTUM_MINUTES
+CACHE_TIMEOUT = 60 * 60 * 24
+KEY_PREFIX = "availability"
+GENERATION_KEY = f"{KEY_PREFIX}:generation"
+
+# (first quantum, end quantum, TimeSlot id or None for computed slots, capacity)
+SlotStart = Tuple[int, int, Optional[int], int]
+
+
+class DayBitmap(NamedTuple):
+    """
+    Availability of one staff member on one local day.
+
+    Bit ``i`` of ``free`` and ``blocked`` covers the ``i``-th 15-minute
+    quantum after local midnight.
+    """
+
+    free: int
+    blocked: int
+    starts: tuple[SlotStart, ...]
+
+
+def cache_key(staff_id: int, day: date, generation: int = 0) -> str:
+    """Cache key of one staff member's bitmap for a local day."""
+    return f"{KEY_PREFIX}:{generation}:{staff_id}:{day.isoformat()}"
+
+
+def version_key(staff_id: int, day: date, generation: int = 0) -> str:
+    """
+    Cache key of the version of one staff member's day.
+
+    Every change to the day bumps it, and a cached bitmap is only used while
+    it carries the current version, so a rebuild that read the database
+    before a change can never be served after it.
+    """
+    return f"{cache_key(staff_id, day, generation)}:version"
+
+
+def _new_version() -> int:
+    """
+    Starting value of a missing version counter.
+
+    The current time in milliseconds rather than 0, so a counter that
+    expired cannot land back on a version that bitmaps were stamped with.
+    """
+    return clock.time_ns() // 1_000_000
+
+
+def _bump(key: str) -> int | None:
+    """Increment a version counter; return its previous value, or None if it was missing."""
+    try:
+        return cache.incr(key) - 1
+    except ValueError:
+        cache.add(key, _new_version(), CACHE_TIMEOUT)
+        return None
+
+
+def _generation() -> int:
+    """Current key generation; bumping it drops every cached bitmap."""
+    return cache.get(GENERATION_KEY, 0)
+
+
+def invalidate_all() -> None:
+    """Drop every cached bitmap, e.g. after a bulk change that sends no signals."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def _days(start: datetime, end: datetime) -> list[date]:
+    """Local days touched by [start, end)."""
+    first = timezone.localdate(start)
+    last = timezone.localdate(end - timedelta(microseconds=1))
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def _index(day: date, moment: datetime, *, round_up: bool) -> int:
+    """Quantum index of a moment on a local day, clipped to the day."""
+    local = timezone.localtime(moment)
+    if local.date() < day:
+        return 0
+    if local.date() > day:
+        return QUANTA_PER_DAY
+    seconds = (local.hour * 60 + local.minute) * 60 + local.second
+    index, remainder = divmod(seconds, QUANTUM_MINUTES * 60)
+    return index + (1 if round_up and (remainder or local.microsecond) else 0)
+
+
+def _moment(day: date, index: int) -> datetime:
+    """Aware start of a quantum on a local day."""
+    midnight = timezone.make_aware(datetime.combine(day, time.min))
+    return midnight + timedelta(minutes=index * QUANTUM_MINUTES)
+
+
+def _mask(day: date, start: datetime, end: datetime, *, inner: bool) -> int:
+    """
+    Bits for the quanta of a day covered by [start, end).
+
+    With ``inner`` only quanta entirely inside the interval are included
+    (used for free time); otherwise any quantum it touches is (busy time).
+    """
+    first = _index(day, start, round_up=inner)
+    last = _index(day, end, round_up=not inner)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _masks(day: date, intervals: Iterable[Interval], *, inner: bool) -> int:
+    """OR together the masks of several intervals."""
+    bits = 0
+    for start, end in intervals:
+        bits |= _mask(day, start, end, inner=inner)
+    return bits
+
+
+def _split_by_day(intervals: Iterable[Interval]) -> dict[date, list[Interval]]:
+    """Group intervals by every local day they touch."""
+    by_day: dict[date, list[Interval]] = defaultdict(list)
+    for start, end in intervals:
+        for day in _days(start, end):
+            by_day[day].append((start, end))
+    return by_day
+
+
+def build_bitmaps(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[tuple[int, date], DayBitmap]:
+    """
+    Build bitmaps from the database for staff members over a date range.
+
+    The number of queries does not depend on the number of staff members or
+    days: one for stored slots, four for computed availability.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of (staff id, day) to bitmap for every staff member and day
+    """
+    staff_ids = list(staff_ids)
+    free: dict[int, list[Interval]] = {}
+    blocked: dict[int, list[Interval]] = defaultdict(list)
+    starts: dict[int, list[tuple[datetime, datetime, int | None, int]]] = defaultdict(list)
+
+    if settings.BOOKING_AVAILABILITY_BACKEND == "computed":
+        step = timedelta(minutes=settings.BOOKING_SLOT_MINUTES)
+        working = working_intervals(staff_ids, start_date, end_date)
+        busy = busy_intervals(staff_ids, start_date, end_date)
+        for staff_id, start, end in (
+            TimeSlot.objects.filter(staff_id__in=staff_ids, is_blocked=True)
+            .in_window(start_date, end_date)
+            .order_by()
+            .values_list("staff_id", "start_time", "end_time")
+        ):
+            blocked[staff_id].append((start, end))
+        for staff_id in staff_ids:
+            free[staff_id] = subtract(working[staff_id], busy.get(staff_id, []))
+            # Every grid start in working time; whether the slot or service
+            # fits is decided from the free bits when reading
+            for work_start, work_end in working[staff_id]:
+                start = work_start
+                while start < work_end:
+                    starts[staff_id].append((start, start + step, None, 1))
+                    start += step
+    else:
+        # Each slot carries the latest end of its active bookings, so time a
+        # longer service overflows into the following slots comes from the
+        # same query
+        open_slots: dict[int, list[Interval]] = defaultdict(list)
+        overflow: dict[int, list[Interval]] = defaultdict(list)
+        for slot_id, staff_id, start, end, is_blocked, booked_count, capacity, booked_until in (
+            TimeSlot.objects.filter(staff_id__in=staff_ids)
+            .in_window(start_date, end_date)
+            .annotate(
+                booked_until=Max(
+                    "bookings__end_time",
+                    filter=Q(bookings__status__in=Booking.ACTIVE_STATUSES),
+                )
+            )
+            .order_by("start_time")
+            .values_list(
+                "id",
+                "staff_id",
+                "start_time",
+                "end_time",
+                "is_blocked",
+                "booked_count",
+                "capacity",
+                "booked_until",
+            )
+        ):
+            if booked_until is not None and booked_until > end:
+                overflow[staff_id].append((end, booked_until))
+            if is_blocked:
+                blocked[staff_id].append((start, end))
+                continue
+            starts[staff_id].append((start, end, slot_id, capacity))
+            if booked_count < capacity:
+                open_slots[staff_id].append((start, end))
+        for staff_id in staff_ids:
+            free[staff_id] = subtract(open_slots.get(staff_id, []), overflow.get(staff_id, []))
+
+    bitmaps: dict[tuple[int, date], DayBitmap] = {}
+    for staff_id in staff_ids:
+        free_by_day = _split_by_day(free[staff_id])
+        blocked_by_day = _split_by_day(blocked.get(staff_id, []))
+        starts_by_day: dict[date, list[SlotStart]] = defaultdict(list)
+        for start, end, slot_id, capacity in starts[staff_id]:
+            day = timezone.localdate(start)
+            first = _index(day, start, round_up=True)
+            if _moment(day, first) != start:
+                logger.warning(f"Skipping slot at {start}: not aligned to {QUANTUM_MINUTES} min")
+                continue
+            starts_by_day[day].append((first, _index(day, end, round_up=True), slot_id, capacity))
+
+        day = start_date
+        while day <= end_date:
+            bitmaps[(staff_id, day)] = DayBitmap(
+                free=_masks(day, free_by_day.get(day, []), inner=True),
+                blocked=_masks(day, blocked_by_day.get(day, []), inner=False),
+                starts=tuple(starts_by_day.get(day, [])),
+            )
+            day += timedelta(days=1)
+
+    return bitmaps
+
+
+def get_bitmaps(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[tuple[int, date], DayBitmap]:
+    """
+    Get bitmaps from the cache, building only the missing ones.
+
+    Costs two cache round trips on a full hit. Misses, and bitmaps stamped
+    with an old day version, are built together with :func:`build_bitmaps`
+    over the smallest range covering them and stamped with the version read
+    before the build. A change committing during the build bumps the
+    version, so the rebuilt bitmap is ignored rather than served stale.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of (staff id, day) to bitmap
+    """
+    staff_ids = list(staff_ids)
+    generation = _generation()
+    days = [
+        start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)
+    ]
+    pairs = [(staff_id, day) for staff_id in staff_ids for day in days]
+    keys = {pair: cache_key(*pair, generation) for pair in pairs}
+    version_keys = {pair: version_key(*pair, generation) for pair in pairs}
+
+    cached = cache.get_many([*keys.values(), *version_keys.values()])
+    versions = {pair: cached.get(version_keys[pair]) for pair in pairs}
+    bitmaps = {}
+    for pair in pairs:
+        value = cached.get(keys[pair])
+        # Bitmaps are stored as (free, blocked, starts, version)
+        if value is not None and versions[pair] is not None and value[-1] == versions[pair]:
+            bitmaps[pair] = DayBitmap(*value[:-1])
+
+    missing = [pair for pair in pairs if pair not in bitmaps]
+    if missing:
+        unversioned = [version_keys[pair] for pair in missing if versions[pair] is None]
+        if unversioned:
+            for key in unversioned:
+                cache.add(key, _new_version(), CACHE_TIMEOUT)
+            started = cache.get_many(unversioned)
+            for pair in missing:
+                if versions[pair] is None:
+                    versions[pair] = started.get(version_keys[pair])
+        built = build_bitmaps(
+            {staff_id for staff_id, _day in missing},
+            min(day for _staff_id, day in missing),
+            max(day for _staff_id, day in missing),
+        )
+        fresh = {pair: built[pair] for pair in missing}
+        cache.set_many(
+            {keys[pair]: (*bitmap, versions[pair]) for pair, bitmap in fresh.items()},
+            CACHE_TIMEOUT,
+        )
+        bitmaps.update(fresh)
+
+    return bitmaps
+
+
+def cached_available_slots(
+    staff: Staff | QuerySet[Staff] | None,
+    start_date: date,
+    end_date: date,
+    service: Service | None = None,
+) -> list[TimeSlot | VirtualSlot]:
+    """
+    Get bookable slots from the cached bitmaps.
+
+    Same result as ``available_slots`` but, on a cache hit, without touching
+    the database beyond loading the staff members. Stored slots come back as
+    unsaved TimeSlot instances carrying their real ids.
+
+    Args:
+        staff: Staff member, queryset of staff members, or None for no staff
+        start_date: First local day of the range (inclusive)
+        end_date: Last local day of the range (inclusive)
+        service: Service whose whole duration must fit from each start
+
+    Returns:
+        Available slots ordered by start time, then staff
+    """
+    if staff is None:
+        return []
+    staff_members = {member.pk: member for member in _as_list(staff)}
+    if not staff_members:
+        return []
+
+    bitmaps = get_bitmaps(staff_members, start_date, end_date)
+    now = timezone.now()
+    needed = length = None
+    if service is not None:
+        length = timedelta(minutes=service.duration)
+        needed = -(-service.duration // QUANTUM_MINUTES)
+
+    slots: list[TimeSlot | VirtualSlot] = []
+    for (staff_id, day), bitmap in bitmaps.items():
+        member = staff_members[staff_id]
+        for first, end, slot_id, capacity in bitmap.starts:
+            quanta = needed if needed is not None else end - first
+            mask = ((1 << quanta) - 1) << first
+            if bitmap.free & mask != mask:
+                continue
+            start_time = _moment(day, first)
+            if start_time < now:
+                continue
+            if slot_id is None:
+                slots.append(
+                    VirtualSlot(
+                        staff=member,
+                        start_time=start_time,
+                        end_time=_moment(day, end) if length is None else start_time + length,
+                    )
+                )
+            else:
+                slots.append(
+                    TimeSlot(
+                        id=slot_id,
+                        staff=member,
+                        start_time=start_time,
+                        end_time=_moment(day, end),
+                        capacity=capacity,
+                    )
+                )
+
+    slots.sort(key=lambda slot: (slot.start_time, slot.staff_id))
+    return slots
+
+
+def gaps_created(bitmap: DayBitmap, day: date, start: datetime, end: datetime) -> int:
+    """
+    Count the sides of [start, end) that would leave free time next to it.
+
+    A booking that starts or ends against a booking, a block or the end of
+    the working day leaves the schedule less fragmented.
+
+    Args:
+        bitmap: Bitmap of the staff member's day
+        day: Local day of the bitmap
+        start: Start of the candidate booking
+        end: End of the candidate booking
+
+    Returns:
+        0, 1 or 2
+    """
+    first = _index(day, start, round_up=False)
+    last = _index(day, end, round_up=True)
+    before = first > 0 and bool(bitmap.free >> (first - 1) & 1)
+    after = last < QUANTA_PER_DAY and bool(bitmap.free >> last & 1)
+    return before + after
+
+
+def _update(
+    staff_id: int,
+    start: datetime,
+    end: datetime,
+    change: Callable[[DayBitmap, date], DayBitmap],
+) -> None:
+    """
+    Apply a change to the cached bitmaps touched by [start, end).
+
+    Each day's version is bumped first, which makes every bitmap stamped
+    before it stale. The change is then applied only to a bitmap carrying
+    the previous version, and stored under the new one; a bitmap that is
+    missing, stale, or already rewritten by a concurrent update is left to
+    be rebuilt on the next read. So a lost update or a racing rebuild can
+    never leave a stale bitmap in use.
+    """
+    generation = _generation()
+    for day in _days(start, end):
+        previous = _bump(version_key(staff_id, day, generation))
+        if previous is None:
+            continue
+        key = cache_key(staff_id, day, generation)
+        value = cache.get(key)
+        if value is not None and value[-1] == previous:
+            bitmap = change(DayBitmap(*value[:-1]), day)
+            cache.set(key, (*bitmap, previous + 1), CACHE_TIMEOUT)
+
+
+def mark_busy(staff_id: int, start: datetime, end: datetime) -> None:
+    """Clear the free bits for [start, end) after a booking takes the time."""
+    _update(
+        staff_id,
+        start,
+        end,
+        lambda bitmap, day: bitmap._replace(
+            free=bitmap.free & ~_mask(day, start, end, inner=False)
+        ),
+    )
+
+
+def mark_free(staff_id: int, start: datetime, end: datetime) -> None:
+    """Set the free bits for [start, end) after a booking releases the time."""
+    _update(
+        staff_id,
+        start,
+        end,
+        lambda bitmap, day: bitmap._replace(
+            free=bitmap.free | (_mask(day, start, end, inner=True) & ~bitmap.blocked)
+        ),
+    )
+
+
+def mark_blocked(staff_id: int, start: datetime, end: datetime) -> None:
+    """Record an explicit block: the time becomes blocked and not free."""
+
+    def block(bitmap: DayBitmap, day: date) -> DayBitmap:
+        bits = _mask(day, start, end, inner=False)
+        return bitmap._replace(free=bitmap.free & ~bits, blocked=bitmap.blocked | bits)
+
+    _update(staff_id, start, end, block)
+
+
+def invalidate(staff_id: int, start: datetime, end: datetime) -> None:
+    """Drop the cached bitmaps touched by [start, end)."""
+    invalidate_spans([(staff_id, start, end)])
+
+
+def invalidate_spans(spans: Iterable[tuple[int, datetime, datetime]]) -> None:
+    """Drop the cached bitmaps touched by several (staff id, start, end) spans."""
+    generation = _generation()
+    _invalidate(
+        [(staff_id, day) for staff_id, start, end in spans for day in _days(start, end)],
+        generation,
+    )
+
+
+def invalidate_range(staff_ids: Iterable[int], start_date: date, end_date: date) -> None:
+    """Drop the cached bitmaps for staff members over a date range."""
+    generation = _generation()
+    days = [
+        start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)
+    ]
+    _invalidate([(staff_id, day) for staff_id in staff_ids for day in days], generation)
+
+
+def _invalidate(pairs: list[tuple[int, date]], generation: int) -> None:
+    """
+    Bump the versions of (staff id, day) pairs and drop their bitmaps.
+
+    Bumping rather than only deleting also discards a rebuild already in
+    flight that read the database before the change.
+    """
+    for pair in pairs:
+        _bump(version_key(*pair, generation))
+    cache.delete_many([cache_key(*pair, generation) for pair in pairs])
@@ -0,0 +1,13 @@
+"""Exceptions for booking app."""
+
+from __future__ import annotations
+
+from django.core.exceptions import ValidationError
+
+
+class SlotUnavailableError(ValidationError):
+    """Raised when a time slot has no capacity left to reserve."""
+
+    def __init__(self, message: str = "This time slot is no longer available") -> None:
+        """Initialize with a user-facing message."""
+        super().__init__(message, code="slot_unavailable")
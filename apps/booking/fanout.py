@@ -0,0 +1,122 @@
+"""Concurrent delivery of rendered booking notifications."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+
+from django.conf import settings
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from apps.core.adapters import DeliveryResult, get_email_adapter, get_sms_adapter
+
+from .notifications import RenderedNotification, render_notification
+
+
+async def adeliver_notification(notification: RenderedNotification) -> dict[str, DeliveryResult]:
+    """
+    Send a notification's email and SMS at the same time.
+
+    Args:
+        notification: Rendered notification
+
+    Returns:
+        DeliveryResult per channel (``"email"`` and, with a phone, ``"sms"``)
+    """
+    sends = {"email": get_email_adapter().adeliver_many([notification.email])}
+    if notification.sms is not None:
+        to, message = notification.sms
+        sends["sms"] = get_sms_adapter().adeliver_sms(to=to, message=message)
+
+    email_results, *sms_results = await asyncio.gather(*sends.values())
+    return dict(zip(sends, [email_results[0], *sms_results]))
+
+
+async def asend_notification(notification: RenderedNotification) -> bool:
+    """
+    Send a notification's email and SMS at the same time.
+
+    Returns:
+        True if either the email or the SMS was sent
+    """
+    return any((await adeliver_notification(notification)).values())
+
+
+async def adeliver_notifications(
+    notifications: Iterable[RenderedNotification], concurrency: int | None = None
+) -> list[dict[str, DeliveryResult]]:
+    """
+    Send a batch of notifications concurrently.
+
+    The batch's emails go to the email adapter in one ``adeliver_many``
+    call, so they share one connection, while the text messages are sent
+    alongside them, at most ``concurrency`` (default:
+    ``NOTIFICATION_CONCURRENCY``) at once.
+
+    Args:
+        notifications: Rendered notifications
+        concurrency: Text messages sent at once
+
+    Returns:
+        DeliveryResult per channel of each notification, in order
+    """
+    notifications = list(notifications)
+    semaphore = asyncio.Semaphore(concurrency or settings.NOTIFICATION_CONCURRENCY)
+    sms_adapter = get_sms_adapter()
+
+    async def deliver_sms(to: str, message: str) -> DeliveryResult:
+        async with semaphore:
+            return await sms_adapter.adeliver_sms(to=to, message=message)
+
+    texted = [index for index, notification in enumerate(notifications) if notification.sms]
+    email_results, *sms_results = await asyncio.gather(
+        get_email_adapter().adeliver_many([notification.email for notification in notifications]),
+        *(deliver_sms(*notifications[index].sms) for index in texted),
+    )
+    results = [{"email": result} for result in email_results]
+    for index, result in zip(texted, sms_results):
+        results[index]["sms"] = result
+    return results
+
+
+async def asend_notifications(
+    notifications: Iterable[RenderedNotification], concurrency: int | None = None
+) -> list[bool]:
+    """Like ``adeliver_notifications``, reporting whether each notification was sent."""
+    results = await adeliver_notifications(notifications, concurrency)
+    return [any(channels.values()) for channels in results]
+
+
+def deliver_notifications(
+    notifications: Iterable[RenderedNotification], concurrency: int | None = None
+) -> list[dict[str, DeliveryResult]]:
+    """
+    Blocking entry point to ``adeliver_notifications`` for Celery tasks and commands.
+
+    Must not be called from a thread running an event loop; async code
+    awaits ``adeliver_notifications`` instead.
+    """
+    return async_to_sync(adeliver_notifications)(list(notifications), concurrency)
+
+
+def send_notifications(
+    notifications: Iterable[RenderedNotification], concurrency: int | None = None
+) -> list[bool]:
+    """Blocking entry point to ``asend_notifications``."""
+    return async_to_sync(asend_notifications)(list(notifications), concurrency)
+
+
+async def anotify(booking, kind: str) -> bool:
+    """
+    Render and send one booking notification from async code, e.g. an ASGI view.
+
+    Args:
+        booking: Booking the notification is about
+        kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+
+    Returns:
+        True if either the email or the SMS was sent
+    """
+    notification = await sync_to_async(render_notification)(booking, kind)
+    return await asend_notification(notification)
@@ -0,0 +1,175 @@
+"""Half-open datetime interval arithmetic for computed availability."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Tuple
+
+# A half-open interval [start, end)
+Interval = Tuple[datetime, datetime]
+
+
+def normalize(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Sort intervals and merge the ones that overlap or touch.
+
+    Args:
+        intervals: Intervals in any order; empty intervals are dropped
+
+    Returns:
+        Sorted, disjoint intervals
+    """
+    merged: list[Interval] = []
+    for start, end in sorted(interval for interval in intervals if interval[0] < interval[1]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(base: Iterable[Interval], busy: Iterable[Interval]) -> list[Interval]:
+    """
+    Remove busy time from base intervals.
+
+    Both inputs are normalized, then swept once in start order, so the cost is
+    O((n + m) log(n + m)) for the sort and linear after that.
+
+    Args:
+        base: Intervals of available time
+        busy: Intervals to remove
+
+    Returns:
+        Sorted, disjoint intervals of base time not covered by busy time
+    """
+    busy = normalize(busy)
+    free: list[Interval] = []
+    index = 0
+
+    for start, end in normalize(base):
+        # Skip busy intervals that end before this base interval starts
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+
+        cursor = start
+        probe = index
+        while probe < len(busy) and busy[probe][0] < end:
+            busy_start, busy_end = busy[probe]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            probe += 1
+
+        if cursor < end:
+            free.append((cursor, end))
+
+    return free
+
+
+def intersect(first: Iterable[Interval], second: Iterable[Interval]) -> list[Interval]:
+    """
+    Return the time covered by both interval sets.
+
+    Args:
+        first: Intervals
+        second: Intervals
+
+    Returns:
+        Sorted, disjoint intervals
+    """
+    first, second = normalize(first), normalize(second)
+    overlap: list[Interval] = []
+    i = j = 0
+
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            overlap.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+
+    return overlap
+
+
+def covers(intervals: Iterable[Interval], start: datetime, end: datetime) -> bool:
+    """
+    Check whether [start, end) lies entirely inside one of the intervals.
+
+    Args:
+        intervals: Sorted, disjoint intervals
+        start: Start of the candidate
+        end: End of the candidate
+
+    Returns:
+        True if the candidate is fully covered
+    """
+    return any(free_start <= start and end <= free_end for free_start, free_end in intervals)
+
+
+def fitting_starts(
+    starts: Iterable[datetime], free: Iterable[Interval], length: timedelta
+) -> list[datetime]:
+    """
+    Keep the start times whose whole [start, start + length) is free.
+
+    Candidates and free intervals are both in start order, so one forward
+    sweep checks them all without a lookup per candidate.
+
+    Args:
+        starts: Candidate start times in ascending order
+        free: Sorted, disjoint free intervals
+        length: Required free length from each start
+
+    Returns:
+        The candidates that fit, in order
+    """
+    free = list(free)
+    fitting: list[datetime] = []
+    index = 0
+
+    for start in starts:
+        # Advance to the first free interval that ends after the candidate
+        while index < len(free) and free[index][1] <= start:
+            index += 1
+        if index == len(free):
+            break
+        free_start, free_end = free[index]
+        if free_start <= start and start + length <= free_end:
+            fitting.append(start)
+
+    return fitting
+
+
+def grid_starts(
+    working: Iterable[Interval],
+    free: Iterable[Interval],
+    step: timedelta,
+    length: timedelta,
+) -> list[datetime]:
+    """
+    Find grid start times whose whole [start, start + length) is free.
+
+    Candidates are laid out every ``step`` from the start of each working
+    interval and must end within it.
+
+    Args:
+        working: Sorted, disjoint working intervals that anchor the grid
+        free: Sorted, disjoint free intervals (a subset of working time)
+        step: Distance between candidate starts
+        length: Required free length from each start
+
+    Returns:
+        Sorted start times
+    """
+    candidates: list[datetime] = []
+    for work_start, work_end in working:
+        candidate = work_start
+        while candidate + length <= work_end:
+            candidates.append(candidate)
+            candidate += step
+    return fitting_starts(candidates, free, length)
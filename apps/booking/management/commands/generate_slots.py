@@ -0,0 +1,60 @@
+"""Management command to roll the time slot horizon forward."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.booking.slot_generator import generate_slots
+
+
+class Command(BaseCommand):
+    """Generate time slots from opening hours for all active staff."""
+
+    help = "Create time slots from opening hours up to the booking horizon"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.BOOKING_HORIZON_DAYS,
+            help="Number of days to cover, starting at --start",
+        )
+        parser.add_argument(
+            "--slot-minutes",
+            type=int,
+            default=settings.BOOKING_SLOT_MINUTES,
+            help="Slot length in minutes",
+        )
+        parser.add_argument(
+            "--start",
+            help="First day to cover as YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per INSERT statement",
+        )
+
+    def handle(self, *args, **options):
+        """Execute command."""
+        start_date = None
+        if options["start"]:
+            start_date = parse_date(options["start"])
+            if start_date is None:
+                raise CommandError("--start must be a date in YYYY-MM-DD format")
+
+        try:
+            created = generate_slots(
+                start_date=start_date,
+                days=options["days"],
+                slot_minutes=options["slot_minutes"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} time slots"))
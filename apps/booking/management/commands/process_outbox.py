@@ -0,0 +1,64 @@
+"""Management command to send queued booking notifications."""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.booking.notifications import format_render_timings
+from apps.booking.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    """Drain the notification outbox without Celery."""
+
+    help = "Send pending booking notifications from the outbox"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Notifications per batch (default: NOTIFICATION_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: until the outbox is empty)",
+        )
+        parser.add_argument(
+            "--loop",
+            type=float,
+            default=None,
+            metavar="SECONDS",
+            help="Keep draining, sleeping this long whenever the outbox is empty",
+        )
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print email template render timings after each run",
+        )
+
+    def handle(self, *args, **options):
+        """Execute command."""
+        while True:
+            sent = process_outbox(
+                batch_size=options["batch_size"], max_batches=options["max_batches"]
+            )
+            if options["loop"] is None:
+                self.stdout.write(self.style.SUCCESS(f"Sent {sent} notification(s)"))
+                self._write_timings(options)
+                return
+            if sent:
+                self.stdout.write(f"Sent {sent} notification(s)")
+                self._write_timings(options)
+            time.sleep(options["loop"])
+
+    def _write_timings(self, options) -> None:
+        """Print template render timings if asked to."""
+        if options["timings"]:
+            for line in format_render_timings():
+                self.stdout.write(f"  {line}")
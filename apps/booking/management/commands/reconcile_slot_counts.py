@@ -0,0 +1,42 @@
+"""Management command to rebuild time slot booking counters."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from apps.booking.bitmaps import invalidate_all
+from apps.booking.models import TimeSlot
+
+
+class Command(BaseCommand):
+    """Rebuild TimeSlot.booked_count from Booking rows."""
+
+    help = "Recompute TimeSlot.booked_count from pending and confirmed bookings"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted slots without updating them",
+        )
+
+    def handle(self, *args, **options):
+        """Execute command."""
+        drifted = TimeSlot.objects.with_actual_count().exclude(booked_count=F("actual_count"))
+        drift_count = drifted.count()
+
+        if options["dry_run"]:
+            for slot in drifted.select_related("staff")[:50]:
+                self.stdout.write(
+                    f"  {slot}: booked_count={slot.booked_count} actual={slot.actual_count}"
+                )
+            self.stdout.write(f"{drift_count} slot(s) out of sync")
+            return
+
+        updated = TimeSlot.objects.recount()
+        invalidate_all()
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted {updated} time slot(s); {drift_count} were out of sync")
+        )
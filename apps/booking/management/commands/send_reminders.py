@@ -0,0 +1,45 @@
+"""Management command to send appointment reminders."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.booking.notifications import format_render_timings
+from apps.booking.reminders import due_reminders, send_due_reminders
+
+
+class Command(BaseCommand):
+    """Send reminders for upcoming bookings without Celery."""
+
+    help = "Send reminders for active bookings starting within REMINDER_LEAD_HOURS"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Bookings claimed and sent together (default: REMINDER_CHUNK_SIZE)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many reminders are due without sending them",
+        )
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print email template render timings after the run",
+        )
+
+    def handle(self, *args, **options):
+        """Execute command."""
+        if options["dry_run"]:
+            self.stdout.write(f"{due_reminders().count()} reminder(s) due")
+            return
+
+        sent = send_due_reminders(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} reminder(s)"))
+        if options["timings"]:
+            for line in format_render_timings():
+                self.stdout.write(f"  {line}")
@@ -0,0 +1,310 @@
+"""Custom managers and querysets for booking models."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, tzinfo
+
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    DateTimeField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+
+def day_bounds(
+    start: date | None, end: date | None, tz: tzinfo | None = None
+) -> tuple[datetime | None, datetime | None]:
+    """
+    Convert local calendar days into half-open aware datetime bounds.
+
+    Args:
+        start: First local day (inclusive), or None for no lower bound
+        end: Last local day (inclusive), or None for no upper bound
+        tz: Timezone the days are in (default: current timezone)
+
+    Returns:
+        Tuple of (lower, upper) where lower is midnight starting ``start`` and
+        upper is midnight following ``end``
+    """
+    tz = tz or timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    upper = (
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+        if end
+        else None
+    )
+    return lower, upper
+
+
+class TimeSlotQuerySet(models.QuerySet):
+    """QuerySet for TimeSlot model."""
+
+    def available(self) -> TimeSlotQuerySet:
+        """Return slots that are not blocked and have free capacity."""
+        return self.filter(is_blocked=False, booked_count__lt=F("capacity"))
+
+    def in_window(
+        self, start: date | None, end: date | None, tz: tzinfo | None = None
+    ) -> TimeSlotQuerySet:
+        """
+        Return slots starting on local days ``start`` through ``end``.
+
+        Filters on ``start_time >= lower AND start_time < upper`` rather than
+        casting the column to a date, so the ``start_time`` indexes stay
+        usable and the day boundaries follow ``tz`` on every backend.
+
+        Args:
+            start: First local day (inclusive), or None for no lower bound
+            end: Last local day (inclusive), or None for no upper bound
+            tz: Timezone the days are in (default: current timezone)
+
+        Returns:
+            Filtered queryset
+        """
+        lower, upper = day_bounds(start, end, tz)
+        queryset = self
+        if lower is not None:
+            queryset = queryset.filter(start_time__gte=lower)
+        if upper is not None:
+            queryset = queryset.filter(start_time__lt=upper)
+        return queryset
+
+    def fitting(self, duration: timedelta) -> TimeSlotQuerySet:
+        """
+        Return slots from which ``duration`` of contiguous free time follows.
+
+        A start fits when, up to ``start_time + duration``, the stylist has no
+        blocked or full slot, no gap between consecutive slots, and no booking
+        running past its own slot. All three are correlated ``EXISTS``
+        subqueries on the ``(staff, start_time)`` index, so the check adds no
+        queries and no rows to the result.
+
+        Args:
+            duration: Length of free time needed from each start
+
+        Returns:
+            Filtered queryset
+        """
+        booking_model = self.model._meta.get_field("bookings").related_model
+        closed = self.model.objects.filter(
+            Q(is_blocked=True) | Q(booked_count__gte=F("capacity")),
+            staff=OuterRef("staff"),
+            start_time__lt=OuterRef("fit_until"),
+            end_time__gt=OuterRef("start_time"),
+        )
+        # A slot ending inside the window with no slot starting at its end
+        gap = self.model.objects.filter(
+            staff=OuterRef("staff"),
+            end_time__gt=OuterRef("start_time"),
+            end_time__lt=OuterRef("fit_until"),
+        ).exclude(
+            Exists(
+                self.model.objects.filter(staff=OuterRef("staff"), start_time=OuterRef("end_time"))
+            )
+        )
+        overflow = booking_model.objects.filter(
+            Q(time_slot__isnull=True, start_time__lt=OuterRef("fit_until"))
+            | Q(
+                time_slot__end_time__lt=OuterRef("fit_until"),
+                end_time__gt=F("time_slot__end_time"),
+            ),
+            staff=OuterRef("staff"),
+            status__in=booking_model.ACTIVE_STATUSES,
+            end_time__gt=OuterRef("start_time"),
+        )
+        return (
+            self.alias(
+                fit_until=ExpressionWrapper(
+                    F("start_time") + duration, output_field=DateTimeField()
+                )
+            )
+            .exclude(Exists(closed))
+            .exclude(Exists(gap))
+            .exclude(Exists(overflow))
+        )
+
+    def with_actual_count(self) -> TimeSlotQuerySet:
+        """Annotate ``actual_count`` with the number of active bookings per slot."""
+        return self.annotate(actual_count=Coalesce(Subquery(self._active_count()), 0))
+
+    def recount(self) -> int:
+        """
+        Rebuild ``booked_count`` from Booking rows in a single UPDATE.
+
+        Returns:
+            Number of slots updated
+        """
+        return self.update(booked_count=Coalesce(Subquery(self._active_count()), 0))
+
+    def _active_count(self):
+        """Correlated subquery counting active bookings for the outer slot."""
+        booking_model = self.model._meta.get_field("bookings").related_model
+        return (
+            booking_model.objects.filter(
+                time_slot=OuterRef("pk"),
+                status__in=booking_model.ACTIVE_STATUSES,
+            )
+            .order_by()
+            .values("time_slot")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+
+
+class TimeSlotManager(models.Manager.from_queryset(TimeSlotQuerySet)):  # type: ignore[misc]
+    """Manager for TimeSlot model."""
+
+    def claim(self, slot_id: int) -> bool:
+        """
+        Take one unit of capacity on a slot.
+
+        The capacity check and the increment happen in one conditional UPDATE,
+        so concurrent claims can never push ``booked_count`` past ``capacity``.
+
+        Args:
+            slot_id: Primary key of the slot
+
+        Returns:
+            True if capacity was claimed, False if the slot is full
+        """
+        updated = self.filter(pk=slot_id, booked_count__lt=F("capacity")).update(
+            booked_count=F("booked_count") + 1
+        )
+        return updated == 1
+
+    def release(self, slot_id: int, count: int = 1) -> bool:
+        """
+        Give back capacity on a slot.
+
+        Args:
+            slot_id: Primary key of the slot
+            count: Number of bookings released
+
+        Returns:
+            True if the counter was decremented
+        """
+        updated = self.filter(pk=slot_id, booked_count__gt=0).update(
+            booked_count=Greatest(F("booked_count") - count, 0)
+        )
+        return updated == 1
+
+
+class NotificationOutboxManager(models.Manager):
+    """Manager for NotificationOutbox model."""
+
+    def enqueue(self, booking, kind: str):
+        """
+        Queue a notification in the current transaction.
+
+        The row commits or rolls back with the booking change; once it
+        commits, it is handed to the configured dispatcher.
+
+        Args:
+            booking: Booking the notification is about
+            kind: Notification kind (e.g. ``"confirmation"``)
+
+        Returns:
+            The created outbox row
+        """
+        from .outbox import dispatch
+
+        entry = self.create(booking=booking, kind=kind)
+        transaction.on_commit(lambda: dispatch([entry.pk]))
+        return entry
+
+    def enqueue_many(self, bookings, kind: str) -> list:
+        """
+        Queue the same notification for several bookings with one INSERT.
+
+        Args:
+            bookings: Bookings the notifications are about
+            kind: Notification kind (e.g. ``"cancellation"``)
+
+        Returns:
+            The created outbox rows
+        """
+        from .outbox import dispatch
+
+        entries = self.bulk_create(self.model(booking=booking, kind=kind) for booking in bookings)
+        entry_ids = [entry.pk for entry in entries]
+        if entry_ids:
+            transaction.on_commit(lambda: dispatch(entry_ids))
+        return entries
+
+    def due(self) -> models.QuerySet:
+        """Return pending rows whose next attempt is due."""
+        return self.filter(status="pending", available_at__lte=timezone.now())
+
+    def claim(self, batch_size: int, lease: timedelta, ids: list[int] | None = None) -> list[int]:
+        """
+        Lease a batch of due rows to the caller.
+
+        The rows are locked with ``SKIP LOCKED`` where the database supports
+        it, so concurrent workers take disjoint batches, and their next
+        attempt is pushed back by ``lease``. A worker that dies mid-batch
+        therefore only delays those rows until the lease runs out. The
+        transaction ends before anything is sent.
+
+        Args:
+            batch_size: Maximum number of rows to claim
+            lease: How long the rows are reserved for this worker
+            ids: Only consider these rows (default: any due row)
+
+        Returns:
+            Primary keys of the claimed rows
+        """
+        with transaction.atomic():
+            queryset = self.due().select_for_update(skip_locked=True)
+            if ids is not None:
+                queryset = queryset.filter(pk__in=ids)
+            claimed = list(
+                queryset.order_by("available_at").values_list("id", flat=True)[:batch_size]
+            )
+            if claimed:
+                self.filter(pk__in=claimed).update(
+                    available_at=timezone.now() + lease, attempts=F("attempts") + 1
+                )
+        return claimed
+
+
+class NotificationDeadLetterQuerySet(models.QuerySet):
+    """QuerySet for NotificationDeadLetter model."""
+
+    def requeue(self) -> int:
+        """
+        Put dead-lettered notifications back in the outbox for a fresh round of attempts.
+
+        The outbox rows go back to pending with their attempt count reset,
+        the dead letters are removed, and the rows are dispatched once the
+        transaction commits. Earlier attempts stay on record.
+
+        Returns:
+            Number of notifications requeued
+        """
+        from .outbox import dispatch
+
+        outbox = self.model._meta.get_field("notification").related_model
+        with transaction.atomic():
+            entry_ids = list(self.values_list("notification_id", flat=True))
+            if not entry_ids:
+                return 0
+            outbox.objects.filter(pk__in=entry_ids).update(
+                status="pending", attempts=0, available_at=timezone.now(), last_error=""
+            )
+            self.model.objects.filter(notification_id__in=entry_ids).delete()
+            transaction.on_commit(lambda: dispatch(entry_ids))
+        return len(entry_ids)
+
+
+class NotificationDeadLetterManager(
+    models.Manager.from_queryset(NotificationDeadLetterQuerySet)  # type: ignore[misc]
+):
+    """Manager for NotificationDeadLetter model."""
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:09
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_booked_count(apps, schema_editor):
+    TimeSlot = apps.get_model("booking", "TimeSlot")
+    Booking = apps.get_model("booking", "Booking")
+    active = (
+        Booking.objects.filter(time_slot=OuterRef("pk"), status__in=["pending", "confirmed"])
+        .order_by()
+        .values("time_slot")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    TimeSlot.objects.update(booked_count=Coalesce(Subquery(active), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0002_booking_guest_email_booking_guest_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timeslot",
+            name="booked_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of pending or confirmed bookings holding this slot",
+            ),
+        ),
+        migrations.RunPython(backfill_booked_count, migrations.RunPython.noop),
+    ]
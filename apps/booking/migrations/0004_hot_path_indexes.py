@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+from apps.core.db import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("booking", "0003_timeslot_booked_count"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["staff", "status", "start_time", "end_time"],
+                name="booking_staff_status_time_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["customer", "-created_at"], name="booking_customer_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["reminder_sent", "status", "start_time"],
+                name="booking_reminder_due_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="timeslot",
+            index=models.Index(
+                condition=models.Q(("is_blocked", False)),
+                fields=["staff", "start_time"],
+                name="timeslot_open_staff_start_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="timeslot",
+            index=models.Index(
+                condition=models.Q(("is_blocked", False)),
+                fields=["start_time"],
+                name="timeslot_open_start_idx",
+            ),
+        ),
+    ]
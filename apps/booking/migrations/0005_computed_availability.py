@@ -0,0 +1,68 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0004_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="booking",
+            name="time_slot",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Time slot for appointment (empty with computed availability)",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="bookings",
+                to="booking.timeslot",
+            ),
+        ),
+        migrations.CreateModel(
+            name="StaffWorkingHour",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "weekday",
+                    models.IntegerField(
+                        choices=[
+                            (0, "Monday"),
+                            (1, "Tuesday"),
+                            (2, "Wednesday"),
+                            (3, "Thursday"),
+                            (4, "Friday"),
+                            (5, "Saturday"),
+                            (6, "Sunday"),
+                        ],
+                        help_text="Day of week",
+                    ),
+                ),
+                ("start_time", models.TimeField(help_text="Start of shift")),
+                ("end_time", models.TimeField(help_text="End of shift")),
+                (
+                    "staff",
+                    models.ForeignKey(
+                        help_text="Staff member",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="working_hours",
+                        to="booking.staff",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Staff Working Hour",
+                "verbose_name_plural": "Staff Working Hours",
+                "ordering": ["staff", "weekday", "start_time"],
+            },
+        ),
+    ]
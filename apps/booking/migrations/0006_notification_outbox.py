@@ -0,0 +1,81 @@
+# Generated by Django 4.2.11 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0005_computed_availability"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("confirmation", "Confirmation"),
+                            ("cancellation", "Cancellation"),
+                            ("reminder", "Reminder"),
+                        ],
+                        help_text="Which notification to send",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("sent", "Sent"), ("failed", "Failed")],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Number of delivery attempts so far"
+                    ),
+                ),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time of the next delivery attempt",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, help_text="Error from the last failed attempt"),
+                ),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        help_text="Booking the notification is about",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="booking.booking",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification",
+                "verbose_name_plural": "Notification Outbox",
+                "ordering": ["available_at"],
+                "indexes": [models.Index(fields=["status", "available_at"], name="outbox_due_idx")],
+            },
+        ),
+    ]
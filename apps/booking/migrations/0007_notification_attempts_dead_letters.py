@@ -0,0 +1,101 @@
+# Generated by Django 4.2.11 on 2026-10-17 03:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0006_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationDeadLetter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(help_text="Delivery attempts made")),
+                ("error_class", models.CharField(blank=True, max_length=100)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "permanent",
+                    models.BooleanField(
+                        default=False, help_text="Whether the last failure ruled out retrying"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "notification",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dead_letter",
+                        to="booking.notificationoutbox",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dead Letter",
+                "verbose_name_plural": "Notification Dead Letters",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="NotificationAttempt",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "attempt",
+                    models.PositiveSmallIntegerField(
+                        help_text="Attempt number of the notification"
+                    ),
+                ),
+                (
+                    "channel",
+                    models.CharField(choices=[("email", "Email"), ("sms", "SMS")], max_length=10),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("sent", "Sent"),
+                            ("transient", "Failed, will retry"),
+                            ("permanent", "Failed permanently"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "error_class",
+                    models.CharField(
+                        blank=True, help_text="Exception class of a failed attempt", max_length=100
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "notification",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="delivery_attempts",
+                        to="booking.notificationoutbox",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Attempt",
+                "verbose_name_plural": "Notification Attempts",
+                "ordering": ["notification", "attempt", "channel"],
+            },
+        ),
+    ]
@@ -12,6 +12,13 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 
+from .exceptions import SlotUnavailableError
+from .managers import (
+    NotificationDeadLetterManager,
+    NotificationOutboxManager,
+    TimeSlotManager,
+)
+
 
 class Service(models.Model):
     """
@@ -233,6 +240,50 @@ class OpeningHour(models.Model):
         return f"{day_name}: {self.start_time} - {self.end_time}"
 
 
+class StaffWorkingHour(models.Model):
+    """
+    Weekly working pattern for a staff member.
+
+    Used by computed availability. A staff member with no rows works whenever
+    the salon is open; otherwise they work only the listed hours (within the
+    opening hours). Several rows on one weekday describe a split shift.
+    """
+
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name="working_hours",
+        help_text="Staff member",
+    )
+
+    weekday = models.IntegerField(
+        choices=OpeningHour.WEEKDAY_CHOICES,
+        help_text="Day of week",
+    )
+
+    start_time = models.TimeField(
+        help_text="Start of shift",
+    )
+
+    end_time = models.TimeField(
+        help_text="End of shift",
+    )
+
+    class Meta:
+        verbose_name = "Staff Working Hour"
+        verbose_name_plural = "Staff Working Hours"
+        ordering = ["staff", "weekday", "start_time"]
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"{self.staff}: {self.get_weekday_display()} {self.start_time} - {self.end_time}"
+
+    def clean(self) -> None:
+        """Validate shift times."""
+        if self.start_time >= self.end_time:
+            raise ValidationError("Shift must end after it starts")
+
+
 class TimeSlot(models.Model):
     """
     Available time slot for booking.
@@ -265,13 +316,35 @@ class TimeSlot(models.Model):
         help_text="Whether this slot is blocked (not available)",
     )
 
+    booked_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of pending or confirmed bookings holding this slot",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TimeSlotManager()
+
     class Meta:
         verbose_name = "Time Slot"
         verbose_name_plural = "Time Slots"
         ordering = ["start_time"]
         unique_together = ["staff", "start_time"]
+        indexes = [
+            # Slot listings for one or more stylists
+            models.Index(
+                fields=["staff", "start_time"],
+                condition=models.Q(is_blocked=False),
+                name="timeslot_open_staff_start_idx",
+            ),
+            # Slot listings across all stylists
+            models.Index(
+                fields=["start_time"],
+                condition=models.Q(is_blocked=False),
+                name="timeslot_open_start_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         """String representation."""
@@ -296,11 +369,7 @@ class TimeSlot(models.Model):
             return False
 
         # Check capacity
-        confirmed_bookings = self.bookings.filter(
-            status__in=["pending", "confirmed"]
-        ).count()
-
-        return confirmed_bookings < self.capacity
+        return self.booked_count < self.capacity
 
 
 class Booking(models.Model):
@@ -318,6 +387,9 @@ class Booking(models.Model):
         ("no_show", "No Show"),
     ]
 
+    # Statuses that hold capacity on a time slot
+    ACTIVE_STATUSES = ("pending", "confirmed")
+
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -363,7 +435,9 @@ class Booking(models.Model):
         TimeSlot,
         on_delete=models.PROTECT,
         related_name="bookings",
-        help_text="Time slot for appointment",
+        null=True,
+        blank=True,
+        help_text="Time slot for appointment (empty with computed availability)",
     )
 
     start_time = models.DateTimeField(
@@ -418,6 +492,23 @@ class Booking(models.Model):
         verbose_name = "Booking"
         verbose_name_plural = "Bookings"
         ordering = ["-created_at"]
+        indexes = [
+            # Overlap check in clean() and busy intervals per stylist
+            models.Index(
+                fields=["staff", "status", "start_time", "end_time"],
+                name="booking_staff_status_time_idx",
+            ),
+            # Customer booking history, newest first
+            models.Index(
+                fields=["customer", "-created_at"],
+                name="booking_customer_created_idx",
+            ),
+            # Due reminders
+            models.Index(
+                fields=["reminder_sent", "status", "start_time"],
+                name="booking_reminder_due_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         """String representation."""
@@ -427,6 +518,17 @@ class Booking(models.Model):
             f"{self.start_time.strftime('%Y-%m-%d %H:%M')}"
         )
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored status, slot and span so derived state can be kept in sync."""
+        instance = super().from_db(db, field_names, values)
+        if "status" in instance.__dict__ and "time_slot_id" in instance.__dict__:
+            instance._loaded_status = instance.status
+            instance._loaded_time_slot_id = instance.time_slot_id
+        if {"staff_id", "start_time", "end_time"} <= instance.__dict__.keys():
+            instance._loaded_span = (instance.staff_id, instance.start_time, instance.end_time)
+        return instance
+
     def get_customer_email(self) -> str:
         """Get customer email (from user or guest field)."""
         if self.customer:
@@ -452,7 +554,40 @@ class Booking(models.Model):
         if not self.price:
             self.price = self.service.price
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            self._sync_slot_counter()
+            super().save(*args, **kwargs)
+
+        self._loaded_status = self.status
+        self._loaded_time_slot_id = self.time_slot_id
+        self._loaded_span = (self.staff_id, self.start_time, self.end_time)
+
+    def _sync_slot_counter(self) -> None:
+        """
+        Update booked_count for a status change or a move to another slot.
+
+        Raises:
+            SlotUnavailableError: If the booking would exceed the slot's capacity
+        """
+        if self._state.adding:
+            was_active = False
+            old_slot_id = None
+        elif hasattr(self, "_loaded_status"):
+            was_active = self._loaded_status in self.ACTIVE_STATUSES
+            old_slot_id = self._loaded_time_slot_id
+        else:
+            # Stored state unknown (e.g. deferred); leave counters untouched
+            return
+
+        is_active = self.status in self.ACTIVE_STATUSES
+        moved = was_active and is_active and old_slot_id != self.time_slot_id
+
+        if is_active and (moved or not was_active) and self.time_slot_id is not None:
+            if not TimeSlot.objects.claim(self.time_slot_id):
+                raise SlotUnavailableError()
+
+        if was_active and (moved or not is_active) and old_slot_id is not None:
+            TimeSlot.objects.release(old_slot_id)
 
     def clean(self) -> None:
         """Validate booking."""
@@ -469,7 +604,7 @@ class Booking(models.Model):
         # Check for overlapping bookings
         overlapping = Booking.objects.filter(
             staff=self.staff,
-            status__in=["pending", "confirmed"],
+            status__in=self.ACTIVE_STATUSES,
             start_time__lt=self.end_time,
             end_time__gt=self.start_time,
         ).exclude(id=self.id)
@@ -477,22 +612,71 @@ class Booking(models.Model):
         if overlapping.exists():
             raise ValidationError("This time slot is not available")
 
-    def confirm(self) -> None:
-        """Confirm the booking."""
-        self.status = "confirmed"
-        self.confirmed_at = timezone.now()
-        self.save()
+    def confirm(self, notify: bool = True) -> None:
+        """Confirm the booking and queue the confirmation email/SMS."""
+        with transaction.atomic():
+            self.status = "confirmed"
+            self.confirmed_at = timezone.now()
+            self.save()
+
+            if notify:
+                # Sent by an outbox worker once the confirmation commits
+                NotificationOutbox.objects.enqueue(self, "confirmation")
 
-        # Send confirmation email/SMS
-        self.send_confirmation_notification()
+    def cancel(self, notify: bool = True) -> None:
+        """Cancel the booking and queue the cancellation notification."""
+        with transaction.atomic():
+            self.status = "canceled"
+            self.save()
+
+            if notify:
+                # Sent by an outbox worker once the cancellation commits
+                NotificationOutbox.objects.enqueue(self, "cancellation")
+
+    def get_notification_email(self, kind: str):
+        """
+        Build the email for a notification kind.
 
-    def cancel(self) -> None:
-        """Cancel the booking."""
-        self.status = "canceled"
-        self.save()
+        Args:
+            kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
 
-        # Send cancellation notification
-        self.send_cancellation_notification()
+        Returns:
+            TemplatedEmail to the customer or guest, already rendered
+        """
+        from .notifications import booking_context, render_email
+
+        return render_email(kind, booking_context(self))
+
+    def get_notification_sms(self, kind: str) -> tuple[str, str] | None:
+        """
+        Build the SMS for a notification kind.
+
+        Args:
+            kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+
+        Returns:
+            Tuple of (phone number, message), or None if there is no phone
+            to text
+        """
+        from .notifications import booking_context, render_sms
+
+        return render_sms(kind, booking_context(self))
+
+    def send_notification(self, kind: str) -> bool:
+        """
+        Send a notification by email and, if there is a phone, by SMS.
+
+        Args:
+            kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+
+        Returns:
+            True if either the email or the SMS was sent
+        """
+        from .fanout import send_notifications
+        from .notifications import render_notification
+
+        # Email and SMS go out at the same time
+        return send_notifications([render_notification(self, kind)])[0]
 
     def send_confirmation_notification(self) -> bool:
         """
@@ -501,48 +685,7 @@ class Booking(models.Model):
         Returns:
             True if notifications sent successfully
         """
-        from apps.core.adapters import get_email_adapter, get_sms_adapter
-
-        email_adapter = get_email_adapter()
-        sms_adapter = get_sms_adapter()
-
-        context = {
-            "booking": self,
-            "customer": self.customer,
-            "customer_name": self.get_customer_name(),
-            "customer_email": self.get_customer_email(),
-            "service": self.service,
-            "staff": self.staff,
-        }
-
-        # Send email
-        email_sent = email_adapter.send_email(
-            to=[self.get_customer_email()],
-            subject="Booking Confirmation",
-            template_name="booking_confirmation",
-            context=context,
-        )
-
-        # Send SMS if customer has phone
-        sms_sent = False
-        # For registered users
-        if self.customer and self.customer.phone and self.customer.sms_notifications:
-            message = (
-                f"Booking confirmed! {self.service.name} with {self.staff.get_full_name()} "
-                f"on {self.start_time.strftime('%b %d at %I:%M %p')}. "
-                f"Confirmation: {self.confirmation_code}"
-            )
-            sms_sent = sms_adapter.send_sms(to=str(self.customer.phone), message=message)
-        # For guests with phone provided
-        elif self.guest_phone:
-            message = (
-                f"Booking confirmed! {self.service.name} with {self.staff.get_full_name()} "
-                f"on {self.start_time.strftime('%b %d at %I:%M %p')}. "
-                f"Confirmation: {self.confirmation_code}"
-            )
-            sms_sent = sms_adapter.send_sms(to=self.guest_phone, message=message)
-
-        return email_sent or sms_sent
+        return self.send_notification("confirmation")
 
     def send_cancellation_notification(self) -> bool:
         """
@@ -551,93 +694,186 @@ class Booking(models.Model):
         Returns:
             True if notifications sent successfully
         """
-        from apps.core.adapters import get_email_adapter, get_sms_adapter
-
-        email_adapter = get_email_adapter()
-        sms_adapter = get_sms_adapter()
-
-        context = {
-            "booking": self,
-            "customer": self.customer,
-            "customer_name": self.get_customer_name(),
-            "customer_email": self.get_customer_email(),
-        }
-
-        # Send email
-        email_sent = email_adapter.send_email(
-            to=[self.get_customer_email()],
-            subject="Booking Canceled",
-            template_name="booking_cancellation",
-            context=context,
-        )
-
-        # Send SMS if customer has phone
-        sms_sent = False
-        # For registered users
-        if self.customer and self.customer.phone and self.customer.sms_notifications:
-            message = (
-                f"Your booking for {self.service.name} on "
-                f"{self.start_time.strftime('%b %d at %I:%M %p')} has been canceled."
-            )
-            sms_sent = sms_adapter.send_sms(to=str(self.customer.phone), message=message)
-        # For guests with phone provided
-        elif self.guest_phone:
-            message = (
-                f"Your booking for {self.service.name} on "
-                f"{self.start_time.strftime('%b %d at %I:%M %p')} has been canceled."
-            )
-            sms_sent = sms_adapter.send_sms(to=self.guest_phone, message=message)
-
-        return email_sent or sms_sent
+        return self.send_notification("cancellation")
 
     def send_reminder(self) -> bool:
         """
-        Send appointment reminder.
+        Queue the appointment reminder.
+
+        The reminder goes through the notification outbox, so a failed send
+        is retried rather than lost behind ``reminder_sent``.
 
         Returns:
-            True if reminder sent successfully
+            True if the reminder was queued, False if it already was
         """
-        from apps.core.adapters import get_email_adapter, get_sms_adapter
+        with transaction.atomic():
+            claimed = Booking.objects.filter(pk=self.pk, reminder_sent=False).update(
+                reminder_sent=True
+            )
+            if not claimed:
+                return False
+            self.reminder_sent = True
+            NotificationOutbox.objects.enqueue(self, "reminder")
+        return True
 
-        if self.reminder_sent:
-            return False
 
-        email_adapter = get_email_adapter()
-        sms_adapter = get_sms_adapter()
-
-        context = {
-            "booking": self,
-            "customer": self.customer,
-            "customer_name": self.get_customer_name(),
-            "customer_email": self.get_customer_email(),
-        }
-
-        # Send email
-        email_adapter.send_email(
-            to=[self.get_customer_email()],
-            subject="Appointment Reminder",
-            template_name="booking_reminder",
-            context=context,
-        )
+class NotificationOutbox(models.Model):
+    """
+    Booking notification waiting to be sent.
 
-        # Send SMS
-        # For registered users
-        if self.customer and self.customer.phone and self.customer.sms_notifications:
-            message = (
-                f"Reminder: {self.service.name} appointment tomorrow at "
-                f"{self.start_time.strftime('%I:%M %p')} with {self.staff.get_full_name()}."
-            )
-            sms_adapter.send_sms(to=str(self.customer.phone), message=message)
-        # For guests with phone provided
-        elif self.guest_phone:
-            message = (
-                f"Reminder: {self.service.name} appointment tomorrow at "
-                f"{self.start_time.strftime('%I:%M %p')} with {self.staff.get_full_name()}."
-            )
-            sms_adapter.send_sms(to=self.guest_phone, message=message)
+    Written in the same transaction as the booking change, so a notification
+    is queued if and only if the change commits. Rows are delivered off the
+    request path by a Celery worker or the ``process_outbox`` command.
+    """
 
-        self.reminder_sent = True
-        self.save()
-        return True
+    KIND_CHOICES = [
+        ("confirmation", "Confirmation"),
+        ("cancellation", "Cancellation"),
+        ("reminder", "Reminder"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        help_text="Booking the notification is about",
+    )
+
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        help_text="Which notification to send",
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="pending",
+        db_index=True,
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of delivery attempts so far",
+    )
+
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time of the next delivery attempt",
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        help_text="Error from the last failed attempt",
+    )
+
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationOutboxManager()
+
+    class Meta:
+        verbose_name = "Notification"
+        verbose_name_plural = "Notification Outbox"
+        ordering = ["available_at"]
+        indexes = [
+            # Due rows for the drain: WHERE status = 'pending' AND available_at <= now
+            models.Index(fields=["status", "available_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"{self.get_kind_display()} for booking {self.booking_id} ({self.status})"
+
+
+class NotificationAttempt(models.Model):
+    """One delivery attempt of an outbox notification over one channel."""
+
+    CHANNEL_CHOICES = [
+        ("email", "Email"),
+        ("sms", "SMS"),
+    ]
+
+    STATUS_CHOICES = [
+        ("sent", "Sent"),
+        ("transient", "Failed, will retry"),
+        ("permanent", "Failed permanently"),
+    ]
+
+    notification = models.ForeignKey(
+        NotificationOutbox,
+        on_delete=models.CASCADE,
+        related_name="delivery_attempts",
+    )
+
+    attempt = models.PositiveSmallIntegerField(help_text="Attempt number of the notification")
+
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+
+    error_class = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Exception class of a failed attempt",
+    )
 
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Notification Attempt"
+        verbose_name_plural = "Notification Attempts"
+        ordering = ["notification", "attempt", "channel"]
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"Attempt {self.attempt} of notification {self.notification_id} by {self.channel}"
+
+
+class NotificationDeadLetter(models.Model):
+    """
+    Notification that could not be delivered and was taken out of the outbox.
+
+    Created when a failure is permanent or the retries run out; the outbox
+    row stays behind as ``failed`` until an admin requeues it.
+    """
+
+    notification = models.OneToOneField(
+        NotificationOutbox,
+        on_delete=models.CASCADE,
+        related_name="dead_letter",
+    )
+
+    attempts = models.PositiveSmallIntegerField(help_text="Delivery attempts made")
+
+    error_class = models.CharField(max_length=100, blank=True)
+
+    error = models.TextField(blank=True)
+
+    permanent = models.BooleanField(
+        default=False,
+        help_text="Whether the last failure ruled out retrying",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationDeadLetterManager()
+
+    class Meta:
+        verbose_name = "Dead Letter"
+        verbose_name_plural = "Notification Dead Letters"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"Dead letter for notification {self.notification_id} ({self.error_class})"
 
@@ -0,0 +1,206 @@
+"""Rendering of booking notifications for every channel."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.template import loader
+from django.utils import timezone
+
+from apps.core.adapters import TemplatedEmail
+
+# Subject and template of each notification email
+EMAILS = {
+    "confirmation": ("Booking Confirmation", "booking_confirmation"),
+    "cancellation": ("Booking Canceled", "booking_cancellation"),
+    "reminder": ("Appointment Reminder", "booking_reminder"),
+}
+
+# Text message of each notification, filled from the booking context
+SMS = {
+    "confirmation": (
+        "Booking confirmed! {service.name} with {staff_name} on {day} at {time}. "
+        "Confirmation: {booking.confirmation_code}"
+    ),
+    "cancellation": "Your booking for {service.name} on {day} at {time} has been canceled.",
+    "reminder": "Reminder: {service.name} appointment tomorrow at {time} with {staff_name}.",
+}
+
+_compiled: dict[str, Any] = {}
+_timings: dict[str, list[float]] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class RenderedNotification:
+    """A notification rendered for every channel it goes out on."""
+
+    kind: str
+    email: TemplatedEmail
+    sms: tuple[str, str] | None
+
+
+def get_template(name: str):
+    """
+    Return a compiled template, loading and parsing it once per process.
+
+    With ``DEBUG`` on, templates come straight from the loader so edits
+    show up without a restart.
+
+    Args:
+        name: Template path, e.g. ``"emails/booking_reminder.html"``
+    """
+    if settings.DEBUG:
+        return loader.get_template(name)
+    template = _compiled.get(name)
+    if template is None:
+        template = _compiled[name] = loader.get_template(name)
+    return template
+
+
+def precompile() -> None:
+    """Compile every notification template ahead of the first send."""
+    for _, template_name in EMAILS.values():
+        get_template(f"emails/{template_name}.txt")
+        get_template(f"emails/{template_name}.html")
+
+
+def booking_context(booking) -> dict[str, Any]:
+    """
+    Build the context shared by all channels of a booking's notifications.
+
+    Reads the service, staff member and customer once, so load them with
+    ``select_related`` to keep this free of queries.
+
+    Args:
+        booking: Booking the notification is about
+
+    Returns:
+        Template context
+    """
+    start = timezone.localtime(booking.start_time)
+    return {
+        "booking": booking,
+        "customer": booking.customer,
+        "customer_name": booking.get_customer_name(),
+        "customer_email": booking.get_customer_email(),
+        "customer_phone": _sms_recipient(booking),
+        "service": booking.service,
+        "staff": booking.staff,
+        "staff_name": booking.staff.get_full_name(),
+        "site_name": settings.SITE_NAME,
+        "day": start.strftime("%b %d"),
+        "time": start.strftime("%I:%M %p"),
+    }
+
+
+def _sms_recipient(booking) -> str | None:
+    """Phone number to text, if the customer or guest can receive SMS."""
+    customer = booking.customer
+    if customer is not None and customer.phone and customer.sms_notifications:
+        return str(customer.phone)
+    return booking.guest_phone or None
+
+
+def render_email(kind: str, context: dict[str, Any]) -> TemplatedEmail:
+    """
+    Render the email for a notification kind.
+
+    Args:
+        kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+        context: Context from ``booking_context``
+
+    Returns:
+        TemplatedEmail with its text and HTML bodies already rendered
+    """
+    subject, template_name = EMAILS[kind]
+    return TemplatedEmail(
+        to=[context["customer_email"]],
+        subject=subject,
+        template_name=template_name,
+        context=context,
+        text=_render(f"emails/{template_name}.txt", context),
+        html=_render(f"emails/{template_name}.html", context),
+    )
+
+
+def render_sms(kind: str, context: dict[str, Any]) -> tuple[str, str] | None:
+    """
+    Render the text message for a notification kind.
+
+    Args:
+        kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+        context: Context from ``booking_context``
+
+    Returns:
+        Tuple of (phone number, message), or None if there is no phone to text
+    """
+    if not context["customer_phone"]:
+        return None
+    return context["customer_phone"], SMS[kind].format(**context)
+
+
+def render_notification(booking, kind: str) -> RenderedNotification:
+    """
+    Render a booking notification for email and SMS from one context.
+
+    Args:
+        booking: Booking the notification is about
+        kind: ``"confirmation"``, ``"cancellation"`` or ``"reminder"``
+    """
+    context = booking_context(booking)
+    return RenderedNotification(
+        kind=kind, email=render_email(kind, context), sms=render_sms(kind, context)
+    )
+
+
+def _render(name: str, context: dict[str, Any]) -> str:
+    """Render a compiled template and record how long it took."""
+    started = time.perf_counter()
+    content = get_template(name).render(context)
+    elapsed = time.perf_counter() - started
+
+    with _lock:
+        stats = _timings.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+    return content
+
+
+def render_timings() -> dict[str, dict[str, float]]:
+    """
+    Template render timings recorded in this process.
+
+    Returns:
+        Per template: ``count`` renders, ``total_ms``, ``avg_ms`` and ``max_ms``
+    """
+    with _lock:
+        return {
+            name: {
+                "count": count,
+                "total_ms": total * 1000,
+                "avg_ms": total / count * 1000,
+                "max_ms": slowest * 1000,
+            }
+            for name, (count, total, slowest) in sorted(_timings.items())
+        }
+
+
+def format_render_timings() -> list[str]:
+    """Render timings as one report line per template."""
+    return [
+        f"{name}: {stats['count']} render(s), avg {stats['avg_ms']:.2f}ms, "
+        f"max {stats['max_ms']:.2f}ms, total {stats['total_ms']:.1f}ms"
+        for name, stats in render_timings().items()
+    ]
+
+
+def reset_render_timings() -> None:
+    """Forget the recorded render timings."""
+    with _lock:
+        _timings.clear()
@@ -0,0 +1,198 @@
+"""Delivery of queued booking notifications."""
+
+from __future__ import annotations
+
+import logging
+import random
+from collections.abc import Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.adapters import DeliveryResult
+
+from .fanout import deliver_notifications
+from .models import NotificationAttempt, NotificationDeadLetter, NotificationOutbox
+from .notifications import render_notification
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch(entry_ids: list[int]) -> None:
+    """
+    Hand committed outbox rows to the configured dispatcher.
+
+    ``NOTIFICATION_DISPATCH`` selects ``"celery"`` (queue a task),
+    ``"sync"`` (deliver in this process, e.g. for development) or
+    ``"command"`` (leave them for ``process_outbox``). Rows that cannot be
+    queued stay pending and are picked up by the next drain.
+
+    Args:
+        entry_ids: Primary keys of the outbox rows
+    """
+    mode = getattr(settings, "NOTIFICATION_DISPATCH", "celery").lower()
+
+    if mode == "celery":
+        from .tasks import deliver_notifications
+
+        try:
+            deliver_notifications.apply_async((entry_ids,), retry=False)
+        except Exception as e:
+            logger.warning(
+                f"Could not queue notifications {entry_ids}, leaving them for the drain: {e}"
+            )
+    elif mode == "sync":
+        process_outbox(ids=entry_ids)
+
+
+def deliver_batch(entries: Iterable[NotificationOutbox]) -> int:
+    """
+    Send claimed notifications and record each outcome.
+
+    The batch is fanned out with ``deliver_notifications``: notifications
+    go out concurrently, each over email and SMS at once, while the emails
+    still share the adapter's pooled SMTP connection. Every channel's
+    attempt is recorded. A notification counts as sent if any channel got
+    through; otherwise it is retried with backoff, or dead-lettered when
+    the failure is permanent or ``NOTIFICATION_MAX_ATTEMPTS`` is reached.
+
+    Args:
+        entries: Claimed outbox rows, with their bookings loaded
+
+    Returns:
+        Number of notifications sent
+    """
+    entries = list(entries)
+    outcomes: dict[int, dict[str, DeliveryResult]] = {}
+
+    # Render each booking's notification once, for both channels
+    rendered = {}
+    for entry in entries:
+        key = (entry.booking_id, entry.kind)
+        if key not in rendered:
+            try:
+                rendered[key] = render_notification(entry.booking, entry.kind)
+            except Exception as e:
+                logger.exception(f"Could not render notification {entry.pk}")
+                rendered[key] = DeliveryResult.failure(e)
+        if isinstance(rendered[key], DeliveryResult):
+            outcomes[entry.pk] = {"email": rendered[key]}
+
+    to_send = [entry for entry in entries if entry.pk not in outcomes]
+    results = deliver_notifications([rendered[entry.booking_id, entry.kind] for entry in to_send])
+    outcomes.update(zip((entry.pk for entry in to_send), results))
+
+    NotificationAttempt.objects.bulk_create(
+        NotificationAttempt(
+            notification=entry,
+            attempt=entry.attempts,
+            channel=channel,
+            status="sent" if result.sent else "permanent" if result.permanent else "transient",
+            error_class=result.error_class,
+            error=result.error,
+        )
+        for entry in entries
+        for channel, result in outcomes[entry.pk].items()
+    )
+
+    sent_count = 0
+    for entry in entries:
+        sent_count += _record(entry, outcomes[entry.pk])
+    return sent_count
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Wait before the next attempt, doubling with every failed attempt.
+
+    Starts at ``NOTIFICATION_RETRY_SECONDS`` and is capped at
+    ``NOTIFICATION_RETRY_MAX_SECONDS``. Half of the delay is random
+    jitter, so notifications that failed together do not retry in lockstep.
+
+    Args:
+        attempts: Attempts made so far (at least 1)
+    """
+    delay = min(
+        settings.NOTIFICATION_RETRY_SECONDS * 2 ** (attempts - 1),
+        settings.NOTIFICATION_RETRY_MAX_SECONDS,
+    )
+    return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
+
+
+def _record(entry: NotificationOutbox, results: dict[str, DeliveryResult]) -> bool:
+    """Store the outcome of a delivery attempt; return whether it was sent."""
+    now = timezone.now()
+    if any(result.sent for result in results.values()):
+        NotificationOutbox.objects.filter(pk=entry.pk).update(
+            status="sent", sent_at=now, last_error=""
+        )
+        return True
+
+    failures = list(results.values())
+    error = "; ".join(f"{channel}: {r.error_class}: {r.error}" for channel, r in results.items())
+    permanent = all(result.permanent for result in failures)
+
+    if permanent or entry.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        reason = "permanent failure" if permanent else f"{entry.attempts} attempts"
+        logger.error(f"Dead-lettering notification {entry.pk} after {reason}: {error}")
+        with transaction.atomic():
+            NotificationOutbox.objects.filter(pk=entry.pk).update(status="failed", last_error=error)
+            NotificationDeadLetter.objects.update_or_create(
+                notification=entry,
+                defaults={
+                    "attempts": entry.attempts,
+                    "error_class": failures[0].error_class,
+                    "error": error,
+                    "permanent": permanent,
+                },
+            )
+    else:
+        NotificationOutbox.objects.filter(pk=entry.pk).update(
+            available_at=now + retry_delay(entry.attempts), last_error=error
+        )
+    return False
+
+
+def process_outbox(
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    ids: list[int] | None = None,
+) -> int:
+    """
+    Drain due notifications in batches.
+
+    Each batch is claimed in a short transaction, then sent with no
+    transaction open, so a slow SMTP or SMS provider never holds locks.
+
+    Args:
+        batch_size: Rows per batch (default: ``NOTIFICATION_BATCH_SIZE``)
+        max_batches: Stop after this many batches (default: until empty)
+        ids: Only deliver these rows, if they are due
+
+    Returns:
+        Number of notifications sent
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    lease = timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+    sent = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        claimed = NotificationOutbox.objects.claim(batch_size, lease, ids=ids)
+        if not claimed:
+            break
+        batches += 1
+
+        entries = NotificationOutbox.objects.filter(pk__in=claimed).select_related(
+            "booking__customer", "booking__service", "booking__staff"
+        )
+        try:
+            sent += deliver_batch(entries)
+        except Exception:
+            # Claimed rows keep their lease and are retried when it runs out
+            logger.exception(f"Notification batch {claimed} failed")
+
+    if batches:
+        logger.info(f"Sent {sent} notification(s) in {batches} batch(es)")
+    return sent
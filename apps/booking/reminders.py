@@ -0,0 +1,114 @@
+"""Scheduled appointment reminders."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import Booking, NotificationOutbox
+from .outbox import deliver_batch
+
+logger = logging.getLogger(__name__)
+
+
+def due_reminders(now: datetime | None = None) -> models.QuerySet:
+    """
+    Active bookings starting within ``REMINDER_LEAD_HOURS`` that have no reminder yet.
+
+    Matches ``booking_reminder_due_idx`` (reminder_sent, status, start_time),
+    so the lookup and the ``start_time`` ordering are one index range scan.
+
+    Args:
+        now: Reference time (default: the current time)
+
+    Returns:
+        QuerySet of due bookings, earliest first
+    """
+    now = now or timezone.now()
+    return Booking.objects.filter(
+        reminder_sent=False,
+        status__in=Booking.ACTIVE_STATUSES,
+        start_time__gt=now,
+        start_time__lte=now + timedelta(hours=settings.REMINDER_LEAD_HOURS),
+    ).order_by("start_time")
+
+
+def send_due_reminders(chunk_size: int | None = None, now: datetime | None = None) -> int:
+    """
+    Send every due reminder, one chunk at a time.
+
+    Due bookings are streamed with ``iterator()``, so memory stays bounded by
+    the chunk size however many reminders are due. Each chunk is claimed by
+    flipping ``reminder_sent`` in a short transaction that skips rows other
+    workers hold, so parallel runs never remind a booking twice. Claimed
+    reminders go out through the batched email and SMS adapters; the ones
+    that fail stay in the notification outbox and are retried from there.
+
+    Args:
+        chunk_size: Bookings claimed and sent together (default: ``REMINDER_CHUNK_SIZE``)
+        now: Reference time (default: the current time)
+
+    Returns:
+        Number of reminders sent
+    """
+    chunk_size = chunk_size or settings.REMINDER_CHUNK_SIZE
+    bookings = (
+        due_reminders(now)
+        .select_related("service", "staff", "customer")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    sent = claimed = 0
+    for chunk in _chunks(bookings, chunk_size):
+        entries = _claim(chunk)
+        claimed += len(entries)
+        if entries:
+            sent += deliver_batch(entries)
+
+    if claimed:
+        logger.info(f"Sent {sent} of {claimed} due reminder(s)")
+    return sent
+
+
+def _chunks(bookings: Iterable[Booking], size: int) -> Iterator[list[Booking]]:
+    """Split a stream of bookings into lists of at most ``size``."""
+    iterator = iter(bookings)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _claim(bookings: list[Booking]) -> list[NotificationOutbox]:
+    """
+    Mark bookings as reminded and queue their reminders as leased outbox rows.
+
+    Rows are leased to this worker the same way ``NotificationOutbox.claim``
+    does, so the outbox drain only picks them up if this run fails to
+    record an outcome.
+    """
+    by_id = {booking.pk: booking for booking in bookings}
+    lease = timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+
+    with transaction.atomic():
+        ids = list(
+            Booking.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=by_id, reminder_sent=False)
+            .values_list("pk", flat=True)
+        )
+        if not ids:
+            return []
+        Booking.objects.filter(pk__in=ids).update(reminder_sent=True)
+        return NotificationOutbox.objects.bulk_create(
+            NotificationOutbox(
+                booking=by_id[pk],
+                kind="reminder",
+                attempts=1,
+                available_at=timezone.now() + lease,
+            )
+            for pk in ids
+        )
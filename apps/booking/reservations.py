@@ -0,0 +1,162 @@
+"""Race-free reservation of time slot capacity."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .exceptions import SlotUnavailableError
+from .intervals import covers
+from .models import Booking, Service, Staff, TimeSlot
+from .schedule import free_intervals, slot_free_intervals
+
+__all__ = ["SlotUnavailableError", "reserve_slot", "reserve_time"]
+
+
+def reserve_slot(
+    slot_id: int,
+    *,
+    service: Service,
+    staff: Staff | None = None,
+    customer: AbstractBaseUser | None = None,
+    guest_email: str = "",
+    guest_name: str = "",
+    guest_phone: str = "",
+    notes: str = "",
+) -> Booking:
+    """
+    Reserve capacity on a time slot and create a pending booking.
+
+    Capacity is claimed with a single conditional UPDATE on the slot row
+    (``booked_count < capacity``), so concurrent callers never overbook. The
+    whole service duration must also fit in the stylist's contiguous free
+    time; that check runs with the staff row locked. The claim and the
+    booking insert commit together.
+
+    Args:
+        slot_id: Primary key of the time slot
+        service: Service being booked
+        staff: Expected staff member (checked against the slot when given)
+        customer: Registered customer, or None for guest bookings
+        guest_email: Guest email address
+        guest_name: Guest full name
+        guest_phone: Guest phone number
+        notes: Additional notes or special requests
+
+    Returns:
+        The created booking
+
+    Raises:
+        TimeSlot.DoesNotExist: If the slot does not exist
+        SlotUnavailableError: If the slot is blocked, in the past, already full
+            or too short for the service
+        ValidationError: If the slot or staff member cannot provide the service
+    """
+    with transaction.atomic():
+        time_slot = TimeSlot.objects.select_related("staff").get(pk=slot_id)
+
+        if staff is not None and time_slot.staff_id != staff.id:
+            raise ValidationError("Time slot does not belong to selected staff")
+
+        if time_slot.is_blocked or time_slot.start_time < timezone.now():
+            raise SlotUnavailableError()
+
+        if not time_slot.staff.services.filter(id=service.id).exists():
+            raise ValidationError(
+                f"{time_slot.staff.get_full_name()} does not provide {service.name}"
+            )
+
+        # Serialize bookings per stylist, then check the whole service fits
+        # in contiguous free time (a long service spans the following slots)
+        Staff.objects.select_for_update().only("pk").get(pk=time_slot.staff_id)
+        end_time = time_slot.start_time + timedelta(minutes=service.duration)
+        free = slot_free_intervals(
+            [time_slot.staff_id],
+            timezone.localdate(time_slot.start_time),
+            timezone.localdate(end_time),
+        )[time_slot.staff_id]
+        if not covers(free, time_slot.start_time, end_time):
+            raise SlotUnavailableError()
+
+        # Booking.save() claims the capacity and raises SlotUnavailableError when full
+        return Booking.objects.create(
+            customer=customer,
+            guest_email=guest_email,
+            guest_name=guest_name,
+            guest_phone=guest_phone,
+            service=service,
+            staff=time_slot.staff,
+            time_slot=time_slot,
+            start_time=time_slot.start_time,
+            notes=notes,
+        )
+
+
+def reserve_time(
+    staff: Staff,
+    start_time: datetime,
+    *,
+    service: Service,
+    customer: AbstractBaseUser | None = None,
+    guest_email: str = "",
+    guest_name: str = "",
+    guest_phone: str = "",
+    notes: str = "",
+) -> Booking:
+    """
+    Book a stylist's free time directly, without a TimeSlot row.
+
+    Used by computed availability. The staff row is locked for the duration
+    of the check and insert, so two bookings for the same stylist are
+    serialized and cannot both pass the free-time check.
+
+    Args:
+        staff: Staff member providing the service
+        start_time: Appointment start
+        service: Service being booked (its duration sets the end time)
+        customer: Registered customer, or None for guest bookings
+        guest_email: Guest email address
+        guest_name: Guest full name
+        guest_phone: Guest phone number
+        notes: Additional notes or special requests
+
+    Returns:
+        The created booking
+
+    Raises:
+        SlotUnavailableError: If the time is in the past or not free
+        ValidationError: If the staff member cannot provide the service
+    """
+    end_time = start_time + timedelta(minutes=service.duration)
+
+    with transaction.atomic():
+        staff = Staff.objects.select_for_update().get(pk=staff.pk)
+
+        if start_time < timezone.now():
+            raise SlotUnavailableError()
+
+        if not staff.services.filter(id=service.id).exists():
+            raise ValidationError(f"{staff.get_full_name()} does not provide {service.name}")
+
+        first_day = timezone.localdate(start_time)
+        last_day = timezone.localdate(end_time)
+        free = free_intervals([staff.pk], first_day, last_day)[staff.pk]
+        if not covers(free, start_time, end_time):
+            raise SlotUnavailableError()
+
+        return Booking.objects.create(
+            customer=customer,
+            guest_email=guest_email,
+            guest_name=guest_name,
+            guest_phone=guest_phone,
+            service=service,
+            staff=staff,
+            time_slot=None,
+            start_time=start_time,
+            end_time=end_time,
+            notes=notes,
+        )
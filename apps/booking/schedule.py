@@ -0,0 +1,206 @@
+"""Working time and busy time per staff member, as interval lists."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from .intervals import Interval, intersect, subtract
+from .managers import day_bounds
+from .models import Booking, OpeningHour, StaffWorkingHour, TimeSlot
+
+
+def _local(day: date, at: time) -> datetime:
+    """Combine a local day and wall-clock time into an aware datetime."""
+    return timezone.make_aware(datetime.combine(day, at))
+
+
+def working_intervals(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[int, list[Interval]]:
+    """
+    Get the time each staff member works on local days in a range.
+
+    Working time is the salon opening hours, narrowed to the staff member's
+    own working pattern when they have one.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of staff id to sorted, disjoint working intervals
+    """
+    staff_ids = list(staff_ids)
+    opening = {hour.weekday: hour for hour in OpeningHour.objects.filter(is_closed=False)}
+
+    shifts: dict[int, dict[int, list[tuple[time, time]]]] = defaultdict(lambda: defaultdict(list))
+    for staff_id, weekday, shift_start, shift_end in StaffWorkingHour.objects.filter(
+        staff_id__in=staff_ids
+    ).values_list("staff_id", "weekday", "start_time", "end_time"):
+        shifts[staff_id][weekday].append((shift_start, shift_end))
+
+    working: dict[int, list[Interval]] = {}
+    for staff_id in staff_ids:
+        intervals: list[Interval] = []
+        day = start_date
+        while day <= end_date:
+            hour = opening.get(day.weekday())
+            if hour is not None:
+                open_interval = [(_local(day, hour.start_time), _local(day, hour.end_time))]
+                if staff_id in shifts:
+                    own = [
+                        (_local(day, shift_start), _local(day, shift_end))
+                        for shift_start, shift_end in shifts[staff_id][day.weekday()]
+                    ]
+                    intervals.extend(intersect(open_interval, own))
+                else:
+                    intervals.extend(open_interval)
+            day += timedelta(days=1)
+        working[staff_id] = intervals
+
+    return working
+
+
+def busy_intervals(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[int, list[Interval]]:
+    """
+    Get active bookings and blocked slots per staff member in a date range.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of staff id to unsorted busy intervals
+    """
+    staff_ids = list(staff_ids)
+    lower, upper = day_bounds(start_date, end_date)
+    busy: dict[int, list[Interval]] = defaultdict(list)
+
+    bookings = (
+        Booking.objects.filter(
+            staff_id__in=staff_ids,
+            status__in=Booking.ACTIVE_STATUSES,
+            start_time__lt=upper,
+            end_time__gt=lower,
+        )
+        .order_by()
+        .values_list("staff_id", "start_time", "end_time")
+    )
+    blocks = (
+        TimeSlot.objects.filter(
+            staff_id__in=staff_ids,
+            is_blocked=True,
+            start_time__lt=upper,
+            end_time__gt=lower,
+        )
+        .order_by()
+        .values_list("staff_id", "start_time", "end_time")
+    )
+    for rows in (bookings, blocks):
+        for staff_id, start, end in rows:
+            busy[staff_id].append((start, end))
+
+    return busy
+
+
+def free_intervals(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[int, list[Interval]]:
+    """
+    Get free time per staff member by subtracting busy time from working time.
+
+    Runs a fixed number of queries regardless of staff count or range length.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of staff id to sorted, disjoint free intervals
+    """
+    staff_ids = list(staff_ids)
+    working = working_intervals(staff_ids, start_date, end_date)
+    busy = busy_intervals(staff_ids, start_date, end_date)
+    return {staff_id: subtract(working[staff_id], busy.get(staff_id, [])) for staff_id in staff_ids}
+
+
+def overflow_intervals(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[int, list[Interval]]:
+    """
+    Get booked time that the booking's own slot counter does not cover.
+
+    A 120-minute booking on an hourly slot claims capacity on its first slot
+    only, but still occupies the stylist for the following hour. Bookings
+    without a slot occupy their whole interval.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of staff id to unsorted busy intervals
+    """
+    lower, upper = day_bounds(start_date, end_date)
+    overflow: dict[int, list[Interval]] = defaultdict(list)
+
+    for staff_id, start, end, slot_end in (
+        Booking.objects.filter(
+            staff_id__in=list(staff_ids),
+            status__in=Booking.ACTIVE_STATUSES,
+            start_time__lt=upper,
+            end_time__gt=lower,
+        )
+        .order_by()
+        .values_list("staff_id", "start_time", "end_time", "time_slot__end_time")
+    ):
+        busy_start = max(start, slot_end) if slot_end is not None else start
+        if busy_start < end:
+            overflow[staff_id].append((busy_start, end))
+
+    return overflow
+
+
+def slot_free_intervals(
+    staff_ids: Iterable[int], start_date: date, end_date: date
+) -> dict[int, list[Interval]]:
+    """
+    Get free time per staff member from stored TimeSlot rows.
+
+    Free time is the open slots with capacity left, merged where they are
+    contiguous, minus booking overflow from longer services.
+
+    Args:
+        staff_ids: Staff primary keys
+        start_date: First local day (inclusive)
+        end_date: Last local day (inclusive)
+
+    Returns:
+        Mapping of staff id to sorted, disjoint free intervals
+    """
+    staff_ids = list(staff_ids)
+    open_slots: dict[int, list[Interval]] = defaultdict(list)
+    for staff_id, start, end in (
+        TimeSlot.objects.available()
+        .filter(staff_id__in=staff_ids)
+        .in_window(start_date, end_date)
+        .order_by()
+        .values_list("staff_id", "start_time", "end_time")
+    ):
+        open_slots[staff_id].append((start, end))
+
+    overflow = overflow_intervals(staff_ids, start_date, end_date)
+    return {
+        staff_id: subtract(open_slots.get(staff_id, []), overflow.get(staff_id, []))
+        for staff_id in staff_ids
+    }
@@ -0,0 +1,119 @@
+"""Signal handlers for booking app."""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import bitmaps
+from .assignment import adjust_booked_count, forget_booked_counts
+from .models import Booking, OpeningHour, StaffWorkingHour, TimeSlot
+
+
+@receiver(post_delete, sender=Booking)
+def release_slot_on_delete(sender, instance: Booking, **kwargs) -> None:
+    """
+    Give back slot capacity when an active booking is deleted.
+
+    Also fires for queryset and cascade deletes, which load each booking
+    before deleting it.
+    """
+    status = getattr(instance, "_loaded_status", instance.__dict__.get("status"))
+    if status in Booking.ACTIVE_STATUSES:
+        slot_id = getattr(instance, "_loaded_time_slot_id", instance.time_slot_id)
+        if slot_id is not None:
+            TimeSlot.objects.release(slot_id)
+        _on_commit(_booking_update, getattr(instance, "_loaded_span", None), None, instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_caches_on_booking_save(sender, instance: Booking, created: bool, **kwargs) -> None:
+    """
+    Keep the cached availability bitmaps and booking counts in step with a booking.
+
+    Runs before ``Booking.save`` refreshes the loaded state, so the stored
+    status and span are still the ones from before this save.
+    """
+    new_span = (instance.staff_id, instance.start_time, instance.end_time)
+    is_active = instance.status in Booking.ACTIVE_STATUSES
+
+    if created:
+        if is_active:
+            _on_commit(_booking_update, None, new_span, instance)
+        return
+
+    if not hasattr(instance, "_loaded_status") or not hasattr(instance, "_loaded_span"):
+        # Stored state unknown; rebuild the days this booking touches
+        _on_commit(bitmaps.invalidate, *new_span)
+        _on_commit(forget_booked_counts, [new_span])
+        return
+
+    was_active = instance._loaded_status in Booking.ACTIVE_STATUSES
+    old_span = instance._loaded_span
+    if was_active == is_active and (not is_active or old_span == new_span):
+        return
+    _on_commit(
+        _booking_update,
+        old_span if was_active else None,
+        new_span if is_active else None,
+        instance,
+    )
+
+
+def _booking_update(old_span, new_span, booking: Booking) -> None:
+    """Free a booking's old time and take its new time in the caches."""
+    if old_span is not None:
+        adjust_booked_count(old_span[0], old_span[1], -1)
+    if new_span is not None:
+        adjust_booked_count(new_span[0], new_span[1], 1)
+
+    if _shares_slot(booking):
+        # A shared slot stays free until it is full; let the next read rebuild
+        for span in (old_span, new_span):
+            if span is not None:
+                bitmaps.invalidate(*span)
+        return
+    if old_span is not None:
+        bitmaps.mark_free(*old_span)
+    if new_span is not None:
+        bitmaps.mark_busy(*new_span)
+
+
+def _shares_slot(booking: Booking) -> bool:
+    """Whether the booking's slot takes more than one booking at a time."""
+    if booking.time_slot_id is None:
+        return False
+    if Booking.time_slot.is_cached(booking):
+        return booking.time_slot.capacity > 1
+    return TimeSlot.objects.filter(pk=booking.time_slot_id, capacity__gt=1).exists()
+
+
+@receiver(post_save, sender=TimeSlot)
+def update_bitmaps_on_slot_save(sender, instance: TimeSlot, created: bool, **kwargs) -> None:
+    """Record a blocked slot in the bitmaps, or rebuild its days on other changes."""
+    span = (instance.staff_id, instance.start_time, instance.end_time)
+    if instance.is_blocked and not created:
+        _on_commit(bitmaps.mark_blocked, *span)
+    else:
+        _on_commit(bitmaps.invalidate, *span)
+
+
+@receiver(post_delete, sender=TimeSlot)
+def update_bitmaps_on_slot_delete(sender, instance: TimeSlot, **kwargs) -> None:
+    """Rebuild the days of a deleted slot."""
+    _on_commit(bitmaps.invalidate, instance.staff_id, instance.start_time, instance.end_time)
+
+
+@receiver(post_save, sender=OpeningHour)
+@receiver(post_delete, sender=OpeningHour)
+@receiver(post_save, sender=StaffWorkingHour)
+@receiver(post_delete, sender=StaffWorkingHour)
+def invalidate_bitmaps_on_hours_change(sender, **kwargs) -> None:
+    """Working hours shape every computed bitmap; drop them all."""
+    _on_commit(bitmaps.invalidate_all)
+
+
+def _on_commit(func, *args) -> None:
+    """Run a bitmap update once the surrounding transaction commits."""
+    transaction.on_commit(lambda: func(*args))
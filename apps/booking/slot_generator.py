@@ -0,0 +1,111 @@
+"""Bulk rolling-horizon generation of time slots from opening hours."""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Count, QuerySet
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .bitmaps import invalidate_range
+from .models import OpeningHour, Staff, TimeSlot
+
+logger = logging.getLogger(__name__)
+
+
+def generate_slots(
+    start_date: date | None = None,
+    days: int | None = None,
+    slot_minutes: int | None = None,
+    staff: QuerySet[Staff] | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Create time slots for every active staff member from the opening hours.
+
+    Slots are built in memory and written with
+    ``bulk_create(ignore_conflicts=True)`` one batch at a time, so the whole
+    horizon costs a handful of queries and bounded memory. Days on which a
+    staff member already has any slot are left as they are, so repeated
+    runs are idempotent, a daily run rolls the horizon forward, and slots
+    created or blocked by hand are never touched.
+
+    Args:
+        start_date: First local day to cover (default: today)
+        days: Number of days to cover (default: ``BOOKING_HORIZON_DAYS``)
+        slot_minutes: Slot length in minutes (default: ``BOOKING_SLOT_MINUTES``)
+        staff: Staff members to generate for (default: all active staff)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Number of slots created
+    """
+    start_date = start_date or timezone.localdate()
+    days = settings.BOOKING_HORIZON_DAYS if days is None else days
+    slot_length = timedelta(
+        minutes=settings.BOOKING_SLOT_MINUTES if slot_minutes is None else slot_minutes
+    )
+    if slot_length <= timedelta(0):
+        raise ValueError("Slot length must be positive")
+
+    end_date = start_date + timedelta(days=days - 1)
+    hours = {hour.weekday: hour for hour in OpeningHour.objects.filter(is_closed=False)}
+    staff = Staff.objects.filter(is_active=True) if staff is None else staff
+    staff_members = list(staff)
+    if not staff_members or not hours or days <= 0:
+        return 0
+
+    window = TimeSlot.objects.filter(staff__in=staff_members).in_window(start_date, end_date)
+    covered: dict[int, set[date]] = defaultdict(set)
+    before = 0
+    for staff_id, day, count in (
+        window.annotate(day=TruncDate("start_time", tzinfo=timezone.get_current_timezone()))
+        .order_by()
+        .values("staff_id", "day")
+        .annotate(count=Count("pk"))
+        .values_list("staff_id", "day", "count")
+    ):
+        covered[staff_id].add(day)
+        before += count
+
+    slots = _build_slots(staff_members, hours, start_date, end_date, slot_length, covered)
+    while batch := list(islice(slots, batch_size)):
+        TimeSlot.objects.bulk_create(batch, ignore_conflicts=True)
+
+    created = window.count() - before
+    # bulk_create sends no signals; rebuild the covered availability days
+    invalidate_range([staff.pk for staff in staff_members], start_date, end_date)
+    logger.info(f"Generated {created} time slots from {start_date} to {end_date}")
+    return created
+
+
+def _build_slots(
+    staff_members: Iterable[Staff],
+    hours: dict[int, OpeningHour],
+    start_date: date,
+    end_date: date,
+    slot_length: timedelta,
+    covered: dict[int, set[date]],
+) -> Iterator[TimeSlot]:
+    """Yield unsaved slots for the days each staff member has no slots on yet."""
+    for staff in staff_members:
+        day = start_date
+        while day <= end_date:
+            hour = hours.get(day.weekday())
+            if hour is not None and day not in covered[staff.pk]:
+                current = timezone.make_aware(datetime.combine(day, hour.start_time))
+                closing = timezone.make_aware(datetime.combine(day, hour.end_time))
+                while current + slot_length <= closing:
+                    yield TimeSlot(
+                        staff=staff,
+                        start_time=current,
+                        end_time=current + slot_length,
+                    )
+                    current += slot_length
+            day += timedelta(days=1)
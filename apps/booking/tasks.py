@@ -0,0 +1,34 @@
+"""Celery tasks for booking app."""
+
+from __future__ import annotations
+
+from celery import shared_task
+from celery.signals import worker_process_init
+
+from .notifications import precompile
+from .outbox import process_outbox
+from .reminders import send_due_reminders
+
+
+@worker_process_init.connect
+def precompile_notification_templates(**kwargs) -> None:
+    """Compile the notification templates before a worker takes its first task."""
+    precompile()
+
+
+@shared_task(ignore_result=True)
+def deliver_notifications(entry_ids: list[int]) -> int:
+    """Send outbox notifications right after they commit."""
+    return process_outbox(ids=entry_ids)
+
+
+@shared_task(ignore_result=True)
+def process_notification_outbox() -> int:
+    """Drain due outbox notifications, including retries; run by beat."""
+    return process_outbox()
+
+
+@shared_task(ignore_result=True)
+def send_booking_reminders() -> int:
+    """Send reminders for upcoming bookings; run by beat."""
+    return send_due_reminders()
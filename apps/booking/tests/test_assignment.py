@@ -0,0 +1,233 @@
+"""Tests for load-balanced "Any available" assignment."""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.assignment import assign, booked_counts
+from apps.booking.availability import StoredSlotBackend
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+from apps.booking.reservations import SlotUnavailableError, reserve_slot
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Use a real in-memory cache so counters survive between calls."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "assignment",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def day():
+    """Return tomorrow's local date."""
+    return timezone.localdate() + timedelta(days=1)
+
+
+@pytest.fixture
+def service(db):
+    """Create a one-hour service."""
+    return Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+
+
+@pytest.fixture
+def stylists(service, day):
+    """Create three stylists with hourly slots from 9:00 to 17:00."""
+    stylists = []
+    for name in ["Ann", "Bea", "Cat"]:
+        staff = Staff.objects.create(first_name=name, last_name="Stylist")
+        staff.services.add(service)
+        for hour in range(9, 17):
+            TimeSlot.objects.create(
+                staff=staff, start_time=local(day, hour), end_time=local(day, hour + 1)
+            )
+        stylists.append(staff)
+    return stylists
+
+
+def local(day, hour):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def book(staff, day, hour, service):
+    """Reserve a stylist's slot directly."""
+    slot = TimeSlot.objects.get(staff=staff, start_time=local(day, hour))
+    return reserve_slot(slot.id, service=service, guest_email="direct@example.com")
+
+
+def assign_at(day, hour, service, **kwargs):
+    """Assign any stylist at an hour."""
+    return assign(
+        Staff.objects.filter(is_active=True),
+        local(day, hour),
+        service=service,
+        guest_email="any@example.com",
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestBookedCounts:
+    """Cached per-day booking counters."""
+
+    def test_counts_and_caches(self, stylists, service, day, django_assert_num_queries):
+        """Test that counts are read once and then served from the cache."""
+        ann, bea, cat = stylists
+        book(ann, day, 9, service)
+        book(ann, day, 10, service)
+        book(bea, day, 9, service)
+        staff_ids = [staff.pk for staff in stylists]
+
+        with django_assert_num_queries(1):
+            assert booked_counts(staff_ids, day) == {ann.pk: 2, bea.pk: 1, cat.pk: 0}
+        with django_assert_num_queries(0):
+            booked_counts(staff_ids, day)
+
+    def test_counts_follow_bookings(
+        self, stylists, service, day, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """Test that counters are adjusted on commit without a recount."""
+        ann = stylists[0]
+        booked_counts([ann.pk], day)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking = book(ann, day, 9, service)
+        with django_assert_num_queries(0):
+            assert booked_counts([ann.pk], day) == {ann.pk: 1}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.cancel()
+        with django_assert_num_queries(0):
+            assert booked_counts([ann.pk], day) == {ann.pk: 0}
+
+
+@pytest.mark.django_db
+class TestPolicies:
+    """Assignment policies."""
+
+    def test_least_booked(self, stylists, service, day, django_capture_on_commit_callbacks):
+        """Test that the stylist with the fewest bookings that day is picked."""
+        ann, bea, cat = stylists
+        book(ann, day, 9, service)
+        book(bea, day, 9, service)
+        book(bea, day, 10, service)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first = assign_at(day, 12, service)
+        with django_capture_on_commit_callbacks(execute=True):
+            second = assign_at(day, 13, service)
+
+        assert first.staff == cat
+        assert second.staff == ann
+
+    def test_round_robin(self, settings, stylists, service, day):
+        """Test that consecutive assignments rotate through the stylists."""
+        settings.BOOKING_ASSIGNMENT_POLICY = "round_robin"
+
+        picks = [assign_at(day, hour, service).staff for hour in (9, 10, 11, 12)]
+
+        assert picks == [*stylists, stylists[0]]
+
+    def test_fewest_gaps(self, settings, stylists, service, day):
+        """Test that a booking next to existing bookings is preferred."""
+        settings.BOOKING_ASSIGNMENT_POLICY = "fewest_gaps"
+        ann, bea, cat = stylists
+        book(bea, day, 10, service)
+        book(bea, day, 12, service)
+        book(cat, day, 10, service)
+
+        # Bea's 11:00 fills the hole between two bookings
+        assert assign_at(day, 11, service).staff == bea
+
+
+@pytest.mark.django_db
+class TestFallback:
+    """Falling back when a candidate is taken concurrently."""
+
+    def test_next_candidate_when_taken(self, stylists, service, day, monkeypatch):
+        """Test that a stylist booked since the listing is skipped."""
+        ann, bea, cat = stylists
+        stale = StoredSlotBackend().slots_at(Staff.objects.all(), local(day, 9), service)
+        monkeypatch.setattr(StoredSlotBackend, "slots_at", lambda *args: list(stale))
+        book(ann, day, 9, service)
+
+        booking = assign_at(day, 9, service)
+
+        assert booking.staff == bea
+        assert Booking.objects.filter(staff=ann).count() == 1
+
+    def test_all_taken(self, stylists, service, day):
+        """Test that SlotUnavailableError is raised when nobody is free."""
+        for staff in stylists:
+            book(staff, day, 9, service)
+
+        with pytest.raises(SlotUnavailableError):
+            assign_at(day, 9, service)
+
+        assert Booking.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestGuestStep4AnyStaff:
+    """Guest booking with "Any available" staff."""
+
+    def test_assigns_at_commit(self, client, stylists, service, day, mailoutbox):
+        """Test that the stylist is picked by policy, not by the listed slot."""
+        ann, bea, cat = stylists
+        book(ann, day, 9, service)
+        listed = TimeSlot.objects.get(staff=ann, start_time=local(day, 11))
+        session = client.session
+        session["guest_booking_service_id"] = service.id
+        session["guest_booking_any_staff"] = True
+        session["guest_booking_slot_id"] = listed.id
+        session.save()
+
+        page = client.get("/booking/book/step4/")
+        response = client.post("/booking/book/step4/", {"email": "guest@example.com"})
+
+        assert b"Any available" in page.content
+        assert response.status_code == 302
+        booking = Booking.objects.get(guest_email="guest@example.com")
+        assert booking.staff == bea
+        assert booking.start_time == local(day, 11)
+
+
+@pytest.mark.django_db
+class TestRegisteredStep4:
+    """Registered booking, where the stylist is always chosen."""
+
+    def test_renders_and_books(self, client, customer, stylists, service, day):
+        """Test that the confirm page renders and books the chosen stylist."""
+        ann = stylists[0]
+        slot = TimeSlot.objects.get(staff=ann, start_time=local(day, 10))
+        client.force_login(customer)
+        session = client.session
+        session["booking_service_id"] = service.id
+        session["booking_staff_id"] = ann.id
+        session["booking_slot_id"] = slot.id
+        session.save()
+
+        page = client.get("/booking/new/step4/")
+        response = client.post("/booking/new/step4/", {"notes": "Hi"})
+
+        assert page.status_code == 200
+        assert b"Any available" not in page.content
+        assert response.status_code == 302
+        booking = Booking.objects.get(customer=customer)
+        assert booking.staff == ann
+        assert booking.start_time == local(day, 10)
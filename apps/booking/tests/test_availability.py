@@ -0,0 +1,229 @@
+"""Tests for the availability engine."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.admin import SlotWindowFilter, TimeSlotAdmin
+from apps.booking.availability import available_slots, group_slots_by_date
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+
+
+@pytest.fixture
+def service(db):
+    """Create a bookable service."""
+    return Service.objects.create(
+        name="Haircut",
+        description="Test",
+        duration=45,
+        price=Decimal("50.00"),
+    )
+
+
+def create_staff_with_slots(service, name, count):
+    """Create a staff member with hourly slots starting tomorrow."""
+    staff = Staff.objects.create(first_name=name, last_name="Stylist")
+    staff.services.add(service)
+    start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    slots = [
+        TimeSlot.objects.create(
+            staff=staff,
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i + 1),
+        )
+        for i in range(count)
+    ]
+    return staff, slots
+
+
+@pytest.mark.django_db
+class TestAvailableSlots:
+    """Tests for available_slots."""
+
+    def test_excludes_blocked_past_and_full_slots(self, service, customer):
+        """Test that only bookable slots are returned."""
+        staff, slots = create_staff_with_slots(service, "John", 4)
+        slots[0].is_blocked = True
+        slots[0].save()
+        Booking.objects.create(
+            customer=customer,
+            service=service,
+            staff=staff,
+            time_slot=slots[1],
+            start_time=slots[1].start_time,
+        )
+        past = timezone.now() - timedelta(hours=2)
+        TimeSlot.objects.create(staff=staff, start_time=past, end_time=past + timedelta(hours=1))
+
+        today = timezone.now().date()
+        result = list(available_slots(staff, today - timedelta(days=1), today + timedelta(days=3)))
+
+        assert result == slots[2:]
+
+    def test_canceled_bookings_free_capacity(self, service, customer):
+        """Test that canceled bookings do not consume capacity."""
+        staff, slots = create_staff_with_slots(service, "John", 1)
+        Booking.objects.create(
+            customer=customer,
+            service=service,
+            staff=staff,
+            time_slot=slots[0],
+            start_time=slots[0].start_time,
+            status="canceled",
+        )
+
+        today = timezone.now().date()
+        assert list(available_slots(staff, today, today + timedelta(days=3))) == slots
+
+    def test_no_staff(self, django_assert_num_queries):
+        """Test that no staff selection returns no slots without querying."""
+        today = timezone.now().date()
+        with django_assert_num_queries(0):
+            assert list(available_slots(None, today, today + timedelta(days=3))) == []
+
+    def test_single_query_for_staff_set(self, service, django_assert_num_queries):
+        """Test that a whole staff set is resolved in one query."""
+        for name in ["Ann", "Bea", "Cat"]:
+            create_staff_with_slots(service, name, 10)
+
+        today = timezone.now().date()
+        with django_assert_num_queries(1):
+            slots = list(
+                available_slots(
+                    Staff.objects.filter(services=service), today, today + timedelta(days=3)
+                )
+            )
+            assert all(slot.is_available() for slot in slots)
+            grouped = group_slots_by_date(slots)
+
+        assert sum(len(day) for day in grouped.values()) == 30
+
+
+@pytest.mark.django_db
+class TestInWindow:
+    """Tests for TimeSlot.objects.in_window."""
+
+    def test_half_open_local_day_bounds(self, service):
+        """Test that local days map to [midnight, next midnight) in the given zone."""
+        tz = dt_timezone(timedelta(hours=-5))
+        staff = Staff.objects.create(first_name="John", last_name="Doe")
+        starts = [
+            datetime(2030, 3, 9, 23, 59, tzinfo=tz),
+            datetime(2030, 3, 10, 0, 0, tzinfo=tz),
+            datetime(2030, 3, 11, 23, 30, tzinfo=tz),
+            datetime(2030, 3, 12, 0, 0, tzinfo=tz),
+        ]
+        slots = [
+            TimeSlot.objects.create(
+                staff=staff, start_time=start, end_time=start + timedelta(minutes=30)
+            )
+            for start in starts
+        ]
+
+        window = TimeSlot.objects.in_window(date(2030, 3, 10), date(2030, 3, 11), tz)
+
+        assert list(window) == slots[1:3]
+        assert "cast" not in str(window.query).lower()
+
+    def test_open_ended(self, service):
+        """Test that either bound may be omitted."""
+        staff, slots = create_staff_with_slots(service, "John", 3)
+        first_day = timezone.localdate(slots[0].start_time)
+
+        assert list(TimeSlot.objects.in_window(first_day, None)) == slots
+        assert list(TimeSlot.objects.in_window(None, first_day - timedelta(days=1))) == []
+
+    def test_api_date_range(self, api_client, service):
+        """Test the time slot API start_date/end_date filters."""
+        staff, slots = create_staff_with_slots(service, "John", 3)
+        day = timezone.localdate(slots[0].start_time).isoformat()
+
+        response = api_client.get(f"/api/v1/time-slots/?start_date={day}&end_date={day}&page=1")
+        assert response.status_code == 200
+        assert response.data["count"] == sum(
+            1 for slot in slots if timezone.localdate(slot.start_time).isoformat() == day
+        )
+
+        response = api_client.get("/api/v1/time-slots/?start_date=2030-02-30")
+        assert response.status_code == 400
+
+    def test_admin_window_filter(self, service, admin_customer):
+        """Test the admin upcoming window filter."""
+        staff, slots = create_staff_with_slots(service, "John", 2)
+        far = timezone.now() + timedelta(days=30)
+        TimeSlot.objects.create(staff=staff, start_time=far, end_time=far + timedelta(hours=1))
+        request = RequestFactory().get("/", {"window": "14d"})
+        request.user = admin_customer
+        model_admin = TimeSlotAdmin(TimeSlot, AdminSite())
+
+        window_filter = SlotWindowFilter(request, {"window": "14d"}, TimeSlot, model_admin)
+        queryset = window_filter.queryset(request, TimeSlot.objects.order_by("start_time"))
+
+        assert list(queryset) == slots
+
+
+@pytest.mark.django_db
+class TestAvailabilityQueryCount:
+    """Query counts for availability listings must not grow with slot count."""
+
+    def test_guest_step3_any_staff(self, client, service, django_assert_max_num_queries):
+        """Test guest time selection with any available staff."""
+        for name in ["Ann", "Bea", "Cat", "Dee"]:
+            create_staff_with_slots(service, name, 12)
+
+        session = client.session
+        session["guest_booking_service_id"] = service.id
+        session["guest_booking_any_staff"] = True
+        session.save()
+
+        with django_assert_max_num_queries(6):
+            response = client.get("/booking/book/step3/")
+
+        assert response.status_code == 200
+        assert sum(len(day) for day in response.context["slots_by_date"].values()) == 12
+
+    def test_guest_step3_without_staff(self, client, service):
+        """Test guest time selection when no staff has been chosen."""
+        session = client.session
+        session["guest_booking_service_id"] = service.id
+        session.save()
+
+        response = client.get("/booking/book/step3/")
+
+        assert response.status_code == 200
+        assert response.context["slots_by_date"] == {}
+
+    def test_api_available_slots(self, api_client, service, django_assert_max_num_queries):
+        """Test the staff available_slots API action."""
+        staff, _ = create_staff_with_slots(service, "John", 24)
+
+        with django_assert_max_num_queries(3):
+            response = api_client.get(f"/api/v1/staff/{staff.slug}/available_slots/")
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 20
+        assert all(slot["is_available"] for slot in response.data["results"])
+
+        with django_assert_max_num_queries(3):
+            response = api_client.get(response.data["next"])
+
+        assert len(response.data["results"]) == 4
+
+    def test_api_time_slots(self, api_client, service, django_assert_max_num_queries):
+        """Test the time slot list API."""
+        create_staff_with_slots(service, "John", 15)
+        create_staff_with_slots(service, "Jane", 15)
+
+        with django_assert_max_num_queries(3):
+            response = api_client.get("/api/v1/time-slots/?page=1")
+
+        assert response.status_code == 200
+        assert response.data["count"] == 30
@@ -0,0 +1,272 @@
+"""Tests for the cached availability bitmaps."""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.utils import timezone
+
+import pytest
+
+from apps.booking import bitmaps
+from apps.booking.availability import available_slots
+from apps.booking.bitmaps import cached_available_slots
+from apps.booking.models import OpeningHour, Service, Staff, TimeSlot
+from apps.booking.reservations import reserve_slot, reserve_time
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Use a real in-memory cache so bitmaps survive between reads."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "availability-bitmaps",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def day():
+    """Return tomorrow's local date."""
+    return timezone.localdate() + timedelta(days=1)
+
+
+@pytest.fixture
+def services(db):
+    """Create a one-hour and a two-hour service."""
+    return {
+        "haircut": Service.objects.create(
+            name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+        ),
+        "coloring": Service.objects.create(
+            name="Hair Coloring", description="Test", duration=120, price=Decimal("120.00")
+        ),
+    }
+
+
+@pytest.fixture
+def staff(services):
+    """Create a staff member providing both services."""
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    staff.services.add(*services.values())
+    return staff
+
+
+def local(day, hour):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def hours(slots):
+    """Return the local start hours of slots."""
+    return [timezone.localtime(slot.start_time).hour for slot in slots]
+
+
+def create_hourly_slots(staff, day):
+    """Create hourly slots from 9:00 to 17:00."""
+    return {
+        hour: TimeSlot.objects.create(
+            staff=staff, start_time=local(day, hour), end_time=local(day, hour + 1)
+        )
+        for hour in range(9, 17)
+    }
+
+
+@pytest.mark.unit
+class TestQuantumMasks:
+    """Quantum arithmetic on a single day."""
+
+    def test_busy_mask_covers_touched_quanta(self, day):
+        """Test that busy time rounds outwards to whole quanta."""
+        start = local(day, 9) + timedelta(minutes=10)
+        mask = bitmaps._mask(day, start, start + timedelta(minutes=10), inner=False)
+
+        assert mask == 0b11 << 36
+
+    def test_free_mask_covers_inner_quanta(self, day):
+        """Test that free time rounds inwards to whole quanta."""
+        start = local(day, 9) + timedelta(minutes=10)
+        mask = bitmaps._mask(day, start, start + timedelta(minutes=35), inner=True)
+
+        assert mask == 0b11 << 37
+
+    def test_mask_is_clipped_to_the_day(self, day):
+        """Test that an interval past midnight only fills the rest of the day."""
+        mask = bitmaps._mask(day, local(day, 23), local(day, 23) + timedelta(hours=3), inner=True)
+
+        assert mask == 0b1111 << 92
+
+
+@pytest.mark.django_db
+class TestStoredBitmaps:
+    """Bitmaps over stored TimeSlot rows."""
+
+    def test_matches_available_slots(self, staff, services, day):
+        """Test that cached reads agree with the database listing."""
+        slots = create_hourly_slots(staff, day)
+        reserve_slot(slots[11].id, service=services["haircut"], guest_email="a@example.com")
+        reserve_slot(slots[13].id, service=services["coloring"], guest_email="b@example.com")
+
+        for service in (services["haircut"], services["coloring"]):
+            cached = cached_available_slots(staff, day, day, service)
+            expected = available_slots(staff, day, day, service)
+            assert [slot.id for slot in cached] == [slot.id for slot in expected]
+
+        # Without a service the slot the coloring overflows into is not offered either
+        assert hours(cached_available_slots(staff, day, day)) == [9, 10, 12, 15, 16]
+
+    def test_cache_hit_needs_no_queries(self, staff, services, day, django_assert_num_queries):
+        """Test that a warm read is served entirely from the cache."""
+        create_hourly_slots(staff, day)
+        cached_available_slots(staff, day, day, services["haircut"])
+
+        with django_assert_num_queries(0):
+            slots = cached_available_slots(staff, day, day, services["coloring"])
+
+        assert hours(slots) == [9, 10, 11, 12, 13, 14, 15]
+
+    def test_booking_updates_bits_in_place(
+        self,
+        staff,
+        services,
+        day,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test that a new booking clears its quanta without a rebuild."""
+        slots = create_hourly_slots(staff, day)
+        cached_available_slots(staff, day, day)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking = reserve_slot(
+                slots[11].id, service=services["coloring"], guest_email="a@example.com"
+            )
+
+        with django_assert_num_queries(0):
+            assert hours(cached_available_slots(staff, day, day)) == [9, 10, 13, 14, 15, 16]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.cancel()
+
+        with django_assert_num_queries(0):
+            assert len(cached_available_slots(staff, day, day)) == 8
+
+    def test_blocking_a_slot_removes_it(
+        self, staff, day, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """Test that blocking a slot is recorded in the cached bitmap."""
+        slots = create_hourly_slots(staff, day)
+        cached_available_slots(staff, day, day)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            slots[12].is_blocked = True
+            slots[12].save()
+
+        with django_assert_num_queries(0):
+            assert 12 not in hours(cached_available_slots(staff, day, day))
+
+    def test_new_slots_invalidate_the_day(self, staff, day, django_capture_on_commit_callbacks):
+        """Test that adding a slot drops the cached day."""
+        create_hourly_slots(staff, day)
+        cached_available_slots(staff, day, day)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TimeSlot.objects.create(staff=staff, start_time=local(day, 17), end_time=local(day, 18))
+
+        assert 17 in hours(cached_available_slots(staff, day, day))
+
+    def test_booking_during_rebuild_is_not_lost(
+        self, staff, services, day, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test that a rebuild racing a booking is not cached over it."""
+        slots = create_hourly_slots(staff, day)
+        build_bitmaps = bitmaps.build_bitmaps
+
+        def build_then_book(*args):
+            built = build_bitmaps(*args)
+            with django_capture_on_commit_callbacks(execute=True):
+                reserve_slot(slots[11].id, service=services["haircut"], guest_email="a@x.com")
+            return built
+
+        monkeypatch.setattr(bitmaps, "build_bitmaps", build_then_book)
+        assert 11 in hours(cached_available_slots(staff, day, day))
+        monkeypatch.setattr(bitmaps, "build_bitmaps", build_bitmaps)
+
+        assert 11 not in hours(cached_available_slots(staff, day, day))
+
+    def test_new_slot_during_rebuild_is_not_lost(
+        self, staff, day, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test that a rebuild racing an invalidation is not cached over it."""
+        create_hourly_slots(staff, day)
+        build_bitmaps = bitmaps.build_bitmaps
+
+        def build_then_add(*args):
+            built = build_bitmaps(*args)
+            with django_capture_on_commit_callbacks(execute=True):
+                TimeSlot.objects.create(
+                    staff=staff, start_time=local(day, 17), end_time=local(day, 18)
+                )
+            return built
+
+        monkeypatch.setattr(bitmaps, "build_bitmaps", build_then_add)
+        cached_available_slots(staff, day, day)
+        monkeypatch.setattr(bitmaps, "build_bitmaps", build_bitmaps)
+
+        assert 17 in hours(cached_available_slots(staff, day, day))
+
+    def test_invalidate_all(self, staff, day, django_assert_num_queries):
+        """Test that bumping the generation forces a rebuild."""
+        create_hourly_slots(staff, day)
+        cached_available_slots(staff, day, day)
+
+        bitmaps.invalidate_all()
+
+        with django_assert_num_queries(1):
+            cached_available_slots(staff, day, day)
+
+
+@pytest.mark.django_db
+class TestComputedBitmaps:
+    """Bitmaps over computed availability."""
+
+    @pytest.fixture(autouse=True)
+    def computed(self, settings, day):
+        """Switch to computed availability with hourly slots from 9:00 to 17:00."""
+        settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+        settings.BOOKING_SLOT_MINUTES = 60
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(17))
+
+    def test_matches_available_slots(self, staff, services, day):
+        """Test that cached reads agree with the computed listing."""
+        reserve_time(staff, local(day, 11), service=services["haircut"], guest_email="a@x.com")
+
+        for service in (None, services["haircut"], services["coloring"]):
+            cached = cached_available_slots(staff, day, day, service)
+            expected = available_slots(staff, day, day, service)
+            assert [(slot.id, slot.end_time) for slot in cached] == [
+                (slot.id, slot.end_time) for slot in expected
+            ]
+
+    def test_booking_updates_bits_in_place(
+        self,
+        staff,
+        services,
+        day,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test that a computed booking clears its quanta without a rebuild."""
+        cached_available_slots(staff, day, day)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserve_time(staff, local(day, 14), service=services["coloring"], guest_email="a@x.com")
+
+        with django_assert_num_queries(0):
+            assert hours(cached_available_slots(staff, day, day)) == [9, 10, 11, 12, 13, 16]
@@ -0,0 +1,196 @@
+"""Tests for the computed (virtual slot) availability backend."""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.availability import (
+    ComputedSlotBackend,
+    StoredSlotBackend,
+    available_slots,
+    get_availability_backend,
+    get_slot,
+)
+from apps.booking.models import Booking, OpeningHour, Service, Staff, StaffWorkingHour, TimeSlot
+from apps.booking.reservations import SlotUnavailableError, reserve_time
+
+
+@pytest.fixture
+def computed(settings):
+    """Switch to computed availability with hourly slots."""
+    settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+    settings.BOOKING_SLOT_MINUTES = 60
+
+
+@pytest.fixture
+def day(db):
+    """Open the salon 9:00-17:00 every day and return tomorrow's local date."""
+    for weekday in range(7):
+        OpeningHour.objects.create(weekday=weekday, start_time=time(9), end_time=time(17))
+    return timezone.localdate() + timedelta(days=1)
+
+
+@pytest.fixture
+def service(db):
+    """Create a one-hour service."""
+    return Service.objects.create(
+        name="Haircut",
+        description="Test",
+        duration=60,
+        price=Decimal("50.00"),
+    )
+
+
+def create_staff(service, name="John"):
+    """Create a staff member providing the service."""
+    staff = Staff.objects.create(first_name=name, last_name="Stylist")
+    staff.services.add(service)
+    return staff
+
+
+def local(day, hour):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def hours(slots):
+    """Return the local start hours of slots."""
+    return [timezone.localtime(slot.start_time).hour for slot in slots]
+
+
+@pytest.mark.django_db
+class TestComputedAvailability:
+    """Tests for ComputedSlotBackend."""
+
+    def test_backend_selected_by_setting(self, settings, computed):
+        """Test that the setting picks the backend."""
+        assert isinstance(get_availability_backend(), ComputedSlotBackend)
+        settings.BOOKING_AVAILABILITY_BACKEND = "stored"
+        assert isinstance(get_availability_backend(), StoredSlotBackend)
+
+    def test_subtracts_bookings_and_blocks(self, computed, day, service, customer):
+        """Test that free slots exclude active bookings and explicit blocks."""
+        staff = create_staff(service)
+        Booking.objects.create(
+            customer=customer, service=service, staff=staff, start_time=local(day, 10)
+        )
+        Booking.objects.create(
+            customer=customer,
+            service=service,
+            staff=staff,
+            start_time=local(day, 11),
+            status="canceled",
+        )
+        TimeSlot.objects.create(
+            staff=staff, start_time=local(day, 13), end_time=local(day, 14), is_blocked=True
+        )
+
+        slots = available_slots(staff, day, day)
+
+        assert hours(slots) == [9, 11, 12, 14, 15, 16]
+        assert TimeSlot.objects.count() == 1
+
+    def test_working_hours_narrow_opening_hours(self, computed, day, service):
+        """Test that a staff working pattern limits their slots."""
+        staff = create_staff(service)
+        StaffWorkingHour.objects.create(
+            staff=staff, weekday=day.weekday(), start_time=time(8), end_time=time(11)
+        )
+        StaffWorkingHour.objects.create(
+            staff=staff, weekday=day.weekday(), start_time=time(15), end_time=time(20)
+        )
+
+        assert hours(available_slots(staff, day, day)) == [9, 10, 15, 16]
+
+    def test_fixed_query_count(self, computed, day, service, django_assert_num_queries):
+        """Test that the number of queries does not grow with staff or days."""
+        for name in ["Ann", "Bea", "Cat", "Dee"]:
+            create_staff(service, name)
+
+        with django_assert_num_queries(5):
+            slots = available_slots(Staff.objects.all(), day, day + timedelta(days=6))
+
+        assert len(slots) == 4 * 7 * 8
+
+    def test_slot_token_round_trip(self, computed, day, service):
+        """Test that a listed slot can be found again by its id."""
+        staff = create_staff(service)
+        slot = available_slots(staff, day, day)[0]
+
+        found = get_slot(slot.id)
+
+        assert found == slot
+        assert get_slot("not-a-token") is None
+        assert get_slot(f"{staff.pk + 1}-{int(slot.start_time.timestamp())}") is None
+
+
+@pytest.mark.django_db
+class TestReserveTime:
+    """Tests for reserve_time."""
+
+    def test_books_without_slot_row(self, computed, day, service):
+        """Test that a booking stores only its interval."""
+        staff = create_staff(service)
+
+        booking = reserve_time(staff, local(day, 9), service=service, guest_email="a@example.com")
+
+        assert booking.time_slot is None
+        assert booking.end_time == local(day, 10)
+        assert 9 not in hours(available_slots(staff, day, day))
+
+    def test_rejects_busy_and_closed_time(self, computed, day, service):
+        """Test that overlapping and out-of-hours times are refused."""
+        staff = create_staff(service)
+        reserve_time(staff, local(day, 9), service=service, guest_email="a@example.com")
+
+        for start in [local(day, 9), local(day, 17), local(day, 8)]:
+            with pytest.raises(SlotUnavailableError):
+                reserve_time(staff, start, service=service, guest_email="b@example.com")
+
+        assert Booking.objects.count() == 1
+
+    def test_guest_flow(self, computed, day, service, client, mailoutbox):
+        """Test booking a computed slot through the guest flow."""
+        staff = create_staff(service)
+        slot = available_slots(staff, day, day)[0]
+        session = client.session
+        session["guest_booking_service_id"] = service.id
+        session["guest_booking_staff_id"] = staff.id
+        session["guest_booking_slot_id"] = slot.id
+        session.save()
+
+        response = client.post("/booking/book/step4/", {"email": "guest@example.com"})
+
+        booking = Booking.objects.get()
+        assert response.status_code == 302
+        assert booking.start_time == slot.start_time
+        assert booking.time_slot is None
+        assert booking.status == "confirmed"
+
+    def test_api_books_by_start_time(self, computed, day, service, authenticated_client):
+        """Test booking through the API by start time."""
+        staff = create_staff(service)
+        payload = {"service": service.id, "staff": staff.id, "start_time": local(day, 9)}
+
+        response = authenticated_client.post("/api/v1/bookings/", payload, format="json")
+        assert response.status_code == 201
+
+        response = authenticated_client.post("/api/v1/bookings/", payload, format="json")
+        assert response.status_code == 400
+        assert Booking.objects.count() == 1
+
+    def test_api_available_slots(self, computed, day, service, api_client):
+        """Test the staff available_slots API action with computed slots."""
+        staff = create_staff(service)
+
+        response = api_client.get(f"/api/v1/staff/{staff.slug}/available_slots/?days=1")
+
+        assert response.status_code == 200
+        ids = [slot["id"] for slot in response.data["results"]]
+        assert f"{staff.pk}-{int(local(day, 9).timestamp())}" in ids
+        assert all(slot["is_available"] for slot in response.data["results"])
@@ -0,0 +1,252 @@
+"""Tests for notification retries, attempt records and dead letters."""
+
+from __future__ import annotations
+
+import smtplib
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.admin.sites import site
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.utils import timezone
+
+import pytest
+
+from apps.booking import notifications
+from apps.booking.models import (
+    Booking,
+    NotificationAttempt,
+    NotificationDeadLetter,
+    NotificationOutbox,
+    Service,
+    Staff,
+)
+from apps.booking.outbox import process_outbox, retry_delay
+from apps.core.adapters import DeliveryResult
+from apps.core.adapters.email import DjangoEmailAdapter
+
+
+@pytest.fixture
+def booking(db):
+    """Create a confirmed guest booking with a phone number."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    return Booking.objects.create(
+        service=service,
+        staff=staff,
+        start_time=timezone.now() + timedelta(days=1),
+        status="confirmed",
+        guest_email="guest@example.com",
+        guest_phone="+15550001234",
+    )
+
+
+@pytest.fixture
+def command_dispatch(settings):
+    """Leave queued notifications for the drain."""
+    settings.NOTIFICATION_DISPATCH = "command"
+
+
+@pytest.fixture
+def failing(monkeypatch):
+    """Make email and SMS fail with a chosen exception."""
+
+    def fail(exc: Exception) -> None:
+        monkeypatch.setattr(
+            DjangoEmailAdapter,
+            "deliver_many",
+            lambda self, messages: [DeliveryResult.failure(exc) for _ in messages],
+        )
+        monkeypatch.setattr(
+            "apps.core.adapters.sms.ConsoleSMSAdapter.deliver_sms",
+            lambda self, to, message: DeliveryResult.failure(exc),
+        )
+
+    return fail
+
+
+def make_due(entry: NotificationOutbox) -> None:
+    """Make a pending row due again."""
+    NotificationOutbox.objects.filter(pk=entry.pk).update(available_at=timezone.now())
+
+
+@pytest.mark.unit
+class TestRetryDelay:
+    """Exponential backoff with jitter."""
+
+    def test_doubles_with_jitter(self, settings):
+        """Test that each delay lies between half and all of the doubled base."""
+        settings.NOTIFICATION_RETRY_SECONDS = 60
+        settings.NOTIFICATION_RETRY_MAX_SECONDS = 10_000
+
+        for attempts, full in [(1, 60), (2, 120), (3, 240), (4, 480)]:
+            delays = {retry_delay(attempts).total_seconds() for _ in range(20)}
+            assert all(full / 2 <= delay <= full for delay in delays)
+            assert len(delays) > 1
+
+    def test_capped(self, settings):
+        """Test that the delay never exceeds the maximum."""
+        settings.NOTIFICATION_RETRY_SECONDS = 60
+        settings.NOTIFICATION_RETRY_MAX_SECONDS = 600
+
+        assert retry_delay(30) <= timedelta(seconds=600)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("command_dispatch")
+class TestDeliveryAttempts:
+    """Every channel's attempt is recorded."""
+
+    def test_successful_attempt(self, booking):
+        """Test a sent email and SMS."""
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox() == 1
+
+        assert list(entry.delivery_attempts.values_list("attempt", "channel", "status")) == [
+            (1, "email", "sent"),
+            (1, "sms", "sent"),
+        ]
+
+    def test_transient_failure_is_retried_with_backoff(self, settings, booking, failing):
+        """Test that a transient failure is recorded and retried later."""
+        settings.NOTIFICATION_RETRY_SECONDS = 60
+        failing(smtplib.SMTPServerDisconnected("Connection unexpectedly closed"))
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        before = timezone.now()
+        assert process_outbox() == 0
+
+        entry.refresh_from_db()
+        assert entry.status == "pending"
+        assert before + timedelta(seconds=30) <= entry.available_at
+        assert entry.available_at <= timezone.now() + timedelta(seconds=60)
+        assert "SMTPServerDisconnected" in entry.last_error
+        assert set(entry.delivery_attempts.values_list("status", "error_class")) == {
+            ("transient", "SMTPServerDisconnected")
+        }
+        assert not NotificationDeadLetter.objects.exists()
+
+    def test_exhausted_retries_are_dead_lettered(self, settings, booking, failing):
+        """Test that the last failed attempt parks the notification."""
+        settings.NOTIFICATION_MAX_ATTEMPTS = 2
+        failing(TimeoutError("timed out"))
+        entry = NotificationOutbox.objects.create(booking=booking, kind="reminder")
+
+        process_outbox()
+        make_due(entry)
+        process_outbox()
+
+        entry.refresh_from_db()
+        letter = entry.dead_letter
+        assert (entry.status, entry.attempts) == ("failed", 2)
+        assert (letter.attempts, letter.error_class, letter.permanent) == (
+            2,
+            "TimeoutError",
+            False,
+        )
+        assert entry.delivery_attempts.count() == 4
+
+    def test_permanent_failure_is_dead_lettered_at_once(self, booking, failing):
+        """Test that a permanent failure is not retried."""
+        failing(smtplib.SMTPRecipientsRefused({"guest@example.com": (550, b"No such user")}))
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        process_outbox()
+
+        entry.refresh_from_db()
+        assert (entry.status, entry.attempts) == ("failed", 1)
+        assert entry.dead_letter.permanent
+
+    def test_broken_template_is_dead_lettered(self, booking, monkeypatch):
+        """Test that a rendering error parks the notification instead of failing the batch."""
+        monkeypatch.setitem(notifications.EMAILS, "reminder", ("Reminder", "missing_template"))
+        broken = NotificationOutbox.objects.create(booking=booking, kind="reminder")
+        NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox() == 1
+
+        broken.refresh_from_db()
+        assert broken.dead_letter.error_class == "TemplateDoesNotExist"
+
+
+@pytest.mark.django_db
+class TestRequeue:
+    """Dead letters can be sent again."""
+
+    @pytest.fixture
+    def letter(self, booking, failing, settings):
+        """Dead-letter a confirmation, then let sending succeed again."""
+        settings.NOTIFICATION_DISPATCH = "command"
+        failing(smtplib.SMTPRecipientsRefused({"guest@example.com": (550, b"No such user")}))
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+        process_outbox()
+        return NotificationDeadLetter.objects.get(notification=entry)
+
+    def test_requeue(
+        self, letter, monkeypatch, settings, mailoutbox, django_capture_on_commit_callbacks
+    ):
+        """Test that a requeued notification is reset and sent after commit."""
+        monkeypatch.undo()
+        settings.NOTIFICATION_DISPATCH = "sync"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert NotificationDeadLetter.objects.filter(pk=letter.pk).requeue() == 1
+
+        entry = NotificationOutbox.objects.get(pk=letter.notification_id)
+        assert entry.status == "sent"
+        assert entry.attempts == 1
+        assert not NotificationDeadLetter.objects.exists()
+        assert len(mailoutbox) == 1
+        # The failed attempt stays on record
+        assert entry.delivery_attempts.filter(status="permanent").exists()
+
+    def test_admin_action(self, letter, rf, admin_user, django_capture_on_commit_callbacks):
+        """Test the requeue admin action."""
+        request = rf.post("/")
+        request.user = admin_user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            site._registry[NotificationDeadLetter].requeue_notifications(
+                request, NotificationDeadLetter.objects.all()
+            )
+
+        entry = NotificationOutbox.objects.get(pk=letter.notification_id)
+        assert (entry.status, entry.attempts) == ("pending", 0)
+        assert len(callbacks) == 1
+        assert [m.message for m in request._messages] == ["1 notification(s) requeued."]
+
+
+@pytest.mark.django_db
+class TestSendReminder:
+    """Booking.send_reminder no longer loses failed reminders."""
+
+    def test_queues_once(self, booking, django_capture_on_commit_callbacks):
+        """Test that the reminder is queued in the outbox and only once."""
+        with django_capture_on_commit_callbacks():
+            assert booking.send_reminder()
+            assert not booking.send_reminder()
+
+        booking.refresh_from_db()
+        assert booking.reminder_sent
+        assert list(NotificationOutbox.objects.values_list("kind", "status")) == [
+            ("reminder", "pending")
+        ]
+
+    def test_failed_send_is_kept_for_retry(
+        self, settings, booking, failing, django_capture_on_commit_callbacks
+    ):
+        """Test that a failed reminder stays pending in the outbox."""
+        settings.NOTIFICATION_DISPATCH = "sync"
+        failing(TimeoutError("timed out"))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.send_reminder()
+
+        entry = NotificationOutbox.objects.get()
+        assert (entry.kind, entry.status, entry.attempts) == ("reminder", "pending", 1)
+        assert NotificationAttempt.objects.filter(notification=entry).count() == 2
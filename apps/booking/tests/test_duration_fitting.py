@@ -0,0 +1,140 @@
+"""Tests for duration-aware slot fitting."""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.availability import available_slots
+from apps.booking.models import Booking, OpeningHour, Service, Staff, TimeSlot
+from apps.booking.reservations import SlotUnavailableError, reserve_slot, reserve_time
+
+
+@pytest.fixture
+def day():
+    """Return tomorrow's local date."""
+    return timezone.localdate() + timedelta(days=1)
+
+
+@pytest.fixture
+def services(db):
+    """Create a one-hour and a two-hour service."""
+    return {
+        "haircut": Service.objects.create(
+            name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+        ),
+        "coloring": Service.objects.create(
+            name="Hair Coloring", description="Test", duration=120, price=Decimal("120.00")
+        ),
+    }
+
+
+@pytest.fixture
+def staff(services):
+    """Create a staff member providing both services."""
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    staff.services.add(*services.values())
+    return staff
+
+
+def local(day, hour):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def hours(slots):
+    """Return the local start hours of slots."""
+    return [timezone.localtime(slot.start_time).hour for slot in slots]
+
+
+def create_hourly_slots(staff, day):
+    """Create hourly slots from 9:00 to 17:00."""
+    return {
+        hour: TimeSlot.objects.create(
+            staff=staff, start_time=local(day, hour), end_time=local(day, hour + 1)
+        )
+        for hour in range(9, 17)
+    }
+
+
+@pytest.mark.django_db
+class TestStoredSlotFitting:
+    """Fitting with stored TimeSlot rows."""
+
+    def test_long_service_needs_contiguous_slots(self, staff, services, day):
+        """Test that a two-hour service is only offered where two free hours follow."""
+        slots = create_hourly_slots(staff, day)
+        reserve_slot(slots[11].id, service=services["haircut"], guest_email="a@example.com")
+
+        assert hours(available_slots(staff, day, day, services["coloring"])) == [9, 12, 13, 14, 15]
+        one_hour = hours(available_slots(staff, day, day, services["haircut"]))
+        assert one_hour == [9, 10, 12, 13, 14, 15, 16]
+
+    def test_long_booking_blocks_following_slot(self, staff, services, day):
+        """Test that a booking running past its slot takes the next slot too."""
+        slots = create_hourly_slots(staff, day)
+        reserve_slot(slots[13].id, service=services["coloring"], guest_email="a@example.com")
+
+        assert 14 not in hours(available_slots(staff, day, day, services["haircut"]))
+
+    def test_query_count(self, staff, services, day, django_assert_num_queries):
+        """Test that fitting adds a single query for the whole range."""
+        create_hourly_slots(staff, day)
+
+        with django_assert_num_queries(2):
+            slots = available_slots(staff, day, day, services["coloring"])
+
+        assert len(slots) == 7
+
+    def test_reservation_checks_duration(self, staff, services, day):
+        """Test that reserve_slot applies the same fitting rules."""
+        slots = create_hourly_slots(staff, day)
+        reserve_slot(slots[11].id, service=services["haircut"], guest_email="a@example.com")
+        reserve_slot(slots[13].id, service=services["coloring"], guest_email="b@example.com")
+
+        with pytest.raises(SlotUnavailableError):
+            reserve_slot(slots[10].id, service=services["coloring"], guest_email="c@example.com")
+        with pytest.raises(SlotUnavailableError):
+            reserve_slot(slots[14].id, service=services["haircut"], guest_email="c@example.com")
+        with pytest.raises(SlotUnavailableError):
+            reserve_slot(slots[16].id, service=services["coloring"], guest_email="c@example.com")
+
+        assert Booking.objects.count() == 2
+
+    def test_guest_step3_offers_fitting_times(self, client, staff, services, day):
+        """Test that the guest time picker only lists fitting starts."""
+        slots = create_hourly_slots(staff, day)
+        reserve_slot(slots[11].id, service=services["haircut"], guest_email="a@example.com")
+        session = client.session
+        session["guest_booking_service_id"] = services["coloring"].id
+        session["guest_booking_staff_id"] = staff.id
+        session.save()
+
+        response = client.get("/booking/book/step3/")
+
+        assert hours(response.context["slots_by_date"][day.isoformat()]) == [9, 12, 13, 14, 15]
+
+
+@pytest.mark.django_db
+class TestComputedFitting:
+    """Fitting with computed availability."""
+
+    def test_long_service_needs_contiguous_free_time(self, settings, staff, services, day):
+        """Test that computed starts leave room for the whole service."""
+        settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+        settings.BOOKING_SLOT_MINUTES = 60
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(17))
+        reserve_time(
+            staff, local(day, 11), service=services["haircut"], guest_email="a@example.com"
+        )
+
+        slots = available_slots(staff, day, day, services["coloring"])
+
+        assert hours(slots) == [9, 12, 13, 14, 15]
+        assert slots[0].end_time == local(day, 11)
+        with pytest.raises(SlotUnavailableError):
+            reserve_time(staff, local(day, 10), service=services["coloring"], guest_email="b@x.com")
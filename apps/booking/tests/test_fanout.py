@@ -0,0 +1,145 @@
+"""Tests for concurrent notification fan-out."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from apps.booking import fanout
+from apps.booking.fanout import anotify, asend_notifications, send_notifications
+from apps.booking.models import Booking, Service, Staff
+from apps.booking.notifications import RenderedNotification
+from apps.core.adapters import EmailAdapter, SMSAdapter, TemplatedEmail
+
+
+class SlowAdapters(EmailAdapter, SMSAdapter):
+    """Email and SMS adapter that takes ``delay`` seconds per message."""
+
+    def __init__(self, delay: float = 0.05, email_ok: bool = True, sms_ok: bool = True):
+        self.delay = delay
+        self.email_ok = email_ok
+        self.sms_ok = sms_ok
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.email_batches: list[int] = []
+
+    def _work(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+
+    def send_email(self, to, subject, template_name, context, from_email=None, attachments=None):
+        self._work()
+        return self.email_ok
+
+    def send_many(self, messages):
+        self.email_batches.append(len(messages))
+        return [self.send_email(message.to, message.subject, None, {}) for message in messages]
+
+    def send_sms(self, to, message):
+        self._work()
+        return self.sms_ok
+
+
+def notification(index: int = 0, phone: str | None = "+15550001234") -> RenderedNotification:
+    """Return a rendered notification with both channels."""
+    email = TemplatedEmail(
+        to=[f"guest{index}@example.com"],
+        subject="Booking Confirmation",
+        template_name="booking_confirmation",
+        context={},
+    )
+    return RenderedNotification(
+        kind="confirmation", email=email, sms=(phone, "Booked!") if phone else None
+    )
+
+
+@pytest.fixture
+def adapters(monkeypatch):
+    """Route the fan-out through one slow fake adapter."""
+    adapter = SlowAdapters()
+    monkeypatch.setattr(fanout, "get_email_adapter", lambda: adapter)
+    monkeypatch.setattr(fanout, "get_sms_adapter", lambda: adapter)
+    return adapter
+
+
+@pytest.mark.unit
+class TestFanOut:
+    """Channels and bookings are sent concurrently."""
+
+    def test_channels_overlap(self, adapters):
+        """Test that a notification's email and SMS are sent at the same time."""
+        adapters.delay = 0.2
+
+        started = time.perf_counter()
+        assert send_notifications([notification()]) == [True]
+
+        assert time.perf_counter() - started < 0.35
+        assert adapters.max_in_flight == 2
+
+    def test_batch_is_bounded_by_semaphore(self, adapters):
+        """Test that at most ``concurrency`` text messages are in flight, next to the emails."""
+        results = send_notifications([notification(i) for i in range(9)], concurrency=3)
+
+        assert results == [True] * 9
+        assert 2 < adapters.max_in_flight <= 4
+
+    def test_emails_share_one_batch(self, adapters):
+        """Test that a batch's emails go to the adapter in one call."""
+        send_notifications([notification(i, phone=None) for i in range(5)])
+
+        assert adapters.email_batches == [5]
+
+    def test_concurrency_setting(self, settings, adapters):
+        """Test that NOTIFICATION_CONCURRENCY is the default bound."""
+        settings.NOTIFICATION_CONCURRENCY = 1
+
+        send_notifications([notification(i, phone=None) for i in range(4)])
+
+        assert adapters.max_in_flight == 1
+
+    def test_sent_if_either_channel_succeeds(self, adapters):
+        """Test the per-notification outcome."""
+        adapters.email_ok = False
+
+        assert send_notifications([notification(), notification(phone=None)]) == [True, False]
+
+    def test_awaitable_from_async_code(self, adapters):
+        """Test the coroutine API used by async callers."""
+
+        async def view():
+            return await asend_notifications([notification(), notification(1)])
+
+        assert async_to_sync(view)() == [True, True]
+
+
+@pytest.mark.django_db
+class TestAnotify:
+    """Rendering and sending from async code."""
+
+    def test_anotify(self, mailoutbox):
+        """Test that an async caller can render and send a booking notification."""
+        service = Service.objects.create(
+            name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+        )
+        staff = Staff.objects.create(first_name="John", last_name="Stylist")
+        booking = Booking.objects.create(
+            service=service,
+            staff=staff,
+            start_time=timezone.now() + timedelta(days=1),
+            guest_email="guest@example.com",
+        )
+
+        assert async_to_sync(anotify)(booking, "confirmation")
+        assert [message.to for message in mailoutbox] == [["guest@example.com"]]
@@ -0,0 +1,74 @@
+"""Tests for interval arithmetic."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.booking.intervals import covers, grid_starts, intersect, normalize, subtract
+
+BASE = datetime(2030, 1, 7)
+
+
+def at(hour: float) -> datetime:
+    """Return a datetime ``hour`` hours after the base day's midnight."""
+    return BASE + timedelta(hours=hour)
+
+
+def span(start: float, end: float):
+    """Return an interval between two hour offsets."""
+    return (at(start), at(end))
+
+
+@pytest.mark.unit
+class TestIntervals:
+    """Tests for interval helpers."""
+
+    def test_normalize_merges_overlapping_and_touching(self):
+        """Test that overlapping and adjacent intervals merge and empties drop."""
+        result = normalize([span(12, 13), span(9, 10), span(10, 11), span(9.5, 10.5), span(14, 14)])
+        assert result == [span(9, 11), span(12, 13)]
+
+    def test_subtract(self):
+        """Test removing busy time from working time."""
+        working = [span(9, 12), span(13, 18)]
+        busy = [span(8, 9.5), span(10, 10.5), span(11.5, 13.5), span(17, 19)]
+
+        assert subtract(working, busy) == [
+            span(9.5, 10),
+            span(10.5, 11.5),
+            span(13.5, 17),
+        ]
+
+    def test_subtract_nothing_busy(self):
+        """Test that no busy time leaves working time unchanged."""
+        assert subtract([span(9, 17)], []) == [span(9, 17)]
+
+    def test_intersect(self):
+        """Test overlapping two interval sets."""
+        assert intersect([span(9, 18)], [span(8, 12), span(14, 20)]) == [
+            span(9, 12),
+            span(14, 18),
+        ]
+
+    def test_covers(self):
+        """Test containment in a single free interval."""
+        free = [span(9, 10), span(10.5, 12)]
+        assert covers(free, at(10.5), at(11.5))
+        assert not covers(free, at(9.5), at(10.75))
+
+    def test_grid_starts(self):
+        """Test grid candidates that fit in free time."""
+        working = [span(9, 13)]
+        free = [span(9, 10), span(10.5, 13)]
+        hour = timedelta(hours=1)
+
+        assert grid_starts(working, free, hour, hour) == [at(9), at(11), at(12)]
+        assert grid_starts(working, free, timedelta(minutes=30), hour) == [
+            at(9),
+            at(10.5),
+            at(11),
+            at(11.5),
+            at(12),
+        ]
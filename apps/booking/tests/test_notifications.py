@@ -0,0 +1,148 @@
+"""Tests for booking notification rendering."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import loader
+from django.utils import timezone
+
+import pytest
+
+from apps.booking import notifications
+from apps.booking.models import Booking, NotificationOutbox, Service, Staff
+from apps.booking.notifications import render_notification, render_timings
+from apps.booking.outbox import process_outbox
+
+
+@pytest.fixture(autouse=True)
+def fresh_renderer():
+    """Start every test with no compiled templates or timings."""
+    notifications._compiled.clear()
+    notifications.reset_render_timings()
+    yield
+    notifications._compiled.clear()
+    notifications.reset_render_timings()
+
+
+@pytest.fixture
+def booking(db):
+    """Create a guest booking with a phone number."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    start = timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+    return Booking.objects.create(
+        service=service,
+        staff=staff,
+        start_time=start + timedelta(days=1, hours=14, minutes=30),
+        guest_name="Jane Guest",
+        guest_email="jane@example.com",
+        guest_phone="+15550001234",
+    )
+
+
+def load(booking):
+    """Reload a booking with everything its notifications read."""
+    return Booking.objects.select_related("service", "staff", "customer").get(pk=booking.pk)
+
+
+@pytest.mark.django_db
+class TestRenderNotification:
+    """One context feeds every channel."""
+
+    def test_renders_email_and_sms(self, settings, booking):
+        """Test both channels for a guest booking."""
+        settings.SITE_NAME = "Test Salon"
+
+        rendered = render_notification(booking, "confirmation")
+
+        assert rendered.email.to == ["jane@example.com"]
+        assert rendered.email.subject == "Booking Confirmation"
+        assert "Hello Jane Guest" in rendered.email.text
+        assert "Test Salon" in rendered.email.text
+        assert "Jane Guest" in rendered.email.html
+        assert rendered.sms == (
+            "+15550001234",
+            f"Booking confirmed! Haircut with John Stylist on "
+            f"{timezone.localtime(booking.start_time).strftime('%b %d')} at 02:30 PM. "
+            f"Confirmation: {booking.confirmation_code}",
+        )
+
+    def test_registered_customer_without_sms_opt_in(self, booking, customer):
+        """Test that a customer who has not opted in gets no SMS."""
+        customer.phone = "+15550009999"
+        customer.sms_notifications = False
+        customer.save()
+        booking.customer = customer
+        booking.guest_phone = ""
+
+        rendered = render_notification(booking, "reminder")
+
+        assert rendered.sms is None
+        assert rendered.email.to == [customer.email]
+
+    def test_rendering_needs_no_queries(self, booking, django_assert_num_queries):
+        """Test that a booking loaded with select_related renders without queries."""
+        booking = load(booking)
+
+        with django_assert_num_queries(0):
+            render_notification(booking, "cancellation")
+
+    def test_templates_compiled_once(self, booking, monkeypatch):
+        """Test that each template is loaded once per process."""
+        loaded = []
+        get_template = loader.get_template
+        monkeypatch.setattr(
+            loader, "get_template", lambda name: loaded.append(name) or get_template(name)
+        )
+
+        for _ in range(3):
+            render_notification(booking, "confirmation")
+
+        assert sorted(loaded) == [
+            "emails/booking_confirmation.html",
+            "emails/booking_confirmation.txt",
+        ]
+
+    def test_render_timings(self, booking):
+        """Test that every render is timed per template."""
+        render_notification(booking, "reminder")
+        render_notification(booking, "reminder")
+
+        timings = render_timings()
+
+        assert set(timings) == {"emails/booking_reminder.html", "emails/booking_reminder.txt"}
+        stats = timings["emails/booking_reminder.txt"]
+        assert stats["count"] == 2
+        assert 0 < stats["max_ms"] <= stats["total_ms"]
+        assert stats["avg_ms"] == pytest.approx(stats["total_ms"] / 2)
+
+
+@pytest.mark.django_db
+class TestOutboxRendering:
+    """Outbox batches render each booking once."""
+
+    def test_duplicate_entries_render_once(self, settings, booking, mailoutbox):
+        """Test that a booking's notification is rendered once per batch."""
+        settings.NOTIFICATION_DISPATCH = "command"
+        for _ in range(3):
+            NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox() == 3
+
+        assert len(mailoutbox) == 3
+        assert render_timings()["emails/booking_confirmation.txt"]["count"] == 1
+
+    def test_command_prints_timings(self, booking):
+        """Test the --timings option of process_outbox."""
+        NotificationOutbox.objects.create(booking=booking, kind="cancellation")
+        out = StringIO()
+
+        call_command("process_outbox", "--timings", stdout=out)
+
+        assert "emails/booking_cancellation.html: 1 render(s)" in out.getvalue()
@@ -0,0 +1,231 @@
+"""Tests for the notification outbox."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+import pytest
+
+from apps.booking import tasks
+from apps.booking.models import Booking, NotificationOutbox, Service, Staff, TimeSlot
+from apps.booking.outbox import process_outbox
+from apps.core.adapters import DeliveryResult
+from apps.core.adapters.email import DjangoEmailAdapter
+
+
+@pytest.fixture
+def booking(db):
+    """Create a pending guest booking for tomorrow."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    staff.services.add(service)
+    start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    slot = TimeSlot.objects.create(
+        staff=staff, start_time=start, end_time=start + timedelta(hours=1)
+    )
+    return Booking.objects.create(
+        service=service,
+        staff=staff,
+        time_slot=slot,
+        start_time=start,
+        guest_email="guest@example.com",
+    )
+
+
+@pytest.fixture
+def command_dispatch(settings):
+    """Leave queued notifications for the drain."""
+    settings.NOTIFICATION_DISPATCH = "command"
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    """Notifications are queued with the booking change."""
+
+    def test_confirm_queues_instead_of_sending(
+        self, booking, mailoutbox, django_capture_on_commit_callbacks
+    ):
+        """Test that confirm() writes an outbox row and sends nothing itself."""
+        with django_capture_on_commit_callbacks() as callbacks:
+            booking.confirm()
+
+        assert mailoutbox == []
+        assert len(callbacks) == 1
+        entry = NotificationOutbox.objects.get()
+        assert (entry.kind, entry.status, entry.booking) == ("confirmation", "pending", booking)
+
+    def test_rolled_back_change_queues_nothing(self, booking):
+        """Test that the row rolls back with the booking change."""
+        with pytest.raises(RuntimeError), transaction.atomic():
+            booking.cancel()
+            raise RuntimeError
+
+        assert not NotificationOutbox.objects.exists()
+
+    def test_sync_dispatch_sends_after_commit(
+        self, settings, booking, mailoutbox, django_capture_on_commit_callbacks
+    ):
+        """Test in-process delivery once the change commits."""
+        settings.NOTIFICATION_DISPATCH = "sync"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.cancel()
+
+        assert [message.subject for message in mailoutbox] == ["Booking Canceled"]
+        assert NotificationOutbox.objects.get().status == "sent"
+
+    def test_celery_dispatch_queues_task(
+        self, settings, booking, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test that a task is queued for the committed notifications."""
+        settings.NOTIFICATION_DISPATCH = "celery"
+        queued = []
+        monkeypatch.setattr(
+            tasks.deliver_notifications, "apply_async", lambda args, **kwargs: queued.append(args)
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.confirm()
+
+        assert queued == [([NotificationOutbox.objects.get().pk],)]
+
+    def test_broker_failure_leaves_row_pending(
+        self, settings, booking, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test that an unreachable broker does not fail the booking."""
+        settings.NOTIFICATION_DISPATCH = "celery"
+
+        def unreachable(*args, **kwargs):
+            raise ConnectionError("broker down")
+
+        monkeypatch.setattr(tasks.deliver_notifications, "apply_async", unreachable)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.confirm()
+
+        assert NotificationOutbox.objects.get().status == "pending"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("command_dispatch")
+class TestProcessOutbox:
+    """Draining the outbox."""
+
+    def test_drains_in_batches(self, booking, mailoutbox, django_capture_on_commit_callbacks):
+        """Test that every due row is sent once, across several batches."""
+        for _ in range(5):
+            NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox(batch_size=2) == 5
+        assert process_outbox(batch_size=2) == 0
+        assert len(mailoutbox) == 5
+        assert set(NotificationOutbox.objects.values_list("status", flat=True)) == {"sent"}
+
+    def test_max_batches(self, booking):
+        """Test that a drain can be limited to a number of batches."""
+        for _ in range(5):
+            NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox(batch_size=2, max_batches=1) == 2
+        assert NotificationOutbox.objects.filter(status="pending").count() == 3
+
+    def test_failed_attempt_is_retried_later(self, settings, booking, monkeypatch):
+        """Test that a failure pushes the next attempt back, then gives up."""
+        settings.NOTIFICATION_MAX_ATTEMPTS = 2
+        monkeypatch.setattr(
+            DjangoEmailAdapter,
+            "deliver_many",
+            lambda self, messages: [DeliveryResult.failure(TimeoutError()) for _ in messages],
+        )
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox() == 0
+        entry.refresh_from_db()
+        assert (entry.status, entry.attempts) == ("pending", 1)
+        assert entry.available_at > timezone.now()
+        assert entry.last_error
+
+        NotificationOutbox.objects.filter(pk=entry.pk).update(available_at=timezone.now())
+        process_outbox()
+        entry.refresh_from_db()
+        assert (entry.status, entry.attempts) == ("failed", 2)
+
+    def test_claimed_rows_are_leased(self, booking):
+        """Test that claimed rows are not handed to another worker."""
+        NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        first = NotificationOutbox.objects.claim(10, timedelta(minutes=5))
+
+        assert len(first) == 1
+        assert NotificationOutbox.objects.claim(10, timedelta(minutes=5)) == []
+
+    def test_command(self, booking, mailoutbox):
+        """Test the process_outbox management command."""
+        NotificationOutbox.objects.create(booking=booking, kind="cancellation")
+        out = StringIO()
+
+        call_command("process_outbox", stdout=out)
+
+        assert "Sent 1 notification(s)" in out.getvalue()
+        assert len(mailoutbox) == 1
+
+    def test_batch_shares_one_connection(self, booking, mailoutbox, monkeypatch):
+        """Test that a drained batch opens one email connection."""
+        opened = []
+        original = DjangoEmailAdapter._get_connection
+
+        def tracking(adapter):
+            connection = original(adapter)
+            if connection not in opened:
+                opened.append(connection)
+            return connection
+
+        monkeypatch.setattr(DjangoEmailAdapter, "_get_connection", tracking)
+        DjangoEmailAdapter.close_connection()
+        for _ in range(3):
+            NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+
+        assert process_outbox() == 3
+        assert len(mailoutbox) == 3
+        assert len(opened) == 1
+
+    def test_reminder(self, booking, mailoutbox):
+        """Test that a queued reminder is sent with the reminder template."""
+        NotificationOutbox.objects.create(booking=booking, kind="reminder")
+
+        assert process_outbox() == 1
+        assert mailoutbox[0].subject == "Appointment Reminder"
+
+
+@pytest.mark.django_db
+class TestAdminActions:
+    """Bulk admin actions queue their notifications together."""
+
+    def test_cancel_bookings_queues_cancellations(
+        self, settings, booking, rf, admin_user, mailoutbox, django_capture_on_commit_callbacks
+    ):
+        """Test that a bulk cancel queues one row per booking and one dispatch."""
+        from django.contrib.admin.sites import site
+        from django.contrib.messages.storage.fallback import FallbackStorage
+
+        settings.NOTIFICATION_DISPATCH = "sync"
+        request = rf.post("/")
+        request.user = admin_user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            site._registry[Booking].cancel_bookings(request, Booking.objects.all())
+
+        assert list(NotificationOutbox.objects.values_list("kind", "status")) == [
+            ("cancellation", "sent")
+        ]
+        assert [message.subject for message in mailoutbox] == ["Booking Canceled"]
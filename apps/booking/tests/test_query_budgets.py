@@ -0,0 +1,149 @@
+"""
+Query budgets of list pages and endpoints.
+
+Each page is fetched while its data grows and must stay within a fixed
+number of queries, the same at every size. Raise a budget only for a
+deliberate new query, never for one per row.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from itertools import count
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.models import (
+    Booking,
+    NotificationAttempt,
+    NotificationDeadLetter,
+    NotificationOutbox,
+    Service,
+    Staff,
+    TimeSlot,
+)
+
+
+class World:
+    """A customer's bookings and the catalog around them, grown a row at a time."""
+
+    def __init__(self, customer) -> None:
+        self.customer = customer
+        self.numbers = count(1)
+        self.start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        self.service = self.staff = self.booking = None
+        self.grow()
+
+    def grow(self) -> None:
+        """Add a service, a stylist, a slot and a booking with a dead-lettered notification."""
+        number = next(self.numbers)
+        service = Service.objects.create(
+            name=f"Service {number}", description="Test", duration=60, price=Decimal("50.00")
+        )
+        staff = Staff.objects.create(first_name="Stylist", last_name=f"No{number}")
+        staff.services.add(service)
+        if self.service is None:
+            self.service, self.staff = service, staff
+        self.service.staff_members.add(staff)
+        self.staff.services.add(service)
+
+        start = self.start + timedelta(hours=number)
+        slot = TimeSlot.objects.create(
+            staff=staff, start_time=start, end_time=start + timedelta(hours=1)
+        )
+        booking = Booking.objects.create(
+            customer=self.customer, service=service, staff=staff, time_slot=slot, start_time=start
+        )
+        self.booking = self.booking or booking
+        entry = NotificationOutbox.objects.create(booking=booking, kind="confirmation")
+        NotificationAttempt.objects.create(
+            notification=entry, attempt=1, channel="email", status="permanent"
+        )
+        NotificationDeadLetter.objects.create(notification=entry, attempts=1, permanent=True)
+
+
+@pytest.fixture
+def world(customer):
+    """Create the first row of everything."""
+    return World(customer)
+
+
+@pytest.fixture
+def customer_client(client, customer):
+    """Return a test client logged in as the customer."""
+    client.force_login(customer)
+    return client
+
+
+WEB_PAGES = {
+    "services": (lambda w: reverse("services"), 3),
+    "services_detail": (lambda w: reverse("services_detail", args=[w.service.slug]), 4),
+    "staff": (lambda w: reverse("staff"), 4),
+    "staff_detail": (lambda w: reverse("staff_detail", args=[w.staff.slug]), 4),
+    "booking_step1_service": (lambda w: reverse("booking_step1_service"), 3),
+    "my_bookings": (lambda w: reverse("my_bookings"), 3),
+    "booking_success": (
+        lambda w: reverse("booking_success", args=[w.booking.confirmation_code]),
+        3,
+    ),
+    "cancel_booking": (
+        lambda w: reverse("cancel_booking", args=[w.booking.confirmation_code]),
+        3,
+    ),
+    "guest_booking_success": (
+        lambda w: reverse("guest_booking_success", args=[w.booking.confirmation_code]),
+        3,
+    ),
+}
+
+API_ENDPOINTS = {
+    "services": (lambda w: "/api/v1/services/", 6),
+    "service": (lambda w: f"/api/v1/services/{w.service.slug}/", 5),
+    "staff": (lambda w: "/api/v1/staff/", 6),
+    "staff_expanded": (lambda w: "/api/v1/staff/?expand=services", 7),
+    "staff_member": (lambda w: f"/api/v1/staff/{w.staff.slug}/", 6),
+    "available_slots": (lambda w: f"/api/v1/staff/{w.staff.slug}/available_slots/", 2),
+    "time_slots": (lambda w: "/api/v1/time-slots/", 1),
+    "time_slots_compact": (lambda w: "/api/v1/time-slots/?format=compact", 3),
+    "bookings": (lambda w: "/api/v1/bookings/", 1),
+    "bookings_numbered": (lambda w: "/api/v1/bookings/?page=1", 2),
+    "bookings_expanded": (lambda w: "/api/v1/bookings/?expand=customer,service,staff", 1),
+    "booking": (lambda w: f"/api/v1/bookings/{w.booking.pk}/", 1),
+}
+
+ADMIN_CHANGELISTS = {
+    "booking_service": 5,
+    "booking_staff": 6,
+    "booking_timeslot": 8,
+    "booking_booking": 9,
+    "booking_notificationoutbox": 5,
+    "booking_notificationdeadletter": 6,
+    "accounts_customer": 5,
+}
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Pages run a fixed number of queries however much data they show."""
+
+    @pytest.mark.parametrize("name", WEB_PAGES)
+    def test_web_pages(self, name, world, customer_client, query_budget):
+        """Test the site's pages."""
+        url, budget = WEB_PAGES[name]
+        query_budget(customer_client, url(world), budget, world.grow)
+
+    @pytest.mark.parametrize("name", API_ENDPOINTS)
+    def test_api(self, name, world, authenticated_client, query_budget):
+        """Test the API's list and detail endpoints."""
+        url, budget = API_ENDPOINTS[name]
+        query_budget(authenticated_client, url(world), budget, world.grow)
+
+    @pytest.mark.parametrize("name", ADMIN_CHANGELISTS)
+    def test_admin_changelists(self, name, world, admin_client, query_budget):
+        """Test the admin changelists."""
+        url = reverse(f"admin:{name}_changelist")
+        query_budget(admin_client, url, ADMIN_CHANGELISTS[name], world.grow)
@@ -0,0 +1,145 @@
+"""Tests for the appointment reminder dispatcher."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from apps.booking import reminders, tasks
+from apps.booking.models import Booking, NotificationOutbox, Service, Staff
+from apps.booking.reminders import due_reminders, send_due_reminders
+from apps.core.adapters import DeliveryResult
+from apps.core.adapters.email import DjangoEmailAdapter
+
+
+@pytest.fixture
+def make_booking(db):
+    """Return a factory for guest bookings starting some hours from now."""
+    service = Service.objects.create(
+        name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Stylist")
+    staff.services.add(service)
+    base = timezone.now().replace(second=0, microsecond=0)
+
+    def make(hours: float, status: str = "confirmed", **kwargs) -> Booking:
+        return Booking.objects.create(
+            service=service,
+            staff=staff,
+            start_time=base + timedelta(hours=hours),
+            status=status,
+            guest_email=f"guest{Booking.objects.count()}@example.com",
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.mark.django_db
+class TestDueReminders:
+    """Selecting bookings that need a reminder."""
+
+    def test_selects_upcoming_unreminded_bookings(self, make_booking):
+        """Test the lead window, status and reminder flag filters."""
+        soon = make_booking(2)
+        pending = make_booking(1, status="pending")
+        make_booking(30)
+        make_booking(-1)
+        make_booking(3, status="canceled")
+        make_booking(4, reminder_sent=True)
+
+        assert list(due_reminders()) == [pending, soon]
+
+    def test_lead_hours_setting(self, settings, make_booking):
+        """Test that REMINDER_LEAD_HOURS widens the window."""
+        settings.REMINDER_LEAD_HOURS = 48
+        booking = make_booking(30)
+
+        assert list(due_reminders()) == [booking]
+
+
+@pytest.mark.django_db
+class TestSendDueReminders:
+    """Sending reminders in claimed chunks."""
+
+    def test_sends_each_reminder_once(self, make_booking, mailoutbox):
+        """Test that every due booking is reminded and a second run sends nothing."""
+        for hours in range(1, 6):
+            make_booking(hours)
+
+        assert send_due_reminders(chunk_size=2) == 5
+        assert send_due_reminders(chunk_size=2) == 0
+
+        assert len(mailoutbox) == 5
+        assert {message.subject for message in mailoutbox} == {"Appointment Reminder"}
+        assert not Booking.objects.filter(reminder_sent=False).exists()
+        assert set(NotificationOutbox.objects.values_list("kind", "status", "attempts")) == {
+            ("reminder", "sent", 1)
+        }
+
+    def test_queries_per_chunk_are_constant(self, make_booking, django_assert_max_num_queries):
+        """Test that a chunk costs the same queries however many bookings it holds."""
+        for hours in range(1, 21):
+            make_booking(hours / 2)
+
+        # Stream, lock, flag, insert, then one outcome update per reminder
+        with django_assert_max_num_queries(7 + 20):
+            assert send_due_reminders(chunk_size=20) == 20
+
+    def test_rows_claimed_elsewhere_are_skipped(self, make_booking, mailoutbox, monkeypatch):
+        """Test that a booking reminded by another worker mid-run is not sent again."""
+        first, second = make_booking(1), make_booking(2)
+        claim = reminders._claim
+
+        def race(bookings):
+            # Another worker claims the second booking after this one streamed it
+            Booking.objects.filter(pk=second.pk).update(reminder_sent=True)
+            return claim(bookings)
+
+        monkeypatch.setattr(reminders, "_claim", race)
+
+        assert send_due_reminders() == 1
+        assert [message.to for message in mailoutbox] == [[first.guest_email]]
+
+    def test_failed_reminder_is_left_for_retry(self, make_booking, monkeypatch):
+        """Test that a failed send stays claimed and pending in the outbox."""
+        booking = make_booking(1)
+        monkeypatch.setattr(
+            DjangoEmailAdapter,
+            "deliver_many",
+            lambda self, messages: [DeliveryResult.failure(TimeoutError()) for _ in messages],
+        )
+
+        assert send_due_reminders() == 0
+
+        booking.refresh_from_db()
+        entry = NotificationOutbox.objects.get()
+        assert booking.reminder_sent
+        assert (entry.kind, entry.status, entry.attempts) == ("reminder", "pending", 1)
+        assert entry.available_at > timezone.now()
+
+    def test_task(self, make_booking, mailoutbox):
+        """Test the beat task."""
+        make_booking(1)
+
+        assert tasks.send_booking_reminders() == 1
+
+    def test_command(self, make_booking, mailoutbox):
+        """Test the send_reminders management command."""
+        make_booking(1)
+        make_booking(2)
+        out = StringIO()
+
+        call_command("send_reminders", "--dry-run", stdout=out)
+        assert "2 reminder(s) due" in out.getvalue()
+        assert mailoutbox == []
+
+        call_command("send_reminders", stdout=out)
+        assert "Sent 2 reminder(s)" in out.getvalue()
+        assert len(mailoutbox) == 2
@@ -0,0 +1,154 @@
+"""Tests for slot reservation."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+from apps.booking.reservations import SlotUnavailableError, reserve_slot
+
+
+def create_slot(capacity=1, **kwargs):
+    """Create a staff member, service and a future slot."""
+    service = Service.objects.create(
+        name="Haircut",
+        description="Test",
+        duration=45,
+        price=Decimal("50.00"),
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(service)
+    start = timezone.now() + kwargs.pop("offset", timedelta(days=1))
+    slot = TimeSlot.objects.create(
+        staff=staff,
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        capacity=capacity,
+        **kwargs,
+    )
+    return service, slot
+
+
+@pytest.mark.django_db
+class TestReserveSlot:
+    """Tests for reserve_slot."""
+
+    def test_reserves_capacity(self):
+        """Test that a reservation creates a booking and claims capacity."""
+        service, slot = create_slot()
+
+        booking = reserve_slot(slot.id, service=service, guest_email="a@example.com")
+
+        slot.refresh_from_db()
+        assert booking.staff == slot.staff
+        assert booking.start_time == slot.start_time
+        assert slot.booked_count == 1
+
+    def test_full_slot(self):
+        """Test that a full slot reports SlotUnavailableError."""
+        service, slot = create_slot()
+        reserve_slot(slot.id, service=service, guest_email="a@example.com")
+
+        with pytest.raises(SlotUnavailableError):
+            reserve_slot(slot.id, service=service, guest_email="b@example.com")
+
+        assert Booking.objects.count() == 1
+
+    def test_blocked_and_past_slots(self):
+        """Test that blocked and past slots cannot be reserved."""
+        service, blocked = create_slot(is_blocked=True)
+        past = TimeSlot.objects.create(
+            staff=blocked.staff,
+            start_time=timezone.now() - timedelta(hours=2),
+            end_time=timezone.now() - timedelta(hours=1),
+        )
+
+        for slot in [blocked, past]:
+            with pytest.raises(SlotUnavailableError):
+                reserve_slot(slot.id, service=service, guest_email="a@example.com")
+
+    def test_api_reports_taken_slot(self, authenticated_client):
+        """Test that the booking API returns 400 for a taken slot."""
+        service, slot = create_slot()
+        reserve_slot(slot.id, service=service, guest_email="a@example.com")
+
+        response = authenticated_client.post(
+            "/api/v1/bookings/",
+            {"service": service.id, "staff": slot.staff.id, "time_slot": slot.id},
+        )
+
+        assert response.status_code == 400
+        assert Booking.objects.count() == 1
+
+    def test_guest_flow_reports_taken_slot(self, client):
+        """Test that the guest flow sends the guest back to pick another time."""
+        service, slot = create_slot()
+        reserve_slot(slot.id, service=service, guest_email="a@example.com")
+        session = client.session
+        session["guest_booking_service_id"] = service.id
+        session["guest_booking_slot_id"] = slot.id
+        session.save()
+
+        response = client.post("/booking/book/step4/", {"email": "b@example.com"})
+
+        assert response.status_code == 302
+        assert response.url == "/booking/book/step3/"
+        assert Booking.objects.count() == 1
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_never_overbook():
+    """Hundreds of concurrent attempts on one slot book exactly its capacity."""
+    if connection.vendor == "sqlite":
+        pytest.skip("SQLite does not support concurrent writers; run against PostgreSQL")
+
+    capacity = 3
+    attempts = 200
+    deadline = time.monotonic() + 60
+    service, slot = create_slot(capacity=capacity)
+    results = []
+    barrier = threading.Barrier(20)
+
+    def attempt(index):
+        try:
+            if index < 20:
+                barrier.wait(timeout=30)
+            while time.monotonic() < deadline:
+                try:
+                    reserve_slot(slot.id, service=service, guest_email=f"guest{index}@example.com")
+                    results.append("booked")
+                    return
+                except SlotUnavailableError:
+                    results.append("taken")
+                    return
+                except OperationalError:
+                    # Transient lock or serialization failure; retry until the deadline
+                    time.sleep(0.01)
+            results.append("timeout")
+        except Exception as e:
+            results.append(f"error: {e!r}")
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=attempt, args=(i,)) for i in range(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=max(deadline - time.monotonic(), 0) + 5)
+
+    assert not any(thread.is_alive() for thread in threads), "reservation threads hung"
+    assert results.count("booked") == capacity, results
+    assert results.count("taken") == attempts - capacity, results
+
+    slot.refresh_from_db()
+    assert slot.booked_count == capacity
+    assert Booking.objects.filter(time_slot=slot).count() == capacity
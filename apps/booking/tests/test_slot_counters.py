@@ -0,0 +1,151 @@
+"""Tests for the maintained TimeSlot.booked_count counter."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.admin.sites import AdminSite
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.admin import BookingAdmin
+from apps.booking.models import Booking, Service, Staff, TimeSlot
+
+
+@pytest.fixture
+def slot(db):
+    """Create a bookable slot with capacity 2."""
+    service = Service.objects.create(
+        name="Haircut",
+        description="Test",
+        duration=45,
+        price=Decimal("50.00"),
+    )
+    staff = Staff.objects.create(first_name="John", last_name="Doe")
+    staff.services.add(service)
+    start = timezone.now() + timedelta(days=1)
+    return TimeSlot.objects.create(
+        staff=staff,
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        capacity=2,
+    )
+
+
+def book(slot, **kwargs):
+    """Create a guest booking on a slot."""
+    return Booking.objects.create(
+        guest_email="guest@example.com",
+        service=slot.staff.services.get(),
+        staff=slot.staff,
+        time_slot=slot,
+        start_time=slot.start_time,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestBookedCount:
+    """Tests for booked_count maintenance."""
+
+    def test_create_confirm_cancel(self, slot, mailoutbox):
+        """Test counter changes through the booking lifecycle."""
+        booking = book(slot)
+        slot.refresh_from_db()
+        assert slot.booked_count == 1
+
+        booking.confirm()
+        slot.refresh_from_db()
+        assert slot.booked_count == 1
+
+        booking.cancel()
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+
+    def test_reloaded_booking_cancel(self, slot, mailoutbox):
+        """Test cancel on a booking loaded from the database."""
+        book(slot)
+        Booking.objects.get().cancel()
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+
+    def test_create_on_full_slot_fails(self, slot):
+        """Test that capacity cannot be exceeded."""
+        book(slot)
+        book(slot)
+
+        with pytest.raises(ValidationError):
+            book(slot)
+
+        slot.refresh_from_db()
+        assert slot.booked_count == 2
+        assert Booking.objects.count() == 2
+        assert not slot.is_available()
+
+    def test_inactive_booking_holds_no_capacity(self, slot):
+        """Test that creating a canceled booking leaves the counter alone."""
+        book(slot, status="canceled")
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+
+    def test_move_to_another_slot(self, slot):
+        """Test that moving an active booking transfers the claimed capacity."""
+        other = TimeSlot.objects.create(
+            staff=slot.staff,
+            start_time=slot.end_time,
+            end_time=slot.end_time + timedelta(hours=1),
+        )
+        booking = Booking.objects.get(pk=book(slot).pk)
+
+        booking.time_slot = other
+        booking.save()
+
+        slot.refresh_from_db()
+        other.refresh_from_db()
+        assert slot.booked_count == 0
+        assert other.booked_count == 1
+
+    def test_delete_releases_capacity(self, slot):
+        """Test that deleting active bookings, singly or in bulk, frees capacity."""
+        book(slot).delete()
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+
+        book(slot)
+        book(slot)
+        book(slot, status="canceled")
+        Booking.objects.all().delete()
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+
+    def test_admin_cancel_action(self, slot, admin_customer):
+        """Test that the admin bulk cancel releases capacity."""
+        book(slot)
+        book(slot)
+        request = RequestFactory().post("/")
+        request.user = admin_customer
+        model_admin = BookingAdmin(Booking, AdminSite())
+        model_admin.message_user = lambda *args, **kwargs: None
+
+        model_admin.cancel_bookings(request, Booking.objects.all())
+
+        slot.refresh_from_db()
+        assert slot.booked_count == 0
+        assert set(Booking.objects.values_list("status", flat=True)) == {"canceled"}
+
+
+@pytest.mark.django_db
+def test_reconcile_slot_counts(slot):
+    """Test that the reconciliation command rebuilds drifted counters."""
+    book(slot)
+    TimeSlot.objects.filter(pk=slot.pk).update(booked_count=2)
+
+    call_command("reconcile_slot_counts")
+
+    slot.refresh_from_db()
+    assert slot.booked_count == 1
@@ -0,0 +1,126 @@
+"""Tests for bulk time slot generation."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.models import OpeningHour, Staff, TimeSlot
+from apps.booking.slot_generator import generate_slots
+
+# A Monday
+MONDAY = date(2030, 1, 7)
+
+
+@pytest.fixture
+def opening_hours(db):
+    """Open 9:00-12:30 on weekdays, closed on Saturday, no row for Sunday."""
+    for weekday in range(5):
+        OpeningHour.objects.create(weekday=weekday, start_time=time(9), end_time=time(12, 30))
+    OpeningHour.objects.create(weekday=5, start_time=time(9), end_time=time(17), is_closed=True)
+
+
+@pytest.fixture
+def staff(db):
+    """Create two active staff members and one inactive."""
+    Staff.objects.create(first_name="Inactive", last_name="Stylist", is_active=False)
+    return [
+        Staff.objects.create(first_name="Ann", last_name="Stylist"),
+        Staff.objects.create(first_name="Bea", last_name="Stylist"),
+    ]
+
+
+@pytest.mark.django_db
+class TestGenerateSlots:
+    """Tests for generate_slots."""
+
+    def test_builds_slots_from_opening_hours(
+        self, opening_hours, staff, django_assert_max_num_queries
+    ):
+        """Test slot layout across open, closed and missing days."""
+        with django_assert_max_num_queries(6):
+            created = generate_slots(start_date=MONDAY, days=7, slot_minutes=60)
+
+        # Five open days with 9, 10 and 11 o'clock slots; 12:00 would overrun closing
+        assert created == 2 * 5 * 3
+        first = TimeSlot.objects.filter(staff=staff[0]).first()
+        assert timezone.localtime(first.start_time).time() == time(9)
+        assert first.end_time - first.start_time == timedelta(hours=1)
+        assert not TimeSlot.objects.filter(staff__is_active=False).exists()
+        weekdays = {
+            timezone.localdate(slot.start_time).weekday() for slot in TimeSlot.objects.all()
+        }
+        assert weekdays == set(range(5))
+
+    def test_slot_length(self, opening_hours, staff):
+        """Test a custom slot length."""
+        created = generate_slots(
+            start_date=MONDAY, days=1, slot_minutes=30, staff=Staff.objects.filter(pk=staff[0].pk)
+        )
+        assert created == 7
+
+    def test_batches(self, opening_hours, staff, django_assert_max_num_queries):
+        """Test that small batches still write every slot."""
+        with django_assert_max_num_queries(4 + 30):
+            created = generate_slots(start_date=MONDAY, days=7, slot_minutes=60, batch_size=1)
+        assert created == 30
+
+    def test_rerun_is_idempotent(self, opening_hours, staff):
+        """Test that a second run over the same horizon creates nothing."""
+        generate_slots(start_date=MONDAY, days=7)
+        assert generate_slots(start_date=MONDAY, days=7) == 0
+        assert TimeSlot.objects.count() == 30
+
+    def test_rolls_horizon_forward(self, opening_hours, staff):
+        """Test that extending the horizon only fills uncovered days."""
+        generate_slots(start_date=MONDAY, days=3)
+        slot = TimeSlot.objects.first()
+        slot.is_blocked = True
+        slot.save()
+
+        created = generate_slots(start_date=MONDAY, days=5)
+
+        assert created == 2 * 2 * 3
+        slot.refresh_from_db()
+        assert slot.is_blocked
+
+    def test_later_slot_does_not_hide_earlier_days(self, opening_hours, staff):
+        """Test that a far-future block only covers its own day."""
+        friday = MONDAY + timedelta(days=4)
+        start = timezone.make_aware(datetime.combine(friday, time(15)))
+        TimeSlot.objects.create(
+            staff=staff[0], start_time=start, end_time=start + timedelta(hours=1), is_blocked=True
+        )
+
+        created = generate_slots(start_date=MONDAY, days=5)
+
+        assert created == 2 * 5 * 3 - 3
+        fridays = TimeSlot.objects.filter(staff=staff[0]).in_window(friday, friday)
+        assert list(fridays.values_list("is_blocked", flat=True)) == [True]
+
+    def test_new_staff_gets_full_horizon(self, opening_hours, staff):
+        """Test that a staff member without slots is covered from the start."""
+        generate_slots(start_date=MONDAY, days=5)
+        Staff.objects.create(first_name="Cat", last_name="Stylist")
+
+        assert generate_slots(start_date=MONDAY, days=5) == 15
+
+    def test_invalid_slot_length(self, opening_hours, staff):
+        """Test that a non-positive slot length is rejected."""
+        with pytest.raises(ValueError):
+            generate_slots(start_date=MONDAY, days=1, slot_minutes=0)
+
+
+@pytest.mark.django_db
+def test_generate_slots_command(opening_hours, staff):
+    """Test the generate_slots management command."""
+    out = StringIO()
+    call_command("generate_slots", "--start", MONDAY.isoformat(), "--days", "7", stdout=out)
+
+    assert "Created 30 time slots" in out.getvalue()
+    assert TimeSlot.objects.count() == 30
@@ -0,0 +1,199 @@
+"""Tests for grouped "Any available" start times."""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from apps.booking.availability import available_slots, available_start_times
+from apps.booking.models import Booking, OpeningHour, Service, Staff, TimeSlot
+from apps.booking.reservations import reserve_slot, reserve_time
+
+# Hours with a slot, 9:00 to 17:00
+OPEN_HOURS = range(9, 17)
+
+
+@pytest.fixture
+def day():
+    """Return tomorrow's local date."""
+    return timezone.localdate() + timedelta(days=1)
+
+
+@pytest.fixture
+def services(db):
+    """Create a one-hour and a two-hour service."""
+    return {
+        "haircut": Service.objects.create(
+            name="Haircut", description="Test", duration=60, price=Decimal("50.00")
+        ),
+        "coloring": Service.objects.create(
+            name="Hair Coloring", description="Test", duration=120, price=Decimal("120.00")
+        ),
+    }
+
+
+def local(day, hour):
+    """Return an aware local datetime on a day."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def create_stylists(services, count):
+    """Create stylists providing every service."""
+    stylists = []
+    for index in range(count):
+        staff = Staff.objects.create(first_name=f"Stylist{index}", last_name="Test")
+        staff.services.add(*services.values())
+        stylists.append(staff)
+    return stylists
+
+
+def create_hourly_slots(staff, day, hours=OPEN_HOURS):
+    """Create hourly slots for a stylist."""
+    return {
+        hour: TimeSlot.objects.create(
+            staff=staff, start_time=local(day, hour), end_time=local(day, hour + 1)
+        )
+        for hour in hours
+    }
+
+
+def free_counts(staff, day, service):
+    """Count free stylists per start time from the per-stylist listing."""
+    counts: dict[datetime, int] = {}
+    for slot in available_slots(staff, day, day, service):
+        counts[slot.start_time] = counts.get(slot.start_time, 0) + 1
+    return counts
+
+
+@pytest.mark.django_db
+class TestStoredStartTimes:
+    """Grouped start times over stored slots."""
+
+    def test_groups_and_counts_free_stylists(self, services, day):
+        """Test that each start time appears once with its free stylist count."""
+        ann, bea = create_stylists(services, 2)
+        ann_slots = create_hourly_slots(ann, day)
+        create_hourly_slots(bea, day, range(9, 12))
+        reserve_slot(ann_slots[10].id, service=services["haircut"], guest_email="a@example.com")
+
+        start_times = available_start_times(Staff.objects.all(), day, day)
+
+        assert [
+            (timezone.localtime(entry.start_time).hour, entry.free_staff) for entry in start_times
+        ] == [
+            (9, 2),
+            (10, 1),
+            (11, 2),
+            (12, 1),
+            (13, 1),
+            (14, 1),
+            (15, 1),
+            (16, 1),
+        ]
+
+    def test_pick_is_deterministic(self, services, day):
+        """Test that the lowest slot id among free stylists is picked."""
+        ann, bea = create_stylists(services, 2)
+        bea_slots = create_hourly_slots(bea, day)
+        ann_slots = create_hourly_slots(ann, day)
+        reserve_slot(bea_slots[9].id, service=services["haircut"], guest_email="a@example.com")
+
+        picks = {
+            timezone.localtime(entry.start_time).hour: entry.id
+            for entry in available_start_times(Staff.objects.all(), day, day)
+        }
+
+        assert picks[9] == ann_slots[9].id
+        assert picks[10] == bea_slots[10].id
+
+    def test_fitting_matches_per_stylist_listing(self, services, day):
+        """Test that the SQL fitting agrees with the per-stylist sweep."""
+        ann, bea, cat = create_stylists(services, 3)
+        ann_slots = create_hourly_slots(ann, day)
+        bea_slots = create_hourly_slots(bea, day, [9, 10, 11, 13, 14, 15, 16])
+        cat_slots = create_hourly_slots(cat, day)
+        reserve_slot(ann_slots[11].id, service=services["haircut"], guest_email="a@example.com")
+        reserve_slot(bea_slots[14].id, service=services["coloring"], guest_email="b@example.com")
+        cat_slots[12].is_blocked = True
+        cat_slots[12].save()
+
+        for service in services.values():
+            start_times = available_start_times(Staff.objects.all(), day, day, service)
+            expected = free_counts(Staff.objects.all(), day, service)
+            assert {entry.start_time: entry.free_staff for entry in start_times} == expected
+
+    def test_slotless_booking_blocks_fitting(self, services, day, customer):
+        """Test that a booking without a slot still occupies the stylist."""
+        (ann,) = create_stylists(services, 1)
+        create_hourly_slots(ann, day)
+        Booking.objects.create(
+            customer=customer,
+            service=services["haircut"],
+            staff=ann,
+            start_time=local(day, 12),
+        )
+
+        hours = [
+            timezone.localtime(entry.start_time).hour
+            for entry in available_start_times(Staff.objects.all(), day, day, services["coloring"])
+        ]
+
+        assert hours == [9, 10, 13, 14, 15]
+
+    @pytest.mark.parametrize("stylists", [2, 6])
+    def test_single_query(self, services, day, stylists, django_assert_num_queries):
+        """Test that the query count does not grow with the number of stylists."""
+        for staff in create_stylists(services, stylists):
+            create_hourly_slots(staff, day)
+
+        with django_assert_num_queries(1):
+            start_times = available_start_times(
+                Staff.objects.filter(is_active=True), day, day, services["coloring"]
+            )
+
+        assert len(start_times) == 7
+        assert all(entry.free_staff == stylists for entry in start_times)
+
+
+@pytest.mark.django_db
+class TestComputedStartTimes:
+    """Grouped start times over computed availability."""
+
+    def test_groups_computed_slots(self, settings, services, day):
+        """Test that computed slots are grouped with the lowest staff id picked."""
+        settings.BOOKING_AVAILABILITY_BACKEND = "computed"
+        settings.BOOKING_SLOT_MINUTES = 60
+        OpeningHour.objects.create(weekday=day.weekday(), start_time=time(9), end_time=time(12))
+        ann, bea = create_stylists(services, 2)
+        reserve_time(ann, local(day, 10), service=services["haircut"], guest_email="a@x.com")
+
+        start_times = available_start_times(Staff.objects.all(), day, day, services["haircut"])
+
+        assert [entry.free_staff for entry in start_times] == [2, 1, 2]
+        assert start_times[1].id == f"{bea.pk}-{int(local(day, 10).timestamp())}"
+
+
+@pytest.mark.django_db
+class TestGuestStep3AnyStaff:
+    """The guest time picker with "Any available" staff."""
+
+    def test_lists_each_time_once(self, client, services, day):
+        """Test that every start time is offered once, with a bookable slot id."""
+        for staff in create_stylists(services, 3):
+            create_hourly_slots(staff, day)
+        session = client.session
+        session["guest_booking_service_id"] = services["haircut"].id
+        session["guest_booking_any_staff"] = True
+        session.save()
+
+        response = client.get("/booking/book/step3/")
+
+        entries = response.context["slots_by_date"][day.isoformat()]
+        assert len(entries) == 8
+        assert all(entry.free_staff == 3 for entry in entries)
+        assert TimeSlot.objects.filter(pk__in=[entry.id for entry in entries]).count() == 8
+        assert b"3 stylists free" in response.content
@@ -1,20 +1,29 @@
 """Views for booking system."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from datetime import timedelta
+from typing import Any, Optional
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
-from django.db import transaction
 from django.db.models import Q
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
-from .models import Booking, Service, Staff, TimeSlot
+from .assignment import assign
+from .availability import (
+    available_slots,
+    available_start_times,
+    get_slot,
+    group_slots_by_date,
+    reserve,
+)
+from .bitmaps import cached_available_slots
+from .exceptions import SlotUnavailableError
+from .models import Booking, Service, Staff
 
 
 def services_list(request: HttpRequest) -> HttpResponse:
@@ -133,24 +142,11 @@ def booking_step3_time(request: HttpRequest) -> HttpResponse:
     staff = get_object_or_404(Staff, id=staff_id)
 
     # Get available time slots for next 14 days
-    today = timezone.now().date()
+    today = timezone.localdate()
     end_date = today + timedelta(days=14)
 
-    available_slots = TimeSlot.objects.filter(
-        staff=staff,
-        start_time__date__gte=today,
-        start_time__date__lte=end_date,
-        is_blocked=False,
-    ).order_by("start_time")
-
     # Group by date
-    slots_by_date: Dict[str, list[TimeSlot]] = {}
-    for slot in available_slots:
-        if slot.is_available():
-            date_key = slot.start_time.date().isoformat()
-            if date_key not in slots_by_date:
-                slots_by_date[date_key] = []
-            slots_by_date[date_key].append(slot)
+    slots_by_date = group_slots_by_date(available_slots(staff, today, end_date, service))
 
     if request.method == "POST":
         slot_id = request.POST.get("slot_id")
@@ -179,39 +175,46 @@ def booking_step4_confirm(request: HttpRequest) -> HttpResponse:
 
     service = get_object_or_404(Service, id=service_id)
     staff = get_object_or_404(Staff, id=staff_id)
-    time_slot = get_object_or_404(TimeSlot, id=slot_id)
+    time_slot = get_slot(slot_id)
+    if time_slot is None:
+        raise Http404("Time slot not found")
 
     if request.method == "POST":
         notes = request.POST.get("notes", "")
 
+        # Reserve the slot in its own short transaction so the slot row is not
+        # held while confirmation email/SMS are being sent.
         try:
-            with transaction.atomic():
-                # Create booking
-                booking = Booking.objects.create(
-                    customer=request.user,
-                    service=service,
-                    staff=staff,
-                    time_slot=time_slot,
-                    start_time=time_slot.start_time,
-                    notes=notes,
-                )
-
-                # Confirm booking
-                booking.confirm()
-
-                # Clear session
-                for key in ["booking_service_id", "booking_staff_id", "booking_slot_id"]:
-                    request.session.pop(key, None)
-
-                messages.success(
-                    request,
-                    f"Booking confirmed! Confirmation code: {booking.confirmation_code}",
-                )
-                return redirect("booking_success", confirmation_code=booking.confirmation_code)
+            booking = reserve(
+                time_slot,
+                service=service,
+                staff=staff,
+                customer=request.user,
+                notes=notes,
+            )
+
+        except SlotUnavailableError:
+            messages.error(request, "Sorry, that time was just taken. Please choose another.")
+            request.session.pop("booking_slot_id", None)
+            return redirect("booking_step3_time")
 
         except Exception as e:
             messages.error(request, f"Failed to create booking: {e}")
 
+        else:
+            # Confirm booking
+            booking.confirm()
+
+            # Clear session
+            for key in ["booking_service_id", "booking_staff_id", "booking_slot_id"]:
+                request.session.pop(key, None)
+
+            messages.success(
+                request,
+                f"Booking confirmed! Confirmation code: {booking.confirmation_code}",
+            )
+            return redirect("booking_success", confirmation_code=booking.confirmation_code)
+
     context = {
         "service": service,
         "staff": staff,
@@ -225,7 +228,7 @@ def booking_step4_confirm(request: HttpRequest) -> HttpResponse:
 def booking_success(request: HttpRequest, confirmation_code: str) -> HttpResponse:
     """Display booking success page."""
     booking = get_object_or_404(
-        Booking,
+        Booking.objects.select_related("service", "staff", "customer"),
         confirmation_code=confirmation_code,
         customer=request.user,
     )
@@ -239,7 +242,11 @@ def booking_success(request: HttpRequest, confirmation_code: str) -> HttpRespons
 @login_required
 def my_bookings(request: HttpRequest) -> HttpResponse:
     """Display user's bookings."""
-    bookings = Booking.objects.filter(customer=request.user).order_by("-start_time")
+    bookings = (
+        Booking.objects.filter(customer=request.user)
+        .select_related("service", "staff")
+        .order_by("-start_time")
+    )
 
     context = {
         "bookings": bookings,
@@ -251,7 +258,7 @@ def my_bookings(request: HttpRequest) -> HttpResponse:
 def cancel_booking(request: HttpRequest, confirmation_code: str) -> HttpResponse:
     """Cancel a booking."""
     booking = get_object_or_404(
-        Booking,
+        Booking.objects.select_related("service", "staff", "customer"),
         confirmation_code=confirmation_code,
         customer=request.user,
     )
@@ -340,47 +347,22 @@ def guest_booking_step3_time(request: HttpRequest) -> HttpResponse:
     staff_id = request.session.get("guest_booking_staff_id")
     
     # Get available time slots for next 14 days
-    today = timezone.now().date()
+    today = timezone.localdate()
     end_date = today + timedelta(days=14)
 
     if any_staff:
-        # Show slots for any staff who can do this service
-        available_slots = TimeSlot.objects.filter(
-            staff__services=service,
-            staff__is_active=True,
-            start_time__date__gte=today,
-            start_time__date__lte=end_date,
-            is_blocked=False,
-        ).select_related('staff').order_by("start_time")
+        # Guests only choose a time; one grouped query returns each start
+        # time once with the number of free stylists and the one to book
         staff = None
+        slots = available_start_times(
+            Staff.objects.filter(services=service, is_active=True), today, end_date, service
+        )
     else:
         # Show slots for specific staff
         staff = get_object_or_404(Staff, id=staff_id) if staff_id else None
-        available_slots = TimeSlot.objects.filter(
-            staff=staff,
-            start_time__date__gte=today,
-            start_time__date__lte=end_date,
-            is_blocked=False,
-        ).order_by("start_time")
-
-    # Group by date and filter available
-    slots_by_date: Dict[str, list[TimeSlot]] = {}
-    seen_times_for_date: Dict[str, set[datetime]] = {}
-    for slot in available_slots:
-        if slot.is_available():
-            date_key = slot.start_time.date().isoformat()
-            if date_key not in slots_by_date:
-                slots_by_date[date_key] = []
-            if any_staff:
-                if date_key not in seen_times_for_date:
-                    seen_times_for_date[date_key] = set()
-                # Skip duplicate times when "Any Available" is selected so
-                # guests only choose a time slot. A specific staff member will
-                # be assigned automatically once the slot is booked.
-                if slot.start_time in seen_times_for_date[date_key]:
-                    continue
-                seen_times_for_date[date_key].add(slot.start_time)
-            slots_by_date[date_key].append(slot)
+        slots = cached_available_slots(staff, today, end_date, service)
+
+    slots_by_date = group_slots_by_date(slots)
 
     if request.method == "POST":
         slot_id = request.POST.get("slot_id")
@@ -410,8 +392,11 @@ def guest_booking_step4_details(request: HttpRequest) -> HttpResponse:
         return redirect("guest_booking_step1_service")
 
     service = get_object_or_404(Service, id=service_id)
-    time_slot = get_object_or_404(TimeSlot, id=slot_id)
-    staff = time_slot.staff
+    time_slot = get_slot(slot_id)
+    if time_slot is None:
+        raise Http404("Time slot not found")
+    any_staff = request.session.get("guest_booking_any_staff", False)
+    staff = None if any_staff else time_slot.staff
 
     if request.method == "POST":
         guest_email = request.POST.get("email", "").strip()
@@ -426,48 +411,65 @@ def guest_booking_step4_details(request: HttpRequest) -> HttpResponse:
             try:
                 validate_email(guest_email)
                 
-                # Create booking
+                # Reserve the slot in its own short transaction; confirmation
+                # notifications are sent after it commits.
+                details = {
+                    "service": service,
+                    "customer": None,  # No customer account
+                    "guest_email": guest_email,
+                    "guest_name": guest_name,
+                    "guest_phone": guest_phone,
+                    "notes": notes,
+                }
                 try:
-                    with transaction.atomic():
-                        booking = Booking.objects.create(
-                            customer=None,  # No customer account
-                            guest_email=guest_email,
-                            guest_name=guest_name,
-                            guest_phone=guest_phone,
-                            service=service,
-                            staff=staff,
-                            time_slot=time_slot,
-                            start_time=time_slot.start_time,
-                            notes=notes,
+                    if any_staff:
+                        # Pick the stylist now, from everyone free at this time
+                        booking = assign(
+                            Staff.objects.filter(services=service, is_active=True),
+                            time_slot.start_time,
+                            **details,
                         )
+                    else:
+                        booking = reserve(time_slot, **details)
 
-                        # Confirm booking immediately
-                        booking.confirm()
-
-                        # Clear session
-                        for key in [
-                            "guest_booking_service_id",
-                            "guest_booking_staff_id",
-                            "guest_booking_any_staff",
-                            "guest_booking_slot_id",
-                        ]:
-                            request.session.pop(key, None)
-
-                        messages.success(
-                            request,
-                            f"Booking confirmed! Check your email at {guest_email} for confirmation.",
-                        )
-                        return redirect("guest_booking_success", confirmation_code=booking.confirmation_code)
+                except SlotUnavailableError:
+                    messages.error(
+                        request, "Sorry, that time was just taken. Please choose another."
+                    )
+                    request.session.pop("guest_booking_slot_id", None)
+                    return redirect("guest_booking_step3_time")
 
                 except Exception as e:
                     messages.error(request, f"Failed to create booking: {e}")
 
+                else:
+                    # Confirm booking immediately
+                    booking.confirm()
+
+                    # Clear session
+                    for key in [
+                        "guest_booking_service_id",
+                        "guest_booking_staff_id",
+                        "guest_booking_any_staff",
+                        "guest_booking_slot_id",
+                    ]:
+                        request.session.pop(key, None)
+
+                    messages.success(
+                        request,
+                        f"Booking confirmed! Check your email at {guest_email} for confirmation.",
+                    )
+                    return redirect(
+                        "guest_booking_success", confirmation_code=booking.confirmation_code
+                    )
+
             except ValidationError:
                 messages.error(request, "Please enter a valid email address.")
 
     context = {
         "service": service,
         "staff": staff,
+        "any_staff": any_staff,
         "time_slot": time_slot,
         "step": 4,
     }
@@ -480,7 +482,7 @@ def guest_booking_success(request: HttpRequest, confirmation_code: str) -> HttpR
     No login required.
     """
     booking = get_object_or_404(
-        Booking,
+        Booking.objects.select_related("service", "staff", "customer"),
         confirmation_code=confirmation_code,
     )
 
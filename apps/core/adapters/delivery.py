@@ -0,0 +1,73 @@
+"""Outcome of a single email or SMS delivery."""
+
+from __future__ import annotations
+
+import smtplib
+import socket
+from dataclasses import dataclass
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+
+import requests
+
+# HTTP statuses that are worth retrying even though they are client errors
+RETRYABLE_HTTP_STATUSES = {408, 409, 425, 429}
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """
+    Whether a message was delivered, and why not if it was not.
+
+    Truthy when the message was sent, so it can stand in for the boolean
+    the ``send_*`` methods return.
+    """
+
+    sent: bool
+    error_class: str = ""
+    error: str = ""
+    permanent: bool = False
+
+    def __bool__(self) -> bool:
+        return self.sent
+
+    @classmethod
+    def success(cls) -> DeliveryResult:
+        """A delivered message."""
+        return cls(sent=True)
+
+    @classmethod
+    def failure(cls, exc: BaseException) -> DeliveryResult:
+        """A failed delivery, classified as permanent or transient from the exception."""
+        return cls(
+            sent=False,
+            error_class=type(exc).__name__,
+            error=str(exc)[:1000],
+            permanent=is_permanent(exc),
+        )
+
+    @classmethod
+    def rejected(cls, error: str) -> DeliveryResult:
+        """A message the provider did not accept, with no exception to go by."""
+        return cls(sent=False, error_class="NotSent", error=error)
+
+
+def is_permanent(exc: BaseException) -> bool:
+    """
+    Whether retrying a failed delivery cannot succeed.
+
+    Rejected recipients, 5xx SMTP replies, 4xx HTTP replies (other than
+    timeouts and rate limits) and broken templates are permanent. Timeouts,
+    dropped connections, 4xx SMTP and 5xx HTTP replies, and anything
+    unrecognised are treated as transient, so they are retried.
+    """
+    if isinstance(exc, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 500 <= exc.smtp_code < 600
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return 400 <= status < 500 and status not in RETRYABLE_HTTP_STATUSES
+    if isinstance(exc, (socket.timeout, ConnectionError, requests.ConnectionError)):
+        return False
+    return isinstance(exc, (TemplateDoesNotExist, TemplateSyntaxError, KeyError, ValueError))
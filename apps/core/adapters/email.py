@@ -2,16 +2,44 @@
 from __future__ import annotations
 
 import logging
+import smtplib
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from typing import List, Optional
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 
+from asgiref.sync import sync_to_async
+
+from .delivery import DeliveryResult
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TemplatedEmail:
+    """
+    An email to render from ``emails/<template_name>.{txt,html}`` and send.
+
+    ``text`` and ``html`` hold the bodies when the caller already rendered
+    them; adapters render the templates only when they are missing.
+    """
+
+    to: list[str]
+    subject: str
+    template_name: str
+    context: dict
+    from_email: str | None = None
+    attachments: list = field(default_factory=list)
+    text: str | None = None
+    html: str | None = None
+
+
 class EmailAdapter(ABC):
     """Abstract base class for email sending."""
 
@@ -41,9 +69,97 @@ class EmailAdapter(ABC):
         """
         pass
 
+    def send_many(self, messages: Iterable[TemplatedEmail]) -> list[bool]:
+        """
+        Send several templated emails.
+
+        Adapters that can reuse a connection override this; the default
+        sends them one by one.
+
+        Args:
+            messages: Emails to send
+
+        Returns:
+            Whether each email was sent, in order
+        """
+        return [
+            self.send_email(
+                to=message.to,
+                subject=message.subject,
+                template_name=message.template_name,
+                context=message.context,
+                from_email=message.from_email,
+                attachments=message.attachments,
+            )
+            for message in messages
+        ]
+
+    def deliver_many(self, messages: Iterable[TemplatedEmail]) -> list[DeliveryResult]:
+        """
+        Send several templated emails and report each outcome.
+
+        Adapters that can tell why a message failed override this; the
+        default only knows whether ``send_many`` succeeded.
+
+        Args:
+            messages: Emails to send
+
+        Returns:
+            DeliveryResult of each email, in order
+        """
+        return [
+            DeliveryResult.success() if sent else DeliveryResult.rejected("Email was not sent")
+            for sent in self.send_many(messages)
+        ]
+
+    async def asend_email(
+        self,
+        to: list[str],
+        subject: str,
+        template_name: str,
+        context: dict,
+        from_email: str | None = None,
+        attachments: list | None = None,
+    ) -> bool:
+        """
+        Async version of ``send_email``.
+
+        Sends from a worker thread, so the event loop is not held up while
+        the mail server answers.
+        """
+        return await sync_to_async(self.send_email, thread_sensitive=False)(
+            to=to,
+            subject=subject,
+            template_name=template_name,
+            context=context,
+            from_email=from_email,
+            attachments=attachments,
+        )
+
+    async def asend_many(self, messages: Iterable[TemplatedEmail]) -> list[bool]:
+        """Async version of ``send_many``."""
+        return await sync_to_async(self.send_many, thread_sensitive=False)(list(messages))
+
+    async def adeliver_many(self, messages: Iterable[TemplatedEmail]) -> list[DeliveryResult]:
+        """Async version of ``deliver_many``."""
+        return await sync_to_async(self.deliver_many, thread_sensitive=False)(list(messages))
+
 
 class DjangoEmailAdapter(EmailAdapter):
-    """Django's built-in email backend adapter."""
+    """
+    Django's built-in email backend adapter.
+
+    Keeps one backend connection per process and reuses it across calls,
+    so consecutive emails share one SMTP session and TLS handshake. The
+    connection is recycled after ``EMAIL_BATCH_SIZE`` messages and closed
+    once it has been idle for ``EMAIL_CONNECTION_IDLE_TIMEOUT`` seconds.
+    """
+
+    _lock = threading.Lock()
+    _connection = None
+    _backend: str | None = None
+    _last_used = 0.0
+    _sent_on_connection = 0
 
     def send_email(
         self,
@@ -55,35 +171,117 @@ class DjangoEmailAdapter(EmailAdapter):
         attachments: Optional[List] = None,
     ) -> bool:
         """Send email using Django's email backend."""
-        try:
-            from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        message = TemplatedEmail(
+            to=to,
+            subject=subject,
+            template_name=template_name,
+            context=context,
+            from_email=from_email,
+            attachments=attachments or [],
+        )
+        return self.send_many([message])[0]
 
-            # Render HTML and text versions
-            html_content = render_to_string(f"emails/{template_name}.html", context)
-            text_content = render_to_string(f"emails/{template_name}.txt", context)
+    def send_many(self, messages: Iterable[TemplatedEmail]) -> list[bool]:
+        """Render the emails and send them over the pooled connection."""
+        return [result.sent for result in self.deliver_many(messages)]
+
+    def deliver_many(self, messages: Iterable[TemplatedEmail]) -> list[DeliveryResult]:
+        """Render the emails, send them over the pooled connection and report each outcome."""
+        results = []
+        with self._lock:
+            for message in messages:
+                try:
+                    email = self._render(message)
+                except Exception as e:
+                    logger.error(f"Failed to render email to {message.to}: {e}")
+                    results.append(DeliveryResult.failure(e))
+                    continue
+                results.append(self._send(email))
+            DjangoEmailAdapter._last_used = time.monotonic()
+        return results
 
-            # Create email message
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=from_email,
-                to=to,
+    @staticmethod
+    def _render(message: TemplatedEmail) -> EmailMultiAlternatives:
+        """Render both template versions into a message."""
+        html_content = message.html
+        if html_content is None:
+            html_content = render_to_string(
+                f"emails/{message.template_name}.html", message.context
             )
-            msg.attach_alternative(html_content, "text/html")
+        text_content = message.text
+        if text_content is None:
+            text_content = render_to_string(f"emails/{message.template_name}.txt", message.context)
 
-            # Add attachments if provided
-            if attachments:
-                for attachment in attachments:
-                    msg.attach(*attachment)
+        email = EmailMultiAlternatives(
+            subject=message.subject,
+            body=text_content,
+            from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=message.to,
+        )
+        email.attach_alternative(html_content, "text/html")
 
-            msg.send()
+        for attachment in message.attachments:
+            email.attach(*attachment)
+        return email
 
-            logger.info(f"Email sent successfully to {to}")
-            return True
+    def _send(self, email: EmailMultiAlternatives) -> DeliveryResult:
+        """Send one message, reconnecting once if the server dropped the session."""
+        for attempt in range(2):
+            try:
+                connection = self._get_connection()
+                sent = connection.send_messages([email]) == 1
+                DjangoEmailAdapter._sent_on_connection += 1
+                if not sent:
+                    return DeliveryResult.rejected("Backend did not send the email")
+                logger.info(f"Email sent successfully to {email.to}")
+                return DeliveryResult.success()
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                self._close()
+                if attempt:
+                    logger.error(f"Failed to send email to {email.to}: {e}")
+                    return DeliveryResult.failure(e)
+            except Exception as e:
+                logger.error(f"Failed to send email to {email.to}: {e}")
+                if not isinstance(e, smtplib.SMTPRecipientsRefused):
+                    # The session may be in an unknown state
+                    self._close()
+                return DeliveryResult.failure(e)
+        return DeliveryResult.rejected("Email was not sent")
 
-        except Exception as e:
-            logger.error(f"Failed to send email to {to}: {e}")
-            return False
+    def _get_connection(self):
+        """Return the pooled connection, recycling it when stale or used up."""
+        cls = DjangoEmailAdapter
+        if cls._connection is not None and (
+            cls._backend != settings.EMAIL_BACKEND
+            or cls._sent_on_connection >= settings.EMAIL_BATCH_SIZE
+            or time.monotonic() - cls._last_used > settings.EMAIL_CONNECTION_IDLE_TIMEOUT
+        ):
+            self._close()
+
+        if cls._connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            cls._connection = connection
+            cls._backend = settings.EMAIL_BACKEND
+            cls._sent_on_connection = 0
+        cls._last_used = time.monotonic()
+        return cls._connection
+
+    @classmethod
+    def _close(cls) -> None:
+        """Close the pooled connection, ignoring errors from a dead session."""
+        if cls._connection is not None:
+            try:
+                cls._connection.close()
+            except Exception:
+                pass
+        cls._connection = None
+
+    @classmethod
+    def close_connection(cls) -> None:
+        """Close the pooled connection, e.g. at the end of a batch job."""
+        with cls._lock:
+            cls._close()
 
 
 class ConsoleEmailAdapter(EmailAdapter):
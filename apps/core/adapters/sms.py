@@ -2,11 +2,19 @@
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from django.conf import settings
 
+import requests
+from asgiref.sync import sync_to_async
+
+from .delivery import DeliveryResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +35,55 @@ class SMSAdapter(ABC):
         """
         pass
 
+    def send_many(self, messages: Iterable[tuple[str, str]]) -> list[bool]:
+        """
+        Send several SMS messages.
+
+        Adapters that can send concurrently override this; the default
+        sends them one by one.
+
+        Args:
+            messages: ``(to, message)`` pairs
+
+        Returns:
+            Whether each SMS was sent, in order
+        """
+        return [self.send_sms(to=to, message=message) for to, message in messages]
+
+    def deliver_sms(self, to: str, message: str) -> DeliveryResult:
+        """
+        Send an SMS message and report the outcome.
+
+        Adapters that can tell why a message failed override this; the
+        default only knows whether ``send_sms`` succeeded.
+
+        Args:
+            to: Recipient phone number
+            message: SMS message content
+
+        Returns:
+            DeliveryResult of the message
+        """
+        if self.send_sms(to=to, message=message):
+            return DeliveryResult.success()
+        return DeliveryResult.rejected("SMS was not sent")
+
+    async def asend_sms(self, to: str, message: str) -> bool:
+        """
+        Async version of ``send_sms``; the request is made from a worker thread.
+        """
+        return await sync_to_async(self.send_sms, thread_sensitive=False)(to=to, message=message)
+
+    async def asend_many(self, messages: Iterable[tuple[str, str]]) -> list[bool]:
+        """Async version of ``send_many``."""
+        return await sync_to_async(self.send_many, thread_sensitive=False)(list(messages))
+
+    async def adeliver_sms(self, to: str, message: str) -> DeliveryResult:
+        """Async version of ``deliver_sms``."""
+        return await sync_to_async(self.deliver_sms, thread_sensitive=False)(
+            to=to, message=message
+        )
+
 
 class ConsoleSMSAdapter(SMSAdapter):
     """Console SMS adapter for development/testing."""
@@ -49,13 +106,23 @@ class ConsoleSMSAdapter(SMSAdapter):
 
 
 class TwilioSMSAdapter(SMSAdapter):
-    """Twilio SMS adapter."""
+    """
+    Twilio SMS adapter.
+
+    Talks to the Twilio Messages REST API over one kept-alive HTTP session,
+    so consecutive messages skip the TCP and TLS handshakes. ``send_many``
+    sends up to ``SMS_MAX_CONCURRENCY`` messages at once, and every request
+    gives up after ``SMS_TIMEOUT_SECONDS``.
+    """
 
     def __init__(
         self,
         account_sid: Optional[str] = None,
         auth_token: Optional[str] = None,
         phone_number: Optional[str] = None,
+        api_url: str | None = None,
+        timeout: float | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         """
         Initialize Twilio adapter.
@@ -64,6 +131,10 @@ class TwilioSMSAdapter(SMSAdapter):
             account_sid: Twilio account SID
             auth_token: Twilio auth token
             phone_number: Twilio phone number
+            api_url: Base URL of the Twilio API (default: ``TWILIO_API_URL``)
+            timeout: Seconds to wait for each message (default: ``SMS_TIMEOUT_SECONDS``)
+            max_concurrency: Messages sent at once by ``send_many``
+                (default: ``SMS_MAX_CONCURRENCY``)
         """
         self.account_sid = account_sid or settings.TWILIO_ACCOUNT_SID
         self.auth_token = auth_token or settings.TWILIO_AUTH_TOKEN
@@ -72,36 +143,94 @@ class TwilioSMSAdapter(SMSAdapter):
         if not all([self.account_sid, self.auth_token, self.phone_number]):
             raise ValueError("Twilio credentials not configured")
 
+        api_url = (api_url or settings.TWILIO_API_URL).rstrip("/")
+        self.messages_url = f"{api_url}/2010-04-01/Accounts/{self.account_sid}/Messages.json"
+        self.timeout = timeout or settings.SMS_TIMEOUT_SECONDS
+        self.max_concurrency = max_concurrency or settings.SMS_MAX_CONCURRENCY
+        self.session = self._new_session()
+
+    def _new_session(self) -> requests.Session:
+        """Create the HTTP session shared by every message."""
+        session = requests.Session()
+        session.auth = (self.account_sid, self.auth_token)
+        # Keep one idle connection per concurrent sender
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.max_concurrency
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def send_sms(self, to: str, message: str) -> bool:
         """Send SMS using Twilio."""
-        try:
-            from twilio.rest import Client
+        return self.deliver_sms(to=to, message=message).sent
 
-            client = Client(self.account_sid, self.auth_token)
-
-            client.messages.create(
-                body=message,
-                from_=self.phone_number,
-                to=to,
+    def deliver_sms(self, to: str, message: str) -> DeliveryResult:
+        """Send SMS using Twilio and report the outcome."""
+        try:
+            response = self.session.post(
+                self.messages_url,
+                data={"To": to, "From": self.phone_number, "Body": message},
+                timeout=self.timeout,
             )
+            response.raise_for_status()
 
             logger.info(f"SMS sent successfully to {to}")
-            return True
+            return DeliveryResult.success()
 
         except Exception as e:
             logger.error(f"Failed to send SMS to {to}: {e}")
-            return False
+            return DeliveryResult.failure(e)
+
+    def send_many(self, messages: Iterable[tuple[str, str]]) -> list[bool]:
+        """Send messages concurrently over the shared session."""
+        messages = list(messages)
+        if len(messages) <= 1:
+            return super().send_many(messages)
+
+        workers = min(self.max_concurrency, len(messages))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sms") as pool:
+            return list(pool.map(lambda pair: self.send_sms(*pair), messages))
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self.session.close()
+
+
+# One adapter per configuration, shared by the whole process
+_adapters: dict[tuple, SMSAdapter] = {}
+_adapters_lock = threading.Lock()
 
 
 def get_sms_adapter() -> SMSAdapter:
     """
     Factory function to get the appropriate SMS adapter.
 
+    The adapter is built once per configuration and reused, so its HTTP
+    session stays open between messages.
+
     Returns:
         Configured SMSAdapter instance
     """
     backend = getattr(settings, "SMS_BACKEND", "console").lower()
-
+    key = (backend,)
+    if backend == "twilio":
+        key += (
+            settings.TWILIO_ACCOUNT_SID,
+            settings.TWILIO_AUTH_TOKEN,
+            settings.TWILIO_PHONE_NUMBER,
+            settings.TWILIO_API_URL,
+        )
+
+    with _adapters_lock:
+        adapter = _adapters.get(key)
+        if adapter is None:
+            adapter = _adapters[key] = _build_sms_adapter(backend)
+    return adapter
+
+
+def _build_sms_adapter(backend: str) -> SMSAdapter:
+    """Create the adapter for a backend name."""
     if backend == "twilio":
         try:
             return TwilioSMSAdapter()
@@ -0,0 +1,38 @@
+"""Database helpers shared across apps."""
+
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    Add an index without locking writes on PostgreSQL.
+
+    Uses ``CREATE INDEX CONCURRENTLY`` on PostgreSQL and a plain
+    ``CREATE INDEX`` on other backends (e.g. SQLite in development), so the
+    same migration runs everywhere. Migrations using it must set
+    ``atomic = False``.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        """Create the index, concurrently where supported."""
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == "postgresql":
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        """Drop the index, concurrently where supported."""
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == "postgresql":
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+    def describe(self) -> str:
+        """Describe the operation for migrate output."""
+        return f"Concurrently create index {self.index.name} on {self.model_name}"
@@ -1,15 +1,15 @@
 """Management command to seed demo data."""
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta
+from datetime import time
 from decimal import Decimal
 
 from django.contrib.sites.models import Site
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
 from apps.accounts.models import Customer
 from apps.booking.models import Booking, OpeningHour, Service, Staff, TimeSlot
+from apps.booking.slot_generator import generate_slots
 
 
 class Command(BaseCommand):
@@ -196,56 +196,9 @@ class Command(BaseCommand):
             day_name = hour.get_weekday_display()
             self.stdout.write(f"  {status}: {day_name}")
 
-        # Create time slots for next 14 days
+        # Create time slots for the booking horizon
         self.stdout.write("Creating time slots...")
-        start_date = timezone.now().date()
-        end_date = start_date + timedelta(days=14)
-        slots_created = 0
-
-        for staff_member in Staff.objects.filter(is_active=True):
-            current_date = start_date
-
-            while current_date <= end_date:
-                weekday = current_date.weekday()
-
-                # Check if salon is open this day
-                try:
-                    opening_hour = OpeningHour.objects.get(weekday=weekday)
-                    if opening_hour.is_closed:
-                        current_date += timedelta(days=1)
-                        continue
-                except OpeningHour.DoesNotExist:
-                    current_date += timedelta(days=1)
-                    continue
-
-                # Create hourly slots
-                current_time = datetime.combine(current_date, opening_hour.start_time)
-                end_time_dt = datetime.combine(current_date, opening_hour.end_time)
-
-                # Make timezone aware
-                current_time = timezone.make_aware(current_time)
-                end_time_dt = timezone.make_aware(end_time_dt)
-
-                while current_time < end_time_dt:
-                    slot_end = current_time + timedelta(hours=1)
-
-                    # Create slot if it doesn't exist
-                    slot, created = TimeSlot.objects.get_or_create(
-                        staff=staff_member,
-                        start_time=current_time,
-                        defaults={
-                            "end_time": slot_end,
-                            "capacity": 1,
-                        },
-                    )
-
-                    if created:
-                        slots_created += 1
-
-                    current_time += timedelta(hours=1)
-
-                current_date += timedelta(days=1)
-
+        slots_created = generate_slots()
         self.stdout.write(self.style.SUCCESS(f"Created {slots_created} time slots"))
 
         # Summary
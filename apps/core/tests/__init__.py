@@ -0,0 +1,3 @@
+"""Tests for core app."""
+
+from __future__ import annotations
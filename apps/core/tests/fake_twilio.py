@@ -0,0 +1,102 @@
+"""Loopback stand-in for the Twilio Messages REST API."""
+
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class _TwilioHandler(BaseHTTPRequestHandler):
+    """Accept message creation requests like ``POST /2010-04-01/Accounts/<sid>/Messages.json``."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:  # noqa: N802
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        expected = f"/2010-04-01/Accounts/{server.account_sid}/Messages.json"
+        credentials = base64.b64encode(
+            f"{server.account_sid}:{server.auth_token}".encode()
+        ).decode()
+        if self.path != expected:
+            return self._respond(404, {"code": 20404, "message": "Not found"})
+        if self.headers.get("Authorization") != f"Basic {credentials}":
+            return self._respond(401, {"code": 20003, "message": "Authenticate"})
+
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+        fields = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        with server.lock:
+            server.messages.append(fields)
+            sid = f"SM{len(server.messages):032d}"
+        self._respond(201, {"sid": sid, "status": "queued", "to": fields.get("To")})
+
+    def _respond(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        """Keep test output quiet."""
+
+
+class FakeTwilioServer(ThreadingHTTPServer):
+    """
+    Threaded fake Twilio API on a free loopback port.
+
+    Records accepted messages, counts TCP connections and tracks the most
+    requests handled at once. ``latency`` delays every accepted message to
+    stand in for the round trip to the real API.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        account_sid: str = "ACtest",
+        auth_token: str = "secret",
+        latency: float = 0.0,
+    ):
+        super().__init__(("127.0.0.1", 0), _TwilioHandler)
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.messages: list[dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> FakeTwilioServer:
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
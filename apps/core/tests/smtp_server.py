@@ -0,0 +1,82 @@
+"""Minimal local SMTP server for exercising the email adapter."""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speak just enough SMTP to accept messages over one session."""
+
+    def handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.greeting_delay)
+        self._reply("220 localhost ESMTP test")
+
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    with server.lock:
+                        server.messages += 1
+                        drop = server.drop_after and server.messages % server.drop_after == 0
+                    self._reply("250 OK queued")
+                    if drop:
+                        return
+                continue
+
+            command = line[:4].upper()
+            if command == "EHLO":
+                self._reply("250-localhost", "250 8BITMIME")
+            elif command == "DATA":
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            elif command in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            else:
+                self._reply("502 Command not implemented")
+
+    def _reply(self, *lines: str) -> None:
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded SMTP stand-in on a free loopback port.
+
+    Counts sessions and accepted messages. ``greeting_delay`` simulates
+    the connection and handshake cost of a real server, and
+    ``drop_after`` closes the session after every n-th message.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, greeting_delay: float = 0.0, drop_after: int = 0):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.greeting_delay = greeting_delay
+        self.drop_after = drop_after
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> LocalSMTPServer:
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
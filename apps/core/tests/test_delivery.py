@@ -0,0 +1,88 @@
+"""Tests for delivery outcome classification."""
+
+from __future__ import annotations
+
+import smtplib
+import socket
+
+from django.template import TemplateDoesNotExist
+
+import pytest
+import requests
+
+from apps.core.adapters import DeliveryResult
+from apps.core.adapters.sms import TwilioSMSAdapter
+
+from .fake_twilio import FakeTwilioServer
+
+
+def http_error(status: int) -> requests.HTTPError:
+    """Return an HTTPError carrying a response with a status code."""
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.unit
+class TestDeliveryResult:
+    """Failures are classified as permanent or transient."""
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")}),
+            smtplib.SMTPDataError(554, b"Rejected"),
+            http_error(400),
+            http_error(401),
+            TemplateDoesNotExist("emails/missing.html"),
+        ],
+    )
+    def test_permanent(self, exc):
+        """Test failures that retrying cannot fix."""
+        assert DeliveryResult.failure(exc).permanent
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            smtplib.SMTPServerDisconnected("Connection unexpectedly closed"),
+            smtplib.SMTPDataError(451, b"Try again later"),
+            http_error(429),
+            http_error(503),
+            socket.timeout("timed out"),
+            requests.ConnectTimeout(),
+            ConnectionRefusedError(),
+            RuntimeError("unknown"),
+        ],
+    )
+    def test_transient(self, exc):
+        """Test failures that are worth retrying."""
+        assert not DeliveryResult.failure(exc).permanent
+
+    def test_records_error_class(self):
+        """Test that the exception class and message are kept."""
+        result = DeliveryResult.failure(smtplib.SMTPDataError(451, b"Try again later"))
+
+        assert (result.sent, bool(result), result.error_class) == (False, False, "SMTPDataError")
+        assert "Try again later" in result.error
+
+    def test_success_is_truthy(self):
+        """Test that a result stands in for the send_* boolean."""
+        assert DeliveryResult.success()
+
+
+@pytest.mark.integration
+class TestTwilioDelivery:
+    """The Twilio adapter reports why a message failed."""
+
+    def test_rejected_credentials_are_permanent(self):
+        """Test that a 401 from the API is a permanent failure."""
+        with FakeTwilioServer() as twilio:
+            adapter = TwilioSMSAdapter(
+                account_sid=twilio.account_sid,
+                auth_token="wrong",
+                phone_number="+15550009999",
+                api_url=twilio.url,
+            )
+            result = adapter.deliver_sms(to="+15550001234", message="Hello")
+
+        assert (result.sent, result.error_class, result.permanent) == (False, "HTTPError", True)
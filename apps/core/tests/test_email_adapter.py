@@ -0,0 +1,151 @@
+"""Tests for connection reuse in the Django email adapter."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from apps.core.adapters import TemplatedEmail
+from apps.core.adapters.email import DjangoEmailAdapter
+
+from .smtp_server import LocalSMTPServer
+
+
+def make_emails(count: int) -> list[TemplatedEmail]:
+    """Return simple reminder emails."""
+    return [
+        TemplatedEmail(
+            to=[f"guest{i}@example.com"],
+            subject="Appointment Reminder",
+            template_name="booking_reminder",
+            context={"customer_name": "Guest", "site_name": "Beauty Salon"},
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fresh_connection():
+    """Start and end every test without a pooled connection."""
+    DjangoEmailAdapter.close_connection()
+    yield
+    DjangoEmailAdapter.close_connection()
+
+
+@pytest.fixture
+def smtp(settings):
+    """Point the SMTP backend at a local stand-in server."""
+    with LocalSMTPServer() as server:
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = "127.0.0.1"
+        settings.EMAIL_PORT = server.port
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_HOST_USER = ""
+        settings.EMAIL_TIMEOUT = 5
+        yield server
+
+
+@pytest.mark.integration
+class TestConnectionReuse:
+    """One SMTP session is shared across messages and calls."""
+
+    def test_send_many_uses_one_connection(self, smtp):
+        """Test that a batch is sent over a single session."""
+        results = DjangoEmailAdapter().send_many(make_emails(10))
+
+        assert results == [True] * 10
+        assert (smtp.connections, smtp.messages) == (1, 10)
+
+    def test_connection_is_kept_between_calls(self, smtp):
+        """Test that separate send_email calls reuse the pooled session."""
+        adapter = DjangoEmailAdapter()
+        for email in make_emails(3):
+            assert adapter.send_email(
+                to=email.to,
+                subject=email.subject,
+                template_name=email.template_name,
+                context=email.context,
+            )
+
+        assert smtp.connections == 1
+
+    def test_recycled_after_batch_size(self, settings, smtp):
+        """Test that a new session is opened every EMAIL_BATCH_SIZE messages."""
+        settings.EMAIL_BATCH_SIZE = 4
+
+        DjangoEmailAdapter().send_many(make_emails(10))
+
+        assert (smtp.connections, smtp.messages) == (3, 10)
+
+    def test_recycled_after_idle_timeout(self, settings, smtp):
+        """Test that an idle session is not reused."""
+        settings.EMAIL_CONNECTION_IDLE_TIMEOUT = 0
+        adapter = DjangoEmailAdapter()
+
+        adapter.send_many(make_emails(1))
+        time.sleep(0.01)
+        adapter.send_many(make_emails(1))
+
+        assert smtp.connections == 2
+
+    def test_reconnects_when_server_drops_session(self, smtp):
+        """Test that a dropped session is reopened and the message still sent."""
+        smtp.drop_after = 2
+
+        results = DjangoEmailAdapter().send_many(make_emails(5))
+
+        assert results == [True] * 5
+        assert smtp.messages == 5
+        assert smtp.connections == 3
+
+    def test_unreachable_server_fails_softly(self, settings):
+        """Test that a refused connection reports failure instead of raising."""
+        with LocalSMTPServer() as server:
+            port = server.port
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = "127.0.0.1"
+        settings.EMAIL_PORT = port
+        settings.EMAIL_USE_TLS = False
+
+        assert DjangoEmailAdapter().send_many(make_emails(2)) == [False, False]
+
+    def test_locmem_backend(self, mailoutbox):
+        """Test that the pooled path works with the test mail backend."""
+        DjangoEmailAdapter().send_many(make_emails(3))
+
+        assert [message.to for message in mailoutbox] == [
+            ["guest0@example.com"],
+            ["guest1@example.com"],
+            ["guest2@example.com"],
+        ]
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestThroughput:
+    """Benchmark pooled sending against a connection per message."""
+
+    def test_pooled_connection_is_faster(self, settings, smtp):
+        """Test that reusing the session beats reconnecting for every email."""
+        smtp.greeting_delay = 0.01
+        count = 50
+        adapter = DjangoEmailAdapter()
+
+        settings.EMAIL_BATCH_SIZE = 1
+        started = time.perf_counter()
+        adapter.send_many(make_emails(count))
+        per_message = time.perf_counter() - started
+        DjangoEmailAdapter.close_connection()
+
+        settings.EMAIL_BATCH_SIZE = count
+        started = time.perf_counter()
+        adapter.send_many(make_emails(count))
+        pooled = time.perf_counter() - started
+
+        print(
+            f"\n{count} emails: {per_message:.3f}s with a connection each, "
+            f"{pooled:.3f}s pooled ({count / pooled:.0f}/s)"
+        )
+        assert smtp.connections == count + 1
+        assert pooled < per_message / 2
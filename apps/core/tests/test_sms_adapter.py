@@ -0,0 +1,142 @@
+"""Tests for the pooled Twilio SMS adapter."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from apps.core.adapters import get_sms_adapter
+from apps.core.adapters.sms import ConsoleSMSAdapter, TwilioSMSAdapter
+
+from .fake_twilio import FakeTwilioServer
+
+
+def make_messages(count: int) -> list[tuple[str, str]]:
+    """Return (to, message) pairs."""
+    return [(f"+1555000{i:04d}", f"Reminder {i}") for i in range(count)]
+
+
+@pytest.fixture
+def twilio():
+    """Run a fake Twilio API on loopback."""
+    with FakeTwilioServer() as server:
+        yield server
+
+
+@pytest.fixture
+def adapter(twilio):
+    """Return an adapter pointed at the fake API."""
+    adapter = TwilioSMSAdapter(
+        account_sid=twilio.account_sid,
+        auth_token=twilio.auth_token,
+        phone_number="+15550009999",
+        api_url=twilio.url,
+        timeout=2,
+        max_concurrency=4,
+    )
+    yield adapter
+    adapter.close()
+
+
+@pytest.mark.integration
+class TestTwilioSMSAdapter:
+    """Sending through the Twilio REST API."""
+
+    def test_send_sms(self, adapter, twilio):
+        """Test that a message is posted with the configured sender."""
+        assert adapter.send_sms(to="+15550001234", message="Hello")
+
+        assert twilio.messages == [{"To": "+15550001234", "From": "+15550009999", "Body": "Hello"}]
+
+    def test_session_is_kept_alive(self, adapter, twilio):
+        """Test that consecutive messages share one connection."""
+        for to, message in make_messages(5):
+            assert adapter.send_sms(to=to, message=message)
+
+        assert twilio.connections == 1
+
+    def test_send_many_is_bounded(self, adapter, twilio):
+        """Test that a batch is sent concurrently, at most max_concurrency at once."""
+        twilio.latency = 0.05
+
+        results = adapter.send_many(make_messages(12))
+
+        assert results == [True] * 12
+        assert len(twilio.messages) == 12
+        assert 1 < twilio.max_in_flight <= 4
+        assert twilio.connections <= 4
+
+    def test_timeout_fails_the_message(self, adapter, twilio):
+        """Test that a slow API reply is abandoned after the timeout."""
+        twilio.latency = 0.5
+        adapter.timeout = 0.1
+
+        started = time.perf_counter()
+        assert adapter.send_sms(to="+15550001234", message="Hello") is False
+        assert time.perf_counter() - started < 0.5
+
+    def test_rejected_credentials(self, twilio):
+        """Test that an API error reports failure instead of raising."""
+        adapter = TwilioSMSAdapter(
+            account_sid=twilio.account_sid,
+            auth_token="wrong",
+            phone_number="+15550009999",
+            api_url=twilio.url,
+        )
+
+        assert adapter.send_many(make_messages(2)) == [False, False]
+        assert twilio.messages == []
+
+
+class TestGetSMSAdapter:
+    """The factory shares one adapter per configuration."""
+
+    def test_twilio_adapter_is_reused(self, settings):
+        """Test that repeated calls return the same adapter and session."""
+        settings.SMS_BACKEND = "twilio"
+        settings.TWILIO_ACCOUNT_SID = "ACreuse"
+        settings.TWILIO_AUTH_TOKEN = "secret"
+        settings.TWILIO_PHONE_NUMBER = "+15550009999"
+
+        first = get_sms_adapter()
+
+        assert isinstance(first, TwilioSMSAdapter)
+        assert get_sms_adapter() is first
+
+        settings.TWILIO_AUTH_TOKEN = "rotated"
+        assert get_sms_adapter() is not first
+
+    def test_unconfigured_twilio_falls_back(self, settings):
+        """Test that missing credentials still fall back to the console."""
+        settings.SMS_BACKEND = "twilio"
+        settings.TWILIO_ACCOUNT_SID = ""
+
+        assert isinstance(get_sms_adapter(), ConsoleSMSAdapter)
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestThroughput:
+    """Benchmark batch sending against the fake API."""
+
+    def test_concurrent_batch_is_faster(self, adapter, twilio):
+        """Test that a bounded concurrent batch beats sending one at a time."""
+        twilio.latency = 0.02
+        messages = make_messages(40)
+
+        started = time.perf_counter()
+        for to, message in messages:
+            adapter.send_sms(to=to, message=message)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        assert all(adapter.send_many(messages))
+        concurrent = time.perf_counter() - started
+
+        print(
+            f"\n{len(messages)} SMS: {sequential:.3f}s one at a time, "
+            f"{concurrent:.3f}s with {adapter.max_concurrency} in flight "
+            f"({len(messages) / concurrent:.0f}/s)"
+        )
+        assert concurrent < sequential / 2
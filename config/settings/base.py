@@ -160,6 +160,12 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@beautysalon.com")
+# One SMTP connection is reused per process; recycle it after this many
+# messages or once it has been idle this many seconds
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+EMAIL_CONNECTION_IDLE_TIMEOUT = int(os.getenv("EMAIL_CONNECTION_IDLE_TIMEOUT", "30"))
+# Seconds before a stalled SMTP server fails the send instead of hanging a worker
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
 
 # Django Allauth
 AUTHENTICATION_BACKENDS = [
@@ -240,6 +246,8 @@ CACHES = {
         "LOCATION": "unique-snowflake",
     }
 }
+# Seconds a cached public API response is kept; catalog changes invalidate it at once
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
 
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -248,6 +256,17 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Retries and anything a worker missed; new rows are queued on commit
+    "process-notification-outbox": {
+        "task": "apps.booking.tasks.process_notification_outbox",
+        "schedule": 60.0,
+    },
+    "send-booking-reminders": {
+        "task": "apps.booking.tasks.send_booking_reminders",
+        "schedule": 300.0,
+    },
+}
 
 # Logging
 LOGGING = {
@@ -296,6 +315,40 @@ SMS_BACKEND = os.getenv("SMS_BACKEND", "console")
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER", "")
+TWILIO_API_URL = os.getenv("TWILIO_API_URL", "https://api.twilio.com")
+# Seconds to wait for each SMS request, and SMS requests sent at once in a batch
+SMS_TIMEOUT_SECONDS = float(os.getenv("SMS_TIMEOUT_SECONDS", "10"))
+SMS_MAX_CONCURRENCY = int(os.getenv("SMS_MAX_CONCURRENCY", "8"))
+
+# Booking availability: "stored" lists TimeSlot rows, "computed" derives free
+# time from opening hours, staff working hours and bookings without slot rows
+BOOKING_AVAILABILITY_BACKEND = os.getenv("BOOKING_AVAILABILITY_BACKEND", "stored")
+
+# "Any available" stylist assignment: least_booked, round_robin or fewest_gaps
+BOOKING_ASSIGNMENT_POLICY = os.getenv("BOOKING_ASSIGNMENT_POLICY", "least_booked")
+
+# Booking notification outbox: "celery" queues a task per notification on
+# commit, "sync" sends in-process after commit, "command" leaves them for
+# the process_outbox management command
+NOTIFICATION_DISPATCH = os.getenv("NOTIFICATION_DISPATCH", "celery")
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+# Failed notifications wait NOTIFICATION_RETRY_SECONDS, doubling per attempt up
+# to NOTIFICATION_RETRY_MAX_SECONDS (with jitter), and are dead-lettered after
+# NOTIFICATION_MAX_ATTEMPTS or a permanent failure
+NOTIFICATION_RETRY_SECONDS = int(os.getenv("NOTIFICATION_RETRY_SECONDS", "300"))
+NOTIFICATION_RETRY_MAX_SECONDS = int(os.getenv("NOTIFICATION_RETRY_MAX_SECONDS", "21600"))
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+NOTIFICATION_LEASE_SECONDS = int(os.getenv("NOTIFICATION_LEASE_SECONDS", "300"))
+# Text messages sent at once, alongside each batch's emails
+NOTIFICATION_CONCURRENCY = int(os.getenv("NOTIFICATION_CONCURRENCY", "10"))
+
+# Appointment reminders go out this many hours ahead, claimed in chunks
+REMINDER_LEAD_HOURS = int(os.getenv("REMINDER_LEAD_HOURS", "24"))
+REMINDER_CHUNK_SIZE = int(os.getenv("REMINDER_CHUNK_SIZE", "500"))
+
+# Booking slot generation
+BOOKING_SLOT_MINUTES = int(os.getenv("BOOKING_SLOT_MINUTES", "60"))
+BOOKING_HORIZON_DAYS = int(os.getenv("BOOKING_HORIZON_DAYS", "14"))
 
 # SEO
 ENABLE_SEO_OPTIMIZATIONS = os.getenv("ENABLE_SEO_OPTIMIZATIONS", "True") == "True"
@@ -10,6 +10,9 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", "0.0.0.0", "unpummelled-haleigh-unbap
 # Use console email backend for development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Send queued notifications in-process so no Celery worker is needed
+NOTIFICATION_DISPATCH = "sync"
+
 # Simplified password validation for development
 AUTH_PASSWORD_VALIDATORS = []
 
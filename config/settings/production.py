@@ -21,7 +21,7 @@ X_FRAME_OPTIONS = "DENY"
 # Use Redis for caching in production
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/0"),  # noqa: F405
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -1,12 +1,20 @@
 """Pytest configuration and fixtures."""
+
 from __future__ import annotations
 
-import pytest
 from django.contrib.auth import get_user_model
 
+import pytest
+
 Customer = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def plain_static_storage(settings):
+    """Render templates without requiring a collectstatic manifest."""
+    settings.STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+
 @pytest.fixture
 def customer(db):
     """Create a test customer."""
@@ -44,3 +52,39 @@ def authenticated_client(customer, api_client):
     return api_client
 
 
+@pytest.fixture
+def query_budget(db):
+    """
+    Check that a page stays within a fixed query budget as its data grows.
+
+    Call it with a client, a URL, the budget and a ``grow`` function that
+    adds rows the page shows. After a warm-up fetch that fills per-process
+    caches, the page is fetched, the data grown, and the page fetched again
+    ``rounds`` times; every fetch must succeed within the budget and run the
+    same number of queries, so an N+1 fails even when it still fits the
+    budget for small data.
+
+    Returns:
+        The query count of the last fetch
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def check(client, url: str, budget: int, grow, rounds: int = 2) -> int:
+        client.get(url)
+        counts = []
+        for round_number in range(rounds + 1):
+            if round_number:
+                grow()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            assert response.status_code == 200, f"{url} returned {response.status_code}"
+            counts.append(len(queries))
+            assert len(queries) <= budget, (
+                f"{url} ran {len(queries)} queries, over its budget of {budget}:\n"
+                + "\n".join(query["sql"] for query in queries.captured_queries)
+            )
+        assert len(set(counts)) == 1, f"{url} queries grew with its data: {counts}"
+        return counts[-1]
+
+    return check